@@ -35,8 +35,18 @@ def get_celery_app() -> Celery:
         # Producer는 결과를 바로 확인하지 않음
         result_expires=3600,
         
-        # Task 라우팅 (RunPod Worker의 ai_tasks 큐로 전송)
+        # Task 라우팅 (음성 대화는 stt → llm 체인, 나머지는 ai_tasks 큐)
         task_routes={
+            "worker.tasks.process_audio_and_reply": {"queue": "stt"},
+            "worker.tasks.transcribe_stream_partial": {"queue": "stt"},
+            "worker.tasks.process_stream_and_reply": {"queue": "stt"},
+            "worker.tasks.transcribe_chunk": {"queue": "stt"},
+            "worker.tasks.stitch_chunks_and_reply": {"queue": "llm"},
+            "worker.tasks.generate_voice_reply": {"queue": "llm"},
+            "worker.tasks.generate_reply_from_text": {"queue": "llm"},
+            "worker.tasks.generate_local_reply": {"queue": "llm_local"},
+            "worker.tasks.preanalyze_user_photos": {"queue": "background"},
+            "worker.tasks.summarize_session": {"queue": "background"},
             "worker.tasks.*": {"queue": "ai_tasks"},
         },
     )
@@ -47,10 +47,15 @@ async def lifespan(app: FastAPI):
         logger.warning(f"⚠️ 데이터베이스 연결 실패: {e}")
         logger.warning("DB 없이 계속 진행...")
 
+    # 태스크 완료/진행 이벤트 구독 (프로세스당 1개, SSE 연결들이 공유)
+    from common.task_events import hub
+    await hub.start()
+
     yield  # 앱 실행
 
     # 종료 시
     logger.info("👋 SilverTalk API 종료 중...")
+    await hub.stop()
 
 
 # ============================================================
@@ -167,32 +172,119 @@ async def health_check():
 # ============================================================
 # Celery 태스크 상태 조회 (공통)
 # ============================================================
+# 어르신 친화적 메시지
+PENDING_MESSAGES = [
+    "복실이가 준비하고 있어요...",
+    "잠깐만요, 복실이가 귀 기울이고 있어요!",
+]
+PROCESSING_MESSAGES = [
+    "복실이가 열심히 듣고 있어요...",
+    "복실이가 생각하고 있어요...",
+    "복실이가 대답을 준비하고 있어요!",
+]
+REPLYING_MESSAGES = [
+    "복실이가 잘 들었어요! 대답을 생각하고 있어요...",
+    "복실이가 꼬리를 흔들며 대답을 준비하고 있어요!",
+]
+FAILURE_MESSAGE = "앗, 잠깐 문제가 생겼어요. 다시 말씀해주세요!"
+
+
+def build_task_response(task_id: str, state: str, result=None) -> dict:
+    """
+    태스크 상태/결과 → 앱 응답 (폴링과 SSE done 이벤트가 같은 형식을 사용)
+    
+    Args:
+        task_id: Celery 태스크 ID
+        state: Celery 상태 (소문자, 음성 턴은 transcribed/replying 중간 상태 포함)
+        result: 성공 시 태스크 반환값, 중간 상태는 meta, 실패 시 예외 정보
+    """
+    import random
+    
+    if state == "pending":
+        return {
+            "task_id": task_id,
+            "status": "pending",
+            "message": random.choice(PENDING_MESSAGES)
+        }
+    elif state == "started" or state == "progress":
+        return {
+            "task_id": task_id,
+            "status": "processing",
+            "message": random.choice(PROCESSING_MESSAGES)
+        }
+    elif state == "transcribed" or state == "replying":
+        # 음성 턴 중간 상태: 인식된 문장을 먼저 화면에 표시 (답변은 아직)
+        info = result if isinstance(result, dict) else {}
+        response = {
+            "task_id": task_id,
+            "status": state,
+            "message": random.choice(REPLYING_MESSAGES)
+        }
+        if info.get("user_text"):
+            response["user_text"] = info["user_text"]
+        if info.get("session_id"):
+            response["session_id"] = info["session_id"]
+        return response
+    elif state == "success":
+        if not isinstance(result, dict):
+            result = {}
+        
+        # Celery task 결과를 그대로 전달 (다양한 스키마 지원)
+        response = {
+            "task_id": task_id,
+            "status": "success",
+        }
+        
+        # AudioChatResult 필드
+        if result.get("user_text"):
+            response["user_text"] = result["user_text"]
+        if result.get("ai_reply"):
+            response["ai_reply"] = result["ai_reply"]
+        if result.get("sentiment"):
+            response["sentiment"] = result["sentiment"]
+        if result.get("fast_path"):
+            response["fast_path"] = result["fast_path"]  # "silence" | "ack" (Gemini 생략)
+        
+        # GreetingTaskResult 필드
+        if result.get("ai_greeting"):
+            response["ai_greeting"] = result["ai_greeting"]
+        if result.get("analysis"):
+            response["analysis"] = result["analysis"]
+        
+        # 공통 필드
+        if result.get("session_id"):
+            response["session_id"] = result["session_id"]
+        
+        return response
+    elif state == "failure":
+        return {
+            "task_id": task_id,
+            "status": "failure",
+            "message": FAILURE_MESSAGE,
+            "error_detail": str(result) if result else None
+        }
+    else:
+        return {
+            "task_id": task_id,
+            "status": state,
+            "message": "처리 중이에요..."
+        }
+
+
 @app.get("/api/task/{task_id}", tags=["System"])
 async def get_task_result(task_id: str):
     """
     Celery 태스크 결과 조회 (Polling용)
     
-    프론트엔드에서 1초 간격으로 호출하여 AI 처리 상태 확인
+    /api/task/{task_id}/stream(SSE)을 쓸 수 없는 환경의 대체 경로
     
     Returns:
-        - status: pending, processing, success, error
+        - status: pending, processing, transcribed, replying, success, error
+        - transcribed/replying: 답변 전에 user_text 먼저 포함
         - 어르신 친화적인 메시지 포함
     """
     from worker.celery_app import celery_app
     
-    # 어르신 친화적 메시지
-    PENDING_MESSAGES = [
-        "복실이가 준비하고 있어요...",
-        "잠깐만요, 복실이가 귀 기울이고 있어요!",
-    ]
-    PROCESSING_MESSAGES = [
-        "복실이가 열심히 듣고 있어요...",
-        "복실이가 생각하고 있어요...",
-        "복실이가 대답을 준비하고 있어요!",
-    ]
-    
-    import random
-    
     try:
         task = celery_app.AsyncResult(task_id)
         
@@ -200,60 +292,9 @@ async def get_task_result(task_id: str):
         state = task.state.lower() if task.state else "pending"
         logger.info(f"📋 Task {task_id} state: {state}")
         
-        if state == "pending":
-            return {
-                "task_id": task_id,
-                "status": "pending",
-                "message": random.choice(PENDING_MESSAGES)
-            }
-        elif state == "started" or state == "progress":
-            return {
-                "task_id": task_id,
-                "status": "processing",
-                "message": random.choice(PROCESSING_MESSAGES)
-            }
-        elif state == "success":
-            result = task.result
-            logger.info(f"✅ Task {task_id} success, result: {result}")
-            
-            # Celery task 결과를 그대로 전달 (다양한 스키마 지원)
-            response = {
-                "task_id": task_id,
-                "status": "success",
-            }
-            
-            # AudioChatResult 필드
-            if result.get("user_text"):
-                response["user_text"] = result["user_text"]
-            if result.get("ai_reply"):
-                response["ai_reply"] = result["ai_reply"]
-            if result.get("sentiment"):
-                response["sentiment"] = result["sentiment"]
-            
-            # GreetingTaskResult 필드
-            if result.get("ai_greeting"):
-                response["ai_greeting"] = result["ai_greeting"]
-            if result.get("analysis"):
-                response["analysis"] = result["analysis"]
-            
-            # 공통 필드
-            if result.get("session_id"):
-                response["session_id"] = result["session_id"]
-            
-            return response
-        elif state == "failure":
-            return {
-                "task_id": task_id,
-                "status": "failure",
-                "message": "앗, 잠깐 문제가 생겼어요. 다시 말씀해주세요!",
-                "error_detail": str(task.info) if task.info else None
-            }
-        else:
-            return {
-                "task_id": task_id,
-                "status": state,
-                "message": "처리 중이에요..."
-            }
+        if state == "success":
+            logger.info(f"✅ Task {task_id} success, result: {task.result}")
+        return build_task_response(task_id, state, task.result if state == "success" else task.info)
     
     except Exception as e:
         logger.error(f"태스크 조회 오류: {str(e)}")
@@ -265,6 +306,107 @@ async def get_task_result(task_id: str):
         }
 
 
+# ============================================================
+# 태스크 이벤트 푸시 (SSE, Redis Pub/Sub)
+# ============================================================
+SSE_TIMEOUT_SECONDS = 180
+SSE_KEEPALIVE_SECONDS = 15
+
+
+@app.get("/api/task/{task_id}/stream", tags=["System"])
+async def stream_task_reply(task_id: str):
+    """
+    태스크 진행/결과를 완료 즉시 전달 (Server-Sent Events)
+    
+    Worker가 Redis Pub/Sub으로 발행한 이벤트를 API의 단일 구독(TaskEventHub)이 받아 전달하므로
+    1초 간격 폴링이 필요 없고, 음성 턴은 Gemini가 첫 문장을 만드는 즉시 expo-speech 재생 가능
+    
+    Events:
+        - progress: {"status": "processing"} (단계 시작마다)
+                    {"status": "transcribed"|"replying", "user_text", "session_id"} (음성 턴)
+        - transcript: {"user_text"}
+        - sentence: {"index", "text"} (여러 번)
+        - meta: {"sentiment"}
+        - done: /api/task/{task_id} 성공 응답과 같은 형식 (마지막)
+        - error: {"message"} (마지막)
+    
+    음성 턴이 아닌 태스크(인사말 등)도 progress → done 으로 전달됩니다.
+    """
+    import asyncio
+    from fastapi.responses import StreamingResponse
+    from worker.celery_app import celery_app
+    from common.redis_client import get_async_redis
+    from common.reply_stream import read_events, format_sse, TERMINAL_EVENTS
+    from common.task_events import hub
+    
+    def final_event():
+        """
+        완료 여부 확인 → (event, payload), 아직이면 None
+        
+        AsyncResult 조회는 결과 백엔드(Redis) 동기 호출이므로 asyncio.to_thread로 실행
+        """
+        task = celery_app.AsyncResult(task_id)
+        if not task.ready():
+            return None
+        if task.successful():
+            return "done", build_task_response(task_id, "success", task.result)
+        return "error", {"message": FAILURE_MESSAGE}
+    
+    async def event_source():
+        # 구독을 먼저 등록한 뒤 지난 이벤트를 조회 → 그 사이 발행된 이벤트도 놓치지 않음
+        queue = hub.subscribe(task_id)
+        try:
+            seen = set()
+            
+            # 1) 늦게 연결한 경우: 이미 만들어진 문장 재생 + 완료 여부 1회 확인
+            for entry_id, event, payload in await read_events(get_async_redis(), task_id, "0", block_ms=None):
+                seen.add(entry_id)
+                yield format_sse(event, payload, entry_id)
+            
+            final = await asyncio.to_thread(final_event)
+            if final:
+                yield format_sse(*final)
+                return
+            
+            # 2) 이후는 Pub/Sub 푸시 대기
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + SSE_TIMEOUT_SECONDS
+            while loop.time() < deadline:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # 구독이 끊긴 동안 완료됐을 수 있으므로 keep-alive 주기마다 한 번 확인
+                    final = await asyncio.to_thread(final_event)
+                    if final:
+                        yield format_sse(*final)
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                entry_id = message.get("id")
+                if entry_id in seen:
+                    continue
+                
+                event, payload = message["event"], message["data"]
+                if event == "done":
+                    payload = build_task_response(task_id, "success", payload)
+                elif event == "error":
+                    payload = {"message": FAILURE_MESSAGE}
+                yield format_sse(event, payload, entry_id)
+                if event in TERMINAL_EVENTS:
+                    return
+            
+            yield format_sse("error", {"message": "복실이가 대답이 늦어지고 있어요. 다시 말씀해주세요!"})
+        finally:
+            hub.unsubscribe(task_id, queue)
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ============================================================
 # 개발용 디버그 엔드포인트
 # ============================================================
@@ -274,6 +416,8 @@ async def celery_status():
     from worker.celery_app import celery_app
     
     try:
+        from common.worker_registry import list_ready_workers
+        
         inspect = celery_app.control.inspect()
         stats = inspect.stats()
         active = inspect.active()
@@ -281,7 +425,26 @@ async def celery_status():
         return {
             "status": "connected" if stats else "disconnected",
             "workers": stats,
-            "active_tasks": active
+            "active_tasks": active,
+            # 모델 워밍업 완료 워커 (역할, 디바이스, compute_type, 로딩 시간)
+            "ready_workers": list_ready_workers()
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+@app.get("/api/debug/metrics", tags=["System"])
+async def metrics_snapshot():
+    """워커/API가 Redis에 기록한 성능 메트릭 조회 (카운터, 게이지, 타이머 p50/p95)"""
+    from common import metrics
+    
+    try:
+        return {
+            "status": "success",
+            **metrics.snapshot()
         }
     except Exception as e:
         return {
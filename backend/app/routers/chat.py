@@ -2,11 +2,14 @@
 대화 서비스 API 라우터
 사진 기반 회상 대화
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+import asyncio
+import logging
+import os
 import uuid
 
 from sqlalchemy import func
@@ -14,10 +17,13 @@ from sqlalchemy import func
 from common.database import get_db
 from common.models import User, UserPhoto, ChatSession, ChatLog, SessionStatus, SessionPhoto
 from common.config import settings
+from common import photo_analysis
 
 # Worker의 Celery 앱 사용 (EC2와 RunPod 간 설정 일치)
 from worker.celery_app import celery_app
 
+logger = logging.getLogger(__name__)
+
 def generate_first_greeting(photo, pet_name="복실이"):
     """
     사진 정보를 기반으로 첫 인사 생성
@@ -55,6 +61,25 @@ def generate_first_greeting(photo, pet_name="복실이"):
     
     return " ".join(greeting_parts)
 
+
+RELATED_CANDIDATE_LIMIT = 20  # 분석 유사도로 재정렬할 후보 수
+
+
+def rank_related_photos(main_photo, candidates: list, limit: int) -> list:
+    """
+    캐시된 사진 분석(ai_analysis) 키워드 유사도로 후보 재정렬
+    (기준 사진 분석이 없거나 동점이면 기존 순서 유지)
+    """
+    main_analysis = photo_analysis.load(main_photo) if main_photo else None
+    if main_analysis is None:
+        return candidates[:limit]
+    ranked = sorted(
+        candidates,
+        key=lambda p: photo_analysis.similarity(main_analysis, photo_analysis.load(p)),
+        reverse=True
+    )
+    return ranked[:limit]
+
 router = APIRouter(prefix="/chat", tags=["대화 서비스 (Chat & Memory)"])
 
 
@@ -131,8 +156,8 @@ async def start_chat_session(
     Flow:
     1. kakao_id로 사용자 확인 (필수)
     2. ChatSession 생성 (photo_id는 optional)
-    3. Gemini Vision으로 첫 인사 생성 (비동기 - task_id 반환)
-    4. 클라이언트에서 polling으로 결과 확인
+    3. 첫 인사 즉시 생성 (사전 분석된 사진이면 미리 만든 맞춤 인사, 아니면 템플릿)
+    4. 연관 사진 추천 (날짜 후보 → 사진 분석 유사도 순)
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -177,7 +202,8 @@ async def start_chat_session(
             f"오, 이 사진 너무 좋아요! {pet_name}도 궁금해요~ 어디서 찍은 건가요?",
             f"안녕하세요! 사진 보니까 {pet_name}도 설레요! 이 사진 속 이야기를 들려주세요! 멍멍!",
         ]
-        ai_reply = random.choice(greetings)
+        # 사전 분석된 사진이면 미리 만든 맞춤 인사 사용 (1회용)
+        ai_reply = photo_analysis.take_greeting(photo, pet_name) or random.choice(greetings)
         
         # SessionPhoto 추가 및 조회수 증가
         session_photo = SessionPhoto(
@@ -218,9 +244,10 @@ async def start_chat_session(
                 UserPhoto.id != photo.id,
                 UserPhoto.taken_at.between(date_from, date_to)
             )
-            .limit(3)
+            .limit(RELATED_CANDIDATE_LIMIT)
             .all()
         )
+        related = rank_related_photos(photo, related, 3)
         related_photos = [{"id": str(p.id), "s3_url": p.s3_url} for p in related]
 
     db.commit()
@@ -251,7 +278,7 @@ async def get_next_photos(
     2. 같은 장소
     3. 비슷한 시간대
     
-    MVP에서는 날짜 기반 추천만 구현
+    날짜 후보를 사진 분석(ai_analysis) 키워드 유사도로 재정렬
     """
     from datetime import timedelta
     
@@ -293,9 +320,10 @@ async def get_next_photos(
                 func.extract('epoch', main_photo.taken_at)
             )
         )
-        .limit(4)
+        .limit(RELATED_CANDIDATE_LIMIT)
         .all()
     )
+    related_photos = rank_related_photos(main_photo, related_photos, 4)
     
     # 연관 사진이 부족하면 랜덤 추가
     if len(related_photos) < 4:
@@ -351,17 +379,15 @@ async def send_message(
     
     # AI 응답 생성 (Celery)
     if audio_file:
-        # 음성 파일 저장
-        audio_path = f"/app/data/{session.user_id}_{audio_file.filename}"
-        with open(audio_path, "wb") as f:
-            content = await audio_file.read()
-            f.write(content)
+        # 음성 전달 (워커는 다른 서버이므로 로컬 경로 대신 Redis/S3 참조 전달)
+        content = await audio_file.read()
+        audio_ref = await stage_voice_audio(content, session_id, audio_file.filename, audio_file.content_type)
         
         # Celery 태스크 실행 (이름으로 호출)
         task = celery_app.send_task(
             "worker.tasks.process_audio_and_reply",
-            args=[audio_path, str(session.user_id), str(session.id)],
-            queue="ai_tasks"
+            args=[audio_ref, str(session.user_id), str(session.id)],
+            queue="stt"
         )
         
         return {
@@ -382,69 +408,19 @@ async def send_message(
 
 
 # ============================================================
-# 음성 메시지 처리 (STT + Brain)
+# 음성 턴 시작 (업로드/스트리밍 공통)
 # ============================================================
-@router.post("/messages/voice", summary="음성 메시지 처리")
-async def send_voice_message(
-    session_id: str = Form(...),
-    audio_file: UploadFile = File(...),
-    db: Session = Depends(get_db)
-):
-    """
-    음성 메시지 전송 및 처리 (TTS 제거됨)
-    
-    Flow:
-    1. 음성 파일 저장
-    2. Celery 태스크 큐잉 (STT + LLM)
-    3. 클라이언트에서 Polling으로 결과 확인
-    4. 클라이언트에서 expo-speech로 TTS 재생
+def start_voice_turn(session: ChatSession, db: Session):
     """
-    session = db.query(ChatSession).filter(ChatSession.id == uuid.UUID(session_id)).first()
+    음성 턴 DB 처리 후 Summary-Buffer Memory 컨텍스트 반환
     
-    if not session:
-        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
-    
-    # 음성 파일을 S3에 업로드 (RunPod에서 접근 가능하도록)
-    import os
-    from common.s3_client import S3Client, S3Error
-    
-    # 임시 로컬 저장 (S3 업로드 전)
-    if os.path.exists("/app"):
-        data_dir = "/app/data"
-    else:
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        data_dir = os.path.join(base_dir, "data")
-    
-    os.makedirs(data_dir, exist_ok=True)
-    audio_filename = f"{session.user_id}_{audio_file.filename}"
-    local_audio_path = os.path.join(data_dir, audio_filename)
-    
-    # 로컬에 임시 저장
-    content = await audio_file.read()
-    with open(local_audio_path, "wb") as f:
-        f.write(content)
-    
-    print(f"📁 음성 파일 임시 저장: {local_audio_path}")
-    
-    # S3에 업로드
-    try:
-        s3_client = S3Client()
-        s3_key = f"audio/voice_messages/{session_id}/{audio_filename}"
-        s3_url = s3_client.upload_file(
-            local_path=local_audio_path,
-            s3_key=s3_key,
-            content_type="audio/m4a"
-        )
-        print(f"☁️ S3 업로드 완료: {s3_url}")
-    except S3Error as e:
-        print(f"❌ S3 업로드 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"음성 파일 업로드 실패: {str(e)}")
-    finally:
-        # 로컬 임시 파일 삭제 (선택적)
-        if os.path.exists(local_audio_path):
-            os.remove(local_audio_path)
-            print(f"🗑️ 임시 파일 삭제: {local_audio_path}")
+    - 사용자 음성 메시지 ChatLog 저장 (STT 결과로 나중에 업데이트됨)
+    - 턴 수 증가
+    - 현재 요약 + 최근 대화 로그 조회
     
+    Returns:
+        tuple: (current_summary, recent_logs)
+    """
     # 사용자 음성 메시지 ChatLog 저장
     user_log = ChatLog(
         session_id=session.id,
@@ -478,29 +454,363 @@ async def send_voice_message(
         if log.content != "[음성 메시지]"  # 아직 STT 되지 않은 메시지 제외
     ]
     
+    return current_summary, recent_logs
+
+
+# ============================================================
+# 음성 데이터 전달 (업로드 → 워커, 로컬 디스크 저장 없음)
+# ============================================================
+async def stage_voice_audio(
+    content: bytes,
+    session_id: str,
+    filename: Optional[str] = None,
+    content_type: Optional[str] = None
+) -> str:
+    """
+    업로드된 음성 바이트를 워커가 읽을 수 있는 곳에 올리고 참조 반환
+    
+    - 짧은 음성 (AUDIO_INLINE_MAX_BYTES 이하): Redis blob (S3 왕복 없음)
+    - 긴 음성: S3 put_object (워커는 get_object로 메모리 다운로드)
+    
+    Returns:
+        str: process_audio_and_reply에 넘길 참조 (audio:blob:<uuid> 또는 S3 URL)
+    """
+    if len(content) <= settings.AUDIO_INLINE_MAX_BYTES:
+        from common.redis_client import get_async_redis
+        from common.audio_store import put_blob
+        
+        audio_ref = await put_blob(get_async_redis(), content)
+        logger.info(f"음성 Redis 전달: {audio_ref} ({len(content)} bytes)")
+        return audio_ref
+    
+    from common.s3_client import S3Client, S3Error
+    
+    try:
+        # 파일명 충돌 방지를 위해 uuid 키 사용
+        ext = os.path.splitext(filename or "")[1] or ".m4a"
+        s3_key = f"audio/voice_messages/{session_id}/{uuid.uuid4()}{ext}"
+        audio_ref = await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: S3Client().upload_bytes(content, s3_key, content_type=content_type or "audio/m4a")
+        )
+        logger.info(f"☁️ S3 업로드 완료: {audio_ref} ({len(content)} bytes)")
+        return audio_ref
+    except S3Error as e:
+        logger.error(f"❌ S3 업로드 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"음성 파일 업로드 실패: {str(e)}")
+
+# ============================================================
+# 음성 메시지 처리 (STT + Brain)
+# ============================================================
+@router.post("/messages/voice", summary="음성 메시지 처리")
+async def send_voice_message(
+    session_id: str = Form(...),
+    audio_file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """
+    음성 메시지 전송 및 처리 (TTS 제거됨)
+    
+    Flow:
+    1. 업로드 해시로 STT 캐시 조회 (적중 시 llm 큐에서 Fast Path 판정 후 답변 생성)
+    2. 음성 전달 (짧으면 Redis, 길면 S3 - 로컬 디스크 저장 없음)
+    3. Celery 태스크 큐잉 (STT + LLM)
+    4. 클라이언트에서 Polling으로 결과 확인
+    5. 클라이언트에서 expo-speech로 TTS 재생
+    """
+    session = db.query(ChatSession).filter(ChatSession.id == uuid.UUID(session_id)).first()
+    
+    if not session:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    
+    content = await audio_file.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="음성 파일이 비어 있습니다.")
+    
+    # 같은 음성(재전송/중복 탭)이면 STT 캐시 결과로 바로 답변 단계 진행 (STT 태스크/업로드 생략)
+    # Fast Path 판정과 티어 정책 기록은 워커(reply_cached_turn)에서 STT 단계와 같게 적용
+    from common import metrics, stt_cache
+    from common.redis_client import get_async_redis
+    
+    cached = await stt_cache.find_upload(get_async_redis(), stt_cache.digest(content))
+    if cached:
+        metrics.incr("stt.cache.upload_hit")
+        logger.info(f"STT 캐시 적중 (업로드): tier={cached['tier']}")
+        current_summary, recent_logs = start_voice_turn(session, db)
+        task = celery_app.send_task(
+            "worker.tasks.reply_cached_turn",
+            kwargs={
+                "cached": cached,
+                "session_id": str(session.id),
+                "summary": current_summary,
+                "recent_logs": recent_logs,
+                "turn_count": session.turn_count
+            },
+            queue="llm"
+        )
+        return {
+            "task_id": task.id,
+            "status": "processing",
+            "message": "복실이가 듣고 있어요...",
+            "turn_count": session.turn_count,
+            "can_finish": session.turn_count >= 3,
+            "worker_ready": True
+        }
+    
+    # 음성은 디스크에 쓰지 않고 메모리에서 바로 워커로 전달
+    audio_ref = await stage_voice_audio(content, session_id, audio_file.filename, audio_file.content_type)
+    
+    current_summary, recent_logs = start_voice_turn(session, db)
+    
     # Celery 태스크 실행 (Summary-Buffer Memory 인자 추가)
+    # stt 큐에서 STT 후 llm 큐의 답변 생성 태스크로 교체됨 (task_id 유지)
     task = celery_app.send_task(
         "worker.tasks.process_audio_and_reply",
         args=[
-            s3_url,
+            audio_ref,
             str(session.user_id),
             str(session.id),
             current_summary,
             recent_logs,
             session.turn_count
         ],
-        queue="ai_tasks"
+        queue="stt"
     )
     
+    # 준비된(모델 워밍업 완료) STT 워커만 stt 큐를 소비하므로
+    # 준비된 워커가 없으면 턴은 큐에서 대기 → 안내 문구만 바꿔서 알려줌
+    stt_ready = True
+    try:
+        from common.worker_registry import has_ready_worker
+        stt_ready = has_ready_worker("stt")
+    except Exception as e:
+        logger.warning(f"⚠️ STT 워커 준비 상태 조회 실패 (무시): {e}")
+    
     return {
         "task_id": task.id,
         "status": "processing",
-        "message": "복실이가 듣고 있어요...",
+        "message": "복실이가 듣고 있어요..." if stt_ready else "복실이가 잠에서 깨는 중이에요. 조금만 기다려주세요...",
         "turn_count": session.turn_count,
-        "can_finish": session.turn_count >= 3
+        "can_finish": session.turn_count >= 3,
+        "worker_ready": stt_ready
     }
 
 
+# ============================================================
+# 스트리밍 음성 메시지 (WebSocket)
+# ============================================================
+STREAM_PARTIAL_INTERVAL_SEC = 1.0  # 중간 인식 최소 주기 (새 음성 1초 분량마다)
+# 중간 인식은 누적 버퍼 전체를 다시 인식하므로 간격을 버퍼 길이에 비례해 늘림
+# (새 음성이 누적 길이의 절반 이상일 때만) → 발화 하나의 중간 인식 총량이 발화 길이의 약 3배 이내
+STREAM_PARTIAL_GROWTH = 0.5
+STREAM_PARTIAL_TIMEOUT_SEC = 10
+STREAM_FINAL_TIMEOUT_SEC = 120
+STREAM_STATE_CHECK_SEC = 1.0  # 이벤트가 없을 때 태스크 상태 직접 확인 주기 (Pub/Sub 끊김 대비)
+PCM16_BYTES_PER_SEC = 16000 * 2  # 16kHz mono s16le
+
+
+async def _wait_task_result(task_id: str, timeout: float) -> dict:
+    """Celery 결과 대기 (블로킹 get을 스레드에서 실행해 이벤트 루프 보호)"""
+    result = celery_app.AsyncResult(task_id)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, lambda: result.get(timeout=timeout, propagate=False)
+    )
+
+
+async def _wait_stream_turn(task_id: str, events: asyncio.Queue, on_transcript, timeout: float) -> dict:
+    """
+    스트리밍 턴 완료 대기, STT가 끝나는 즉시 on_transcript(user_text) 호출 (답변 완료 전)
+
+    - 이벤트: common.task_events 구독 (progress의 user_text, transcript)
+    - 구독이 끊긴 경우를 대비해 STREAM_STATE_CHECK_SEC마다 태스크 상태(TRANSCRIBED meta) 직접 확인
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    handle = celery_app.AsyncResult(task_id)
+    
+    while loop.time() < deadline:
+        try:
+            message = await asyncio.wait_for(events.get(), timeout=STREAM_STATE_CHECK_SEC)
+        except asyncio.TimeoutError:
+            ready, info = await asyncio.to_thread(lambda: (handle.ready(), handle.info))
+            if ready:
+                break
+            if isinstance(info, dict) and "user_text" in info:
+                await on_transcript(info["user_text"])
+            continue
+        
+        event, data = message.get("event"), message.get("data") or {}
+        if event in ("progress", "transcript") and "user_text" in data:
+            await on_transcript(data["user_text"])
+        elif event in ("done", "error"):
+            break
+    
+    return await _wait_task_result(task_id, max(deadline - loop.time(), 1))
+
+
+@router.websocket("/messages/voice/stream")
+async def stream_voice_message(
+    websocket: WebSocket,
+    session_id: str,
+    audio_format: str = "pcm16",
+    db: Session = Depends(get_db)
+):
+    """
+    말하는 동안 음성 청크를 받아 실시간 인식 (업로드 + S3 왕복 제거)
+    
+    Protocol:
+    - 연결: /chat/messages/voice/stream?session_id=...&audio_format=pcm16|opus
+      - pcm16: 16kHz mono s16le 원시 PCM
+      - opus 등: 컨테이너 스트림 (누적 바이트를 ffmpeg로 디코딩)
+    - Client → Server: 바이너리 프레임(음성 청크), 발화 종료 시 {"type": "end"}
+    - Server → Client:
+      {"type": "partial", "text": "..."}                중간 인식 (약 1초마다)
+      {"type": "final", "text": "...", "task_id": "..."} 최종 인식 (STT 완료 즉시, 답변 생성 전)
+      {"type": "reply", "ai_reply": "...", "sentiment": "...", ...}
+      {"type": "error", "message": "..."}
+    
+    최종 인식 결과는 워커에서 바로 답변 생성 태스크로 이어지며,
+    task_id는 /api/task/{task_id} 조회에도 그대로 사용할 수 있습니다.
+    """
+    import json
+    from common.audio_store import stream_key, append_stream_chunk
+    from common.redis_client import get_async_redis
+    from common.task_events import hub
+    
+    await websocket.accept()
+    
+    try:
+        session = db.query(ChatSession).filter(ChatSession.id == uuid.UUID(session_id)).first()
+    except ValueError:
+        session = None
+    if not session:
+        await websocket.send_json({"type": "error", "message": "세션을 찾을 수 없습니다."})
+        await websocket.close()
+        return
+    
+    rd = get_async_redis()
+    key = stream_key(f"{session.id}:{uuid.uuid4()}")
+    received_bytes = 0
+    last_partial_bytes = 0
+    started_at = last_partial_at = asyncio.get_running_loop().time()
+    partial_job: Optional[asyncio.Task] = None
+    
+    async def send_partial():
+        task = celery_app.send_task(
+            "worker.tasks.transcribe_stream_partial",
+            args=[key, audio_format],
+            queue="stt"
+        )
+        try:
+            result = await _wait_task_result(task.id, STREAM_PARTIAL_TIMEOUT_SEC)
+            if isinstance(result, dict) and result.get("text"):
+                await websocket.send_json({"type": "partial", "text": result["text"]})
+        except Exception as e:
+            logger.warning(f"[Stream] 중간 인식 결과 대기 실패 (무시): {e}")
+    
+    try:
+        # 1. 발화 중: 청크 수신 + 주기적 중간 인식
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect()
+            
+            if message.get("bytes"):
+                received_bytes = await append_stream_chunk(rd, key, message["bytes"])
+                
+                now = asyncio.get_running_loop().time()
+                if audio_format == "pcm16":
+                    due = received_bytes - last_partial_bytes >= max(
+                        PCM16_BYTES_PER_SEC * STREAM_PARTIAL_INTERVAL_SEC,
+                        last_partial_bytes * STREAM_PARTIAL_GROWTH
+                    )
+                else:
+                    # 컨테이너 포맷은 바이트로 길이를 알 수 없으므로 수신 시간으로 근사
+                    due = now - last_partial_at >= max(
+                        STREAM_PARTIAL_INTERVAL_SEC,
+                        (last_partial_at - started_at) * STREAM_PARTIAL_GROWTH
+                    )
+                
+                # 이전 중간 인식이 끝나지 않았으면 건너뜀 (stt 큐 과부하 방지)
+                if due and (partial_job is None or partial_job.done()):
+                    last_partial_bytes = received_bytes
+                    last_partial_at = now
+                    partial_job = asyncio.create_task(send_partial())
+            
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except json.JSONDecodeError:
+                    control = {}
+                if control.get("type") == "end":
+                    break
+        
+        if partial_job and not partial_job.done():
+            partial_job.cancel()
+        
+        if received_bytes == 0:
+            await websocket.send_json({"type": "error", "message": "음성이 수신되지 않았어요."})
+            await websocket.close()
+            return
+        
+        # 2. 발화 종료: 최종 인식 → 답변 생성 (워커에서 체인으로 연결)
+        #    STT가 끝나면 답변을 기다리지 않고 final을 먼저 전송
+        current_summary, recent_logs = start_voice_turn(session, db)
+        task_id = str(uuid.uuid4())
+        final_sent = False
+        
+        async def send_final(text: str):
+            nonlocal final_sent
+            if final_sent:
+                return
+            final_sent = True
+            await websocket.send_json({"type": "final", "text": text, "task_id": task_id})
+        
+        events = hub.subscribe(task_id)  # 발행 전에 구독 (TRANSCRIBED 이벤트를 놓치지 않도록)
+        try:
+            celery_app.send_task(
+                "worker.tasks.process_stream_and_reply",
+                args=[
+                    key,
+                    audio_format,
+                    str(session.user_id),
+                    str(session.id),
+                    current_summary,
+                    recent_logs,
+                    session.turn_count
+                ],
+                queue="stt",
+                task_id=task_id
+            )
+            result = await _wait_stream_turn(task_id, events, send_final, STREAM_FINAL_TIMEOUT_SEC)
+        finally:
+            hub.unsubscribe(task_id, events)
+        
+        if not isinstance(result, dict) or result.get("status") != "success":
+            error_message = result.get("message") if isinstance(result, dict) else str(result)
+            await websocket.send_json({"type": "error", "message": error_message, "task_id": task_id})
+        else:
+            # 무음/맞장구 빠른 응답은 TRANSCRIBED 단계가 없으므로 여기서 전송
+            await send_final(result.get("user_text", ""))
+            await websocket.send_json({
+                "type": "reply",
+                "task_id": task_id,
+                "ai_reply": result.get("ai_reply"),
+                "sentiment": result.get("sentiment"),
+                "session_id": result.get("session_id"),
+                "turn_count": session.turn_count,
+                "can_finish": session.turn_count >= 3
+            })
+        await websocket.close()
+    
+    except WebSocketDisconnect:
+        logger.info(f"[Stream] 클라이언트 연결 종료 (session={session_id})")
+        if partial_job and not partial_job.done():
+            partial_job.cancel()
+        await rd.delete(key)
+
+
 # ============================================================
 # AI 응답 저장 (Polling 성공 후 클라이언트에서 호출)
 # ============================================================
@@ -508,7 +818,7 @@ class SaveAIResponseRequest(BaseModel):
     session_id: str
     user_text: Optional[str] = ""
     ai_reply: str
-    new_summary: Optional[str] = None  # Summary-Buffer Memory: 업데이트된 요약
+    new_summary: Optional[str] = None  # 사용하지 않음 (이전 앱 호환용, 요약은 summarize_session이 갱신)
 
 @router.post("/messages/save-ai-response", summary="AI 응답 저장")
 async def save_ai_response(
@@ -519,7 +829,7 @@ async def save_ai_response(
     Polling 완료 후 AI 응답을 ChatLog에 저장
     
     클라이언트에서 task 결과를 받은 후 호출
-    + Summary-Buffer Memory: new_summary가 있으면 세션 요약 업데이트
+    + Summary-Buffer Memory: SUMMARY_EVERY_TURNS턴마다 요약 갱신 태스크 예약 (background 큐)
     """
     session = db.query(ChatSession).filter(ChatSession.id == uuid.UUID(request.session_id)).first()
     
@@ -547,18 +857,22 @@ async def save_ai_response(
         content=request.ai_reply
     )
     db.add(ai_log)
-    
-    # Summary-Buffer Memory: 요약 업데이트
-    if request.new_summary:
-        session.summary = request.new_summary
-        logger.info(f"📝 세션 요약 업데이트: {request.new_summary[:50]}...")
-    
     db.commit()
     
+    # Summary-Buffer Memory: 답변 전달 후 요약 갱신 (답변 지연과 무관)
+    summary_scheduled = session.turn_count > 0 and session.turn_count % settings.SUMMARY_EVERY_TURNS == 0
+    if summary_scheduled:
+        celery_app.send_task(
+            'worker.tasks.summarize_session',
+            args=[str(session.id)],
+            queue="background"
+        )
+        logger.info(f"📝 세션 요약 갱신 예약: {session.id} (턴 {session.turn_count})")
+    
     return {
         "status": "success",
         "message": "대화가 저장되었습니다.",
-        "summary_updated": request.new_summary is not None
+        "summary_scheduled": summary_scheduled
     }
 
 
@@ -648,10 +962,16 @@ async def finish_session(
     
     # 대화 로그 조회 (인사이트 추출용)
     logs = db.query(ChatLog).filter(ChatLog.session_id == session.id).all()
-    # Note: session.summary는 save_ai_response에서 new_summary로 점진적 업데이트됨
     
     db.commit()
     
+    # 마지막 요약 이후 남은 대화를 요약에 반영 (영상 공유 설명 등에서 사용)
+    celery_app.send_task(
+        'worker.tasks.summarize_session',
+        args=[str(session.id)],
+        queue="background"
+    )
+    
     # 기억 인사이트 추출 (백그라운드)
     # ChatLog를 dict 형태로 직렬화하여 전달
     chat_logs_serialized = [
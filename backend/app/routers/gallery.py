@@ -12,12 +12,33 @@ import uuid
 from common.s3 import upload_file_to_s3 # 아까 만든 유틸리티
 from common.models import SessionPhoto
 
+from common import photo_analysis
+from common.config import settings
 from common.database import get_db
 from common.models import User, UserPhoto
+from common.s3_client import get_storage_client
+from worker.celery_app import celery_app
 
 router = APIRouter(tags=["Gallery"])
 
 
+def queue_preanalysis(user_id) -> bool:
+    """
+    사용자 갤러리 사전 분석 예약 (사용자별 체인 1개, 이미 진행 중이면 그 체인이 새 사진도 처리)
+
+    Returns:
+        bool: 새 체인을 예약했는지 여부
+    """
+    if not settings.PHOTO_PREANALYSIS_ENABLED or not photo_analysis.claim_chain(user_id):
+        return False
+    celery_app.send_task(
+        'worker.tasks.preanalyze_user_photos',
+        args=[str(user_id)],
+        queue="background"
+    )
+    return True
+
+
 # ============================================================
 # 스키마
 # ============================================================
@@ -106,6 +127,8 @@ async def sync_photos_metadata(
     2. 메타데이터만 서버로 전송 (사진 원본은 로컬 유지)
     3. 서버는 메타데이터만 DB 저장 (용량 작음)
     4. 이후 빠른 사진 선택 및 연관 추천 가능
+    5. 이미 업로드한 사진(s3_url)과 분석 결과는 같은 local_uri면 유지
+    6. 업로드된 사진 중 대화에 쓰일 가능성이 높은 사진부터 백그라운드 사전 분석 예약 (첫 인사 즉시 응답)
     
     장점:
     - 초기 1회만 스캔 (백그라운드)
@@ -117,14 +140,26 @@ async def sync_photos_metadata(
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     
+    # 업로드된 이미지/분석 결과는 재동기화 후에도 유지 (local_uri 기준)
+    uploaded = {
+        local_uri: (s3_url, ai_analysis)
+        for local_uri, s3_url, ai_analysis in (
+            db.query(UserPhoto.local_uri, UserPhoto.s3_url, UserPhoto.ai_analysis)
+            .filter(UserPhoto.user_id == user.id, UserPhoto.s3_url.isnot(None))
+        )
+    }
+    
     # 기존 사진 삭제 (재동기화)
     db.query(UserPhoto).filter(UserPhoto.user_id == user.id).delete()
     
     # 메타데이터만 저장
     for photo_meta in request.photos:
+        s3_url, ai_analysis = uploaded.get(photo_meta.local_uri, (None, None))
         new_photo = UserPhoto(
             user_id=user.id,
             local_uri=photo_meta.local_uri,  # 로컬 경로 (클라이언트가 접근용)
+            s3_url=s3_url,
+            ai_analysis=ai_analysis,
             taken_at=photo_meta.taken_at,
             location_name=photo_meta.location_name,
             latitude=photo_meta.latitude,
@@ -134,6 +169,9 @@ async def sync_photos_metadata(
     
     db.commit()
     
+    if uploaded:
+        queue_preanalysis(user.id)
+    
     return {
         "message": "갤러리 메타데이터가 동기화되었습니다.",
         "count": len(request.photos),
@@ -141,6 +179,59 @@ async def sync_photos_metadata(
     }
 
 
+# ============================================================
+# 사진 이미지 업로드 (사전 분석/첫 인사용)
+# ============================================================
+@router.post("/photos/{photo_id}/image", summary="사진 이미지 업로드")
+async def upload_photo_image(
+    photo_id: uuid.UUID,
+    kakao_id: str,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """
+    동기화된 사진의 이미지(썸네일 권장) 업로드 → UserPhoto.s3_url 설정
+
+    - 서버가 이미지를 받은 사진만 사전 분석 대상 (맞춤 첫 인사, 연관 사진 추천)
+    - 업로드 후 사용자 사전 분석 예약 (이미 진행 중인 체인이 있으면 그 체인이 처리)
+    - 같은 사진을 다시 올리면 URL이 바뀌어 기존 분석은 자동 무효화 (photo_analysis.load)
+    """
+    user = db.query(User).filter(User.kakao_id == kakao_id).first()
+    
+    if not user:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    
+    photo = db.query(UserPhoto).filter(UserPhoto.id == photo_id, UserPhoto.user_id == user.id).first()
+    
+    if not photo:
+        raise HTTPException(status_code=404, detail="사진을 찾을 수 없습니다.")
+    
+    content_type = file.content_type or "image/jpeg"
+    if not content_type.startswith("image/"):
+        raise HTTPException(status_code=400, detail="이미지 파일만 업로드할 수 있습니다.")
+    
+    data = await file.read()
+    if not data:
+        raise HTTPException(status_code=400, detail="빈 파일입니다.")
+    
+    file_ext = (file.filename or "").rsplit(".", 1)[-1].lower() if "." in (file.filename or "") else "jpg"
+    s3_key = f"photos/{user.id}/{photo.id}_{uuid.uuid4().hex[:8]}.{file_ext}"
+    
+    try:
+        photo.s3_url = get_storage_client().upload_bytes(data, s3_key, content_type)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"이미지 저장 실패: {e}")
+    
+    db.commit()
+    queued = queue_preanalysis(user.id)
+    
+    return {
+        "photo_id": str(photo.id),
+        "s3_url": photo.s3_url,
+        "preanalysis_queued": queued
+    }
+
+
 # ============================================================
 # 사진 업로드 (Presign URL 발급)
 # ============================================================
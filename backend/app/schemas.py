@@ -94,6 +94,8 @@ class InsightTaskResult(BaseModel):
     status: str = Field("success", description="작업 상태 (success, failure)")
     session_id: str = Field(..., description="세션 UUID (문자열)")
     insights: List[MemoryInsightItem] = Field(default=[], description="추출된 인사이트 목록")
+    inserted: int = Field(0, description="MemoryInsight에 새로 저장한 기억 수")
+    merged: int = Field(0, description="기존 기억과 비슷해 갱신(중요도/수정일)으로 처리한 수")
     error: Optional[str] = Field(None, description="에러 메시지 (실패 시)")
 
 
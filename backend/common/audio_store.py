@@ -0,0 +1,86 @@
+"""
+Redis 기반 음성 데이터 전달
+- 스트리밍 음성(WebSocket) 청크를 Redis에 누적 → stt 워커가 바로 읽음
+- 짧은 업로드 음성은 S3 대신 Redis blob으로 전달
+- 디스크/S3를 거치지 않으므로 업로드+다운로드 지연 제거
+"""
+import uuid
+
+import redis
+
+from .redis_client import get_redis
+
+STREAM_KEY_PREFIX = "audio:stream"
+STREAM_TTL_SECONDS = 600  # 10분 (발화 중단/연결 끊김 대비 자동 정리)
+
+BLOB_KEY_PREFIX = "audio:blob"
+BLOB_TTL_SECONDS = 600  # 워커가 소비하지 못한 blob 자동 정리
+
+
+def is_blob_ref(audio_ref: str) -> bool:
+    """태스크 인자로 받은 음성 참조가 Redis blob 키인지 확인"""
+    return audio_ref.startswith(f"{BLOB_KEY_PREFIX}:")
+
+
+async def put_blob(rd: "redis.asyncio.Redis", data: bytes) -> str:
+    """
+    음성 바이트를 Redis에 저장 (API, async)
+
+    Returns:
+        str: 워커에 전달할 blob 키 (audio:blob:<uuid>)
+    """
+    key = f"{BLOB_KEY_PREFIX}:{uuid.uuid4()}"
+    await rd.set(key, data, ex=BLOB_TTL_SECONDS)
+    return key
+
+
+def store_blob(data: bytes) -> str:
+    """음성 바이트를 Redis에 저장 (Worker, 긴 발화 청크 분산용)"""
+    key = f"{BLOB_KEY_PREFIX}:{uuid.uuid4()}"
+    get_redis().set(key, data, ex=BLOB_TTL_SECONDS)
+    return key
+
+
+def get_blob(key: str) -> bytes:
+    """Redis blob 조회 (Worker)"""
+    data = get_redis().get(key)
+    if data is None:
+        raise KeyError(f"음성 blob이 없습니다 (만료 또는 미생성): {key}")
+    return data
+
+
+def delete_blob(key: str) -> None:
+    """처리 완료된 blob 삭제"""
+    get_redis().delete(key)
+
+
+def stream_key(stream_id: str) -> str:
+    """스트리밍 음성 버퍼 키"""
+    return f"{STREAM_KEY_PREFIX}:{stream_id}"
+
+
+async def append_stream_chunk(rd: "redis.asyncio.Redis", key: str, chunk: bytes) -> int:
+    """
+    스트리밍 청크 추가 (API, async)
+
+    Returns:
+        int: 누적 바이트 수
+    """
+    pipe = rd.pipeline(transaction=False)
+    pipe.append(key, chunk)
+    pipe.expire(key, STREAM_TTL_SECONDS)
+    total, _ = await pipe.execute()
+    return total
+
+
+def read_stream(key: str) -> bytes:
+    """누적된 스트리밍 음성 전체 조회 (Worker)"""
+    data = get_redis().get(key)
+    if data is None:
+        raise KeyError(f"스트리밍 음성 버퍼가 없습니다 (만료 또는 미생성): {key}")
+    return data
+
+
+def delete_stream(key: str) -> None:
+    """스트리밍 음성 버퍼 삭제"""
+    get_redis().delete(key)
@@ -0,0 +1,96 @@
+"""
+오디오 디코딩 유틸리티 (API/Worker 공용)
+- ffmpeg pipe를 사용한 Memory-to-Memory 디코딩 (임시 파일 없음)
+- Whisper 입력 포맷: 16kHz mono float32
+- numpy는 Worker에만 설치되어 있으므로 배열 변환 함수에서만 import
+"""
+from typing import Optional
+
+import ffmpeg
+
+SAMPLE_RATE = 16000
+
+
+class AudioProcessingError(Exception):
+    """오디오 디코딩 중 발생하는 에러"""
+    pass
+
+
+def decode_to_pcm(
+    data: bytes,
+    target_sr: int = SAMPLE_RATE,
+    input_format: Optional[str] = None
+) -> bytes:
+    """
+    압축 오디오(m4a, opus, webm 등)를 16kHz mono float32 PCM 바이트로 변환
+
+    Args:
+        data: 원본 오디오 바이트
+        target_sr: 출력 샘플링 레이트
+        input_format: ffmpeg 입력 포맷 (None이면 자동 감지)
+
+    Returns:
+        bytes: float32 little-endian PCM
+
+    Raises:
+        AudioProcessingError: ffmpeg 디코딩 실패 시
+    """
+    input_kwargs = {"format": input_format} if input_format else {}
+    try:
+        out, _ = (
+            ffmpeg
+            .input("pipe:0", **input_kwargs)
+            .output("pipe:1", format="f32le", acodec="pcm_f32le", ac=1, ar=target_sr)
+            .run(input=data, capture_stdout=True, capture_stderr=True)
+        )
+        return out
+    except ffmpeg.Error as e:
+        stderr = e.stderr.decode(errors="ignore") if e.stderr else ""
+        raise AudioProcessingError(f"오디오 디코딩 실패: {stderr[-300:]}")
+
+
+def convert_to_wav(data: bytes, target_sr: int = SAMPLE_RATE) -> bytes:
+    """
+    압축 오디오를 16kHz mono WAV 바이트로 변환
+
+    Raises:
+        AudioProcessingError: ffmpeg 변환 실패 시
+    """
+    try:
+        out, _ = (
+            ffmpeg
+            .input("pipe:0")
+            .output("pipe:1", format="wav", ac=1, ar=target_sr)
+            .run(input=data, capture_stdout=True, capture_stderr=True)
+        )
+        return out
+    except ffmpeg.Error as e:
+        stderr = e.stderr.decode(errors="ignore") if e.stderr else ""
+        raise AudioProcessingError(f"WAV 변환 실패: {stderr[-300:]}")
+
+
+def pcm_to_array(pcm: bytes):
+    """float32 PCM 바이트 → numpy 배열 (복사 없음)"""
+    import numpy as np
+    return np.frombuffer(pcm, dtype=np.float32)
+
+
+def pcm16_to_array(data: bytes):
+    """16-bit signed PCM 바이트(16kHz mono) → float32 배열"""
+    import numpy as np
+    usable = len(data) - (len(data) % 2)  # 청크 경계에서 잘린 마지막 바이트 제거
+    return np.frombuffer(data[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def decode_audio_bytes(
+    data: bytes,
+    target_sr: int = SAMPLE_RATE,
+    input_format: Optional[str] = None
+):
+    """
+    압축 오디오 바이트를 Whisper 입력용 float32 배열로 변환
+
+    Returns:
+        np.ndarray: 16kHz mono float32
+    """
+    return pcm_to_array(decode_to_pcm(data, target_sr=target_sr, input_format=input_format))
@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
     CELERY_RESULT_BACKEND: str = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+    # prefork 자식이 모델 로딩(worker_process_init)을 마칠 때까지 기다리는 시간 (Celery 기본 4초)
+    WORKER_PROC_ALIVE_TIMEOUT: float = float(os.getenv("WORKER_PROC_ALIVE_TIMEOUT", "300"))
     
     # API 키
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
@@ -78,6 +80,120 @@ class Settings(BaseSettings):
     # 로그 설정
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
+    # STT 배치 추론 (stt 워커를 --pool=threads로 실행할 때 사용)
+    STT_BATCH_ENABLED: bool = os.getenv("STT_BATCH_ENABLED", "false").lower() == "true"
+    STT_BATCH_WINDOW_MS: int = int(os.getenv("STT_BATCH_WINDOW_MS", "100"))
+    STT_BATCH_MAX_SIZE: int = int(os.getenv("STT_BATCH_MAX_SIZE", "8"))
+
+    # 이보다 긴 발화는 무음 경계 청크로 나눠 CPU 프로세스들에 분산 인식 (GPU는 배처가 청크 배치 처리)
+    STT_CHUNK_THRESHOLD_SECONDS: float = float(os.getenv("STT_CHUNK_THRESHOLD_SECONDS", "30"))
+
+    # STT 모델 티어 (품질 높은 순, 모두 상주) + 목표 지연 (큐 대기 포함)
+    STT_MODEL_TIERS: str = os.getenv("STT_MODEL_TIERS", "medium")
+    STT_TARGET_P95_MS: float = float(os.getenv("STT_TARGET_P95_MS", "4000"))
+
+    @property
+    def stt_model_tiers(self) -> list:
+        """상주시킬 Whisper 모델 목록 (첫 번째가 기본 모델)"""
+        return [m.strip() for m in self.STT_MODEL_TIERS.split(",") if m.strip()] or ["medium"]
+
+    # CPU 전용 STT 모드 (GPU 없는 오버플로우 노드, worker.cpu_pool)
+    # 0이면 코어 수로 자동 결정
+    STT_CPU_MODE: bool = os.getenv("STT_CPU_MODE", "false").lower() == "true"
+    STT_CPU_PROCESSES: int = int(os.getenv("STT_CPU_PROCESSES", "0"))
+    STT_CPU_THREADS: int = int(os.getenv("STT_CPU_THREADS", "0"))
+
+    # STT 결과 캐시 (같은 음성 재인식 방지)
+    STT_CACHE_ENABLED: bool = os.getenv("STT_CACHE_ENABLED", "true").lower() == "true"
+    STT_CACHE_TTL_SECONDS: int = int(os.getenv("STT_CACHE_TTL_SECONDS", "86400"))
+    STT_CACHE_MAX_ENTRIES: int = int(os.getenv("STT_CACHE_MAX_ENTRIES", "10000"))
+
+    # 음성 턴 Fast Path (무음/한 단어 맞장구는 Whisper/Gemini 생략)
+    FASTPATH_ENABLED: bool = os.getenv("FASTPATH_ENABLED", "true").lower() == "true"
+    FASTPATH_SILENCE_DBFS: float = float(os.getenv("FASTPATH_SILENCE_DBFS", "-50"))
+    FASTPATH_MIN_SPEECH_MS: int = int(os.getenv("FASTPATH_MIN_SPEECH_MS", "250"))
+
+    # Gemini 답변 스트리밍 (문장 단위로 SSE 전달, /api/task/{task_id}/stream)
+    REPLY_STREAMING_ENABLED: bool = os.getenv("REPLY_STREAMING_ENABLED", "true").lower() == "true"
+
+    # 이 크기 이하의 음성 업로드는 S3 대신 Redis로 워커에 전달 (bytes)
+    AUDIO_INLINE_MAX_BYTES: int = int(os.getenv("AUDIO_INLINE_MAX_BYTES", str(512 * 1024)))
+
+    # Gemini 쿼터 공유 토큰 버킷 (common.gemini_quota, 모든 워커/API가 같은 Redis 버킷 사용)
+    GEMINI_QUOTA_ENABLED: bool = os.getenv("GEMINI_QUOTA_ENABLED", "true").lower() == "true"
+    GEMINI_RPM_LIMIT: int = int(os.getenv("GEMINI_RPM_LIMIT", "15"))
+    GEMINI_TPM_LIMIT: int = int(os.getenv("GEMINI_TPM_LIMIT", "1000000"))
+    # 백그라운드 작업(기억 추출, 내레이션)이 남겨둬야 하는 용량 비율 (음성 턴 우선)
+    GEMINI_QUOTA_RESERVE: float = float(os.getenv("GEMINI_QUOTA_RESERVE", "0.3"))
+    # 음성 턴이 쿼터를 기다리는 최대 시간 (초과 시 Fallback 답변)
+    GEMINI_QUOTA_MAX_WAIT_SECONDS: float = float(os.getenv("GEMINI_QUOTA_MAX_WAIT_SECONDS", "5"))
+
+    # LLM 게이트웨이 (common.llm_gateway, 모든 Gemini 호출의 단일 진입점)
+    GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "20"))
+    # 응답이 늦으면 같은 요청을 한 번 더 전송 (0이면 호출별 관측 p95 사용)
+    LLM_HEDGE_ENABLED: bool = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+    LLM_HEDGE_AFTER_MS: int = int(os.getenv("LLM_HEDGE_AFTER_MS", "0"))
+    # 연속 실패 시 호출 차단 (서킷 브레이커)
+    LLM_BREAKER_FAILURES: int = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+    LLM_BREAKER_RESET_SECONDS: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+    # 모델 티어 라우팅 (common.model_routing): 짧은 답변/첫 인사 → lite, 요약/기억/내레이션 → full
+    LLM_ROUTING_ENABLED: bool = os.getenv("LLM_ROUTING_ENABLED", "true").lower() == "true"
+    GEMINI_LITE_MODEL: str = os.getenv("GEMINI_LITE_MODEL", "gemini-2.0-flash-lite")
+    LLM_LITE_CALLS: str = os.getenv("LLM_LITE_CALLS", "greeting")
+    LLM_FULL_CALLS: str = os.getenv("LLM_FULL_CALLS", "summary,insights,narration,photo_analysis")
+    LLM_LITE_REPLY_MAX_CHARS: int = int(os.getenv("LLM_LITE_REPLY_MAX_CHARS", "40"))
+    LLM_LITE_FALLBACK: bool = os.getenv("LLM_LITE_FALLBACK", "true").lower() == "true"  # lite 실패 시 full로 재시도
+
+    # 정적 프롬프트 접두부 캐시 (common.prompt_cache): gemini | local | off
+    PROMPT_CACHE_BACKEND: str = os.getenv("PROMPT_CACHE_BACKEND", "gemini").lower()
+    PROMPT_CACHE_TTL_SECONDS: int = int(os.getenv("PROMPT_CACHE_TTL_SECONDS", "3600"))
+    PROMPT_CACHE_REFRESH_MARGIN_SECONDS: int = int(os.getenv("PROMPT_CACHE_REFRESH_MARGIN_SECONDS", "300"))
+    PROMPT_CACHE_RETRY_SECONDS: int = int(os.getenv("PROMPT_CACHE_RETRY_SECONDS", "600"))  # 캐시 생성 실패 후 재시도 간격
+    PROMPT_CACHE_MIN_TOKENS: int = int(os.getenv("PROMPT_CACHE_MIN_TOKENS", "4096"))  # 제공자 최소 캐시 크기 (미만이면 캐시 안 함)
+
+    # 답변 프롬프트 섹션별 토큰 예산 (common.context_builder, 로컬 근사 토큰 수)
+    REPLY_CONTEXT_SUMMARY_TOKENS: int = int(os.getenv("REPLY_CONTEXT_SUMMARY_TOKENS", "300"))
+    REPLY_CONTEXT_RECENT_TOKENS: int = int(os.getenv("REPLY_CONTEXT_RECENT_TOKENS", "400"))
+    REPLY_CONTEXT_USER_TOKENS: int = int(os.getenv("REPLY_CONTEXT_USER_TOKENS", "250"))
+    REPLY_CONTEXT_TURN_TOKENS: int = int(os.getenv("REPLY_CONTEXT_TURN_TOKENS", "120"))  # 최신 발화 1개 상한
+    REPLY_CONTEXT_FULL_TURNS: int = int(os.getenv("REPLY_CONTEXT_FULL_TURNS", "2"))  # 이보다 오래된 발화는 1/3로 압축
+
+    # 기억 인사이트 중복 판별 (common.memory_dedup, 글자 n-gram MinHash)
+    MEMORY_SHINGLE_SIZE: int = int(os.getenv("MEMORY_SHINGLE_SIZE", "3"))
+    MEMORY_DEDUP_THRESHOLD: float = float(os.getenv("MEMORY_DEDUP_THRESHOLD", "0.85"))  # 실제 Jaccard 기준
+
+    # 로컬 CPU LLM (worker.local_llm): Gemini 실패 시 llm_local 큐의 양자화 모델로 답변
+    LOCAL_LLM_ENABLED: bool = os.getenv("LOCAL_LLM_ENABLED", "false").lower() == "true"
+    LOCAL_LLM_FORCE: bool = os.getenv("LOCAL_LLM_FORCE", "false").lower() == "true"  # Gemini 없이 항상 로컬 (부하 테스트)
+    LOCAL_LLM_MODEL_PATH: str = os.getenv("LOCAL_LLM_MODEL_PATH", "")  # 비우면 {models_root}/llm/{LOCAL_LLM_MODEL_FILE}
+    LOCAL_LLM_MODEL_FILE: str = os.getenv("LOCAL_LLM_MODEL_FILE", "qwen2.5-1.5b-instruct-q4_k_m.gguf")
+    LOCAL_LLM_THREADS: int = int(os.getenv("LOCAL_LLM_THREADS", "0"))  # 0이면 CPU 코어 수
+    LOCAL_LLM_CONTEXT: int = int(os.getenv("LOCAL_LLM_CONTEXT", "2048"))
+    LOCAL_LLM_MAX_TOKENS: int = int(os.getenv("LOCAL_LLM_MAX_TOKENS", "160"))
+    LOCAL_LLM_TIMEOUT_SECONDS: float = float(os.getenv("LOCAL_LLM_TIMEOUT_SECONDS", "8"))
+
+    # Gemini Vision 입력 축소 (common.image_utils.prepare_vision_input, 사진별 Redis 캐시)
+    VISION_MAX_PIXELS: int = int(os.getenv("VISION_MAX_PIXELS", str(768 * 768)))
+    VISION_MAX_BYTES: int = int(os.getenv("VISION_MAX_BYTES", str(200 * 1024)))
+    VISION_JPEG_QUALITY: int = int(os.getenv("VISION_JPEG_QUALITY", "85"))
+    VISION_CACHE_TTL_SECONDS: int = int(os.getenv("VISION_CACHE_TTL_SECONDS", str(24 * 3600)))
+
+    # 사진 핸들 레지스트리 (common.photo_handles): gemini | local | off
+    PHOTO_HANDLE_BACKEND: str = os.getenv("PHOTO_HANDLE_BACKEND", "gemini").lower()
+    PHOTO_HANDLE_EXPIRY_MARGIN_SECONDS: int = int(os.getenv("PHOTO_HANDLE_EXPIRY_MARGIN_SECONDS", "3600"))
+
+    # 대화 요약 갱신 주기 (턴 수, save-ai-response 후 background 큐에서 summarize_session 실행)
+    SUMMARY_EVERY_TURNS: int = int(os.getenv("SUMMARY_EVERY_TURNS", "3"))
+
+    # 갤러리 사진 사전 분석 (background 큐, 사용자별 대화 가능성 높은 사진부터)
+    PHOTO_PREANALYSIS_ENABLED: bool = os.getenv("PHOTO_PREANALYSIS_ENABLED", "true").lower() == "true"
+    PHOTO_ANALYSIS_DAILY_BUDGET: int = int(os.getenv("PHOTO_ANALYSIS_DAILY_BUDGET", "500"))  # 하루 Gemini 호출 수 (전체)
+    PHOTO_PREANALYSIS_PER_USER: int = int(os.getenv("PHOTO_PREANALYSIS_PER_USER", "20"))
+    PHOTO_PREANALYSIS_BATCH_SIZE: int = int(os.getenv("PHOTO_PREANALYSIS_BATCH_SIZE", "5"))
+    PHOTO_PREANALYSIS_BATCH_INTERVAL_SECONDS: int = int(os.getenv("PHOTO_PREANALYSIS_BATCH_INTERVAL_SECONDS", "60"))
+
     # 카카오 OAuth
     KAKAO_CLIENT_ID: str = os.getenv("KAKAO_CLIENT_ID", "")
     KAKAO_REDIRECT_URI: str = os.getenv("KAKAO_REDIRECT_URI", "http://localhost:8000/auth/kakao/callback")
@@ -0,0 +1,200 @@
+"""
+답변 프롬프트 컨텍스트 빌더 (섹션별 토큰 예산)
+- 이전 대화 요약 / 최근 대화 / 현재 사용자 말을 각각 예산(REPLY_CONTEXT_*_TOKENS) 안으로 맞춤
+  → 말씀이 긴 세션에서도 프롬프트 크기와 답변 지연이 일정 수준을 넘지 않음
+- 토큰 수는 로컬 근사치 (count_tokens, 외부 호출 없음)
+    한글/한자: 2글자당 1토큰, 영문 단어: 4글자당 1토큰, 숫자: 3자리당 1토큰, 기호: 1개당 1토큰
+- 줄이는 순서:
+    최근 대화: 최신 REPLY_CONTEXT_FULL_TURNS개 발화는 REPLY_CONTEXT_TURN_TOKENS까지,
+              그보다 오래된 발화는 1/3로 압축(앞부분만), 예산이 모자라면 오래된 발화부터 제외
+    요약: 최근 내용이 뒤에 합쳐지므로 앞(오래된) 문장부터 제외
+    사용자 말: 앞/뒤를 남기고 가운데 생략
+- 메트릭: context.reply.<section>_tokens, context.reply.trimmed.<section>, context.reply.dropped_turns
+"""
+import logging
+import math
+import re
+from typing import List, NamedTuple
+
+from . import metrics
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+ELLIPSIS = "…"
+MIN_TURN_TOKENS = 8  # 남은 예산이 이보다 적으면 더 오래된 발화는 넣지 않음
+
+_TOKEN_RUNS = re.compile(r"[가-힣㄰-㆏一-鿿]+|[A-Za-z]+|[0-9]+|\S")
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def count_tokens(text: str) -> int:
+    """로컬 토큰 수 근사 (Gemini SentencePiece 기준 한국어 평균에 맞춘 값)"""
+    tokens = 0
+    for run in _TOKEN_RUNS.findall(text or ""):
+        first = run[0]
+        if first.isascii() and first.isalpha():
+            tokens += math.ceil(len(run) / 4)
+        elif first.isdigit():
+            tokens += math.ceil(len(run) / 3)
+        else:
+            tokens += math.ceil(len(run) / 2)  # 한글/한자 연속, 기호는 1글자 → 1토큰
+    return tokens
+
+
+def clip_tokens(text: str, budget: int, keep: str = "head") -> str:
+    """
+    예산 안으로 자르기 (넘지 않으면 그대로)
+
+    Args:
+        keep: "head" 앞부분 유지 / "tail" 뒷부분 유지 / "both" 앞뒤 유지, 가운데 생략
+    """
+    text = (text or "").strip()
+    if count_tokens(text) <= budget:
+        return text
+    if budget <= 1:
+        return ""
+
+    def fits(n: int) -> bool:
+        return count_tokens(_cut(text, n, keep)) <= budget
+
+    low, high = 0, len(text)  # fits(low) 성립, 가장 긴 n 탐색 (토큰 수는 글자 수에 대해 단조)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if fits(mid):
+            low = mid
+        else:
+            high = mid - 1
+    return _cut(text, low, keep) if low else ""
+
+
+def _cut(text: str, n: int, keep: str) -> str:
+    if keep == "tail":
+        return ELLIPSIS + text[len(text) - n:].lstrip()
+    if keep == "both":
+        head = n // 2
+        return text[:head].rstrip() + f" {ELLIPSIS} " + text[len(text) - (n - head):].lstrip()
+    return text[:n].rstrip() + ELLIPSIS
+
+
+def _clip_summary(summary: str, budget: int) -> str:
+    """오래된(앞) 문장부터 제외, 마지막 한 문장도 넘치면 뒷부분만 유지"""
+    sentences = [s.strip() for s in _SENTENCE_END.split(summary or "") if s.strip()]
+    kept, used = [], 0
+    for sentence in reversed(sentences):
+        cost = count_tokens(sentence) + 1
+        if used + cost > budget:
+            break
+        kept.append(sentence)
+        used += cost
+    if not kept and sentences:
+        return clip_tokens(sentences[-1], budget, keep="tail")
+    return " ".join(reversed(kept))
+
+
+class SectionUsage(NamedTuple):
+    tokens: int
+    budget: int
+    original: int
+
+    @property
+    def trimmed(self) -> bool:
+        return self.tokens < self.original
+
+
+class ReplyContext(NamedTuple):
+    """예산을 적용한 답변 프롬프트 컨텍스트"""
+    summary: str
+    recent_logs: List[dict]
+    user_text: str
+    usage: dict  # section → SectionUsage
+    dropped_turns: int
+
+    @property
+    def recent_context(self) -> str:
+        return "\n".join(_turn_line(log["role"], log["content"]) for log in self.recent_logs)
+
+    @property
+    def tokens(self) -> int:
+        return sum(section.tokens for section in self.usage.values())
+
+
+def _turn_line(role: str, content: str) -> str:
+    return f"{'사용자' if role == 'user' else 'AI'}: {content}"
+
+
+def _logs_tokens(logs: list) -> int:
+    return sum(count_tokens(_turn_line(log["role"], log["content"])) for log in logs)
+
+
+def _fit_recent(logs: list, budget: int):
+    """최신 발화부터 예산 안에 담기 → (담은 로그 시간순, 제외한 발화 수)"""
+    kept, used = [], 0
+    for age, log in enumerate(reversed(logs)):
+        cap = settings.REPLY_CONTEXT_TURN_TOKENS
+        if age >= settings.REPLY_CONTEXT_FULL_TURNS:
+            cap = max(cap // 3, MIN_TURN_TOKENS)
+        remaining = budget - used - count_tokens(_turn_line(log["role"], ""))
+        if remaining < MIN_TURN_TOKENS:
+            break
+        content = clip_tokens(log["content"], min(cap, remaining))
+        if not content:
+            break
+        kept.append({"role": log["role"], "content": content})
+        used += count_tokens(_turn_line(log["role"], content))
+    kept.reverse()
+    return kept, len(logs) - len(kept)
+
+
+def build_reply_context(summary: str, recent_logs: list, user_text: str) -> ReplyContext:
+    """
+    섹션별 예산을 적용한 답변 컨텍스트 (호출마다 사용량 기록)
+
+    Args:
+        summary: 이전 대화 요약 (ChatSession.summary)
+        recent_logs: 최근 대화 로그 [{"role": "user"|"assistant", "content": "..."}] (시간순)
+        user_text: 현재 사용자 말
+
+    Returns:
+        ReplyContext: 자른 요약/최근 대화/사용자 말 + 섹션별 사용량
+    """
+    recent_logs = [log for log in recent_logs or [] if log.get("content")]
+    clipped_summary = _clip_summary(summary, settings.REPLY_CONTEXT_SUMMARY_TOKENS)
+    clipped_user = clip_tokens(user_text, settings.REPLY_CONTEXT_USER_TOKENS, keep="both")
+    kept_logs, dropped = _fit_recent(recent_logs, settings.REPLY_CONTEXT_RECENT_TOKENS)
+
+    context = ReplyContext(
+        summary=clipped_summary,
+        recent_logs=kept_logs,
+        user_text=clipped_user,
+        usage={
+            "summary": SectionUsage(
+                count_tokens(clipped_summary), settings.REPLY_CONTEXT_SUMMARY_TOKENS, count_tokens(summary)
+            ),
+            "recent": SectionUsage(
+                _logs_tokens(kept_logs), settings.REPLY_CONTEXT_RECENT_TOKENS, _logs_tokens(recent_logs)
+            ),
+            "user": SectionUsage(
+                count_tokens(clipped_user), settings.REPLY_CONTEXT_USER_TOKENS, count_tokens(user_text)
+            ),
+        },
+        dropped_turns=dropped,
+    )
+    _record(context)
+    return context
+
+
+def _record(context: ReplyContext) -> None:
+    for section, usage in context.usage.items():
+        metrics.observe(f"context.reply.{section}_tokens", usage.tokens)
+        if usage.trimmed:
+            metrics.incr(f"context.reply.trimmed.{section}")
+    metrics.observe("context.reply.total_tokens", context.tokens)
+    if context.dropped_turns:
+        metrics.incr("context.reply.dropped_turns", context.dropped_turns)
+
+    report = ", ".join(
+        f"{section} {usage.tokens}/{usage.budget}" + (f"(원래 {usage.original})" if usage.trimmed else "")
+        for section, usage in context.usage.items()
+    )
+    logger.info(f"[Context] 답변 컨텍스트 토큰: {report}, 제외 발화 {context.dropped_turns}개")
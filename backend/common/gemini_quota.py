@@ -0,0 +1,197 @@
+"""
+Gemini 쿼터 공유 토큰 버킷 (Redis + Lua)
+- 모든 워커/API 프로세스가 같은 버킷(gemini:quota)에서 RPM/TPM 용량을 꺼내 쓴 뒤 호출
+  → 프로세스마다 따로 재시도하며 쿼터를 두드리지 않음
+- 버킷은 분당 한도만큼 연속적으로 채워짐 (Lua 스크립트 안에서 Redis 서버 시각 사용 → 서버 간 시계 차이 무관)
+- 우선순위: interactive(음성 턴, 첫 인사)는 전체 용량을 쓰고,
+  background(기억 추출, 영상 내레이션)는 GEMINI_QUOTA_RESERVE 비율을 남겨둔 채로만 사용
+- Gemini가 그래도 429를 반환하면 penalize()로 버킷 전체를 retry 시각까지 막아 모든 호출자가 함께 대기
+- 사용률은 metrics 게이지로 기록 (gemini.quota.rpm_utilization / gemini.quota.tpm_utilization)
+- Redis 장애 시에는 제한 없이 통과 (가용성 우선)
+"""
+import re
+import time
+import logging
+from typing import Optional
+
+from . import metrics
+from .config import settings
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+QUOTA_KEY = "gemini:quota"
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+IMAGE_TOKENS = 258  # Gemini 이미지 1장 고정 토큰
+DEFAULT_OUTPUT_TOKENS = 300  # 2-3문장 답변 + JSON
+
+# KEYS[1]=버킷, ARGV: rpm 한도, tpm 한도, 요청 토큰, 남겨둘 비율
+# Returns: {허용 여부, 대기 초, 남은 rpm, 남은 tpm}
+_ACQUIRE_SCRIPT = """
+local rpm_cap = tonumber(ARGV[1])
+local tpm_cap = tonumber(ARGV[2])
+local tokens = math.min(tonumber(ARGV[3]), tpm_cap)
+local reserve = tonumber(ARGV[4])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'rpm', 'tpm', 'ts', 'blocked_until')
+local rpm = tonumber(state[1]) or rpm_cap
+local tpm = tonumber(state[2]) or tpm_cap
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+local blocked_until = tonumber(state[4]) or 0
+
+rpm = math.min(rpm_cap, rpm + elapsed * rpm_cap / 60)
+tpm = math.min(tpm_cap, tpm + elapsed * tpm_cap / 60)
+
+local wait = 0
+if now < blocked_until then
+    wait = blocked_until - now
+else
+    local need_rpm = 1 + reserve * rpm_cap
+    local need_tpm = tokens + reserve * tpm_cap
+    if rpm < need_rpm then wait = math.max(wait, (need_rpm - rpm) * 60 / rpm_cap) end
+    if tpm < need_tpm then wait = math.max(wait, (need_tpm - tpm) * 60 / tpm_cap) end
+end
+
+local granted = 0
+if wait <= 0 then
+    rpm = rpm - 1
+    tpm = tpm - tokens
+    granted = 1
+end
+
+redis.call('HSET', KEYS[1], 'rpm', rpm, 'tpm', tpm, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 120)
+return {granted, tostring(wait), tostring(rpm), tostring(tpm)}
+"""
+
+# KEYS[1]=버킷, ARGV[1]=차단 초 → 남은 용량을 비우고 차단 시각 연장
+_PENALIZE_SCRIPT = """
+local t = redis.call('TIME')
+local blocked_until = tonumber(t[1]) + tonumber(t[2]) / 1000000 + tonumber(ARGV[1])
+local current = tonumber(redis.call('HGET', KEYS[1], 'blocked_until')) or 0
+if blocked_until > current then
+    redis.call('HSET', KEYS[1], 'blocked_until', blocked_until, 'rpm', 0)
+end
+redis.call('EXPIRE', KEYS[1], 120)
+return tostring(math.max(blocked_until, current))
+"""
+
+_scripts = {}
+
+
+class QuotaExceeded(Exception):
+    """max_wait 안에 쿼터를 확보하지 못함 (retry_after초 후 재시도 권장)"""
+
+    def __init__(self, retry_after: float, priority: str = INTERACTIVE):
+        self.retry_after = retry_after
+        self.priority = priority
+        super().__init__(f"Gemini 쿼터 부족 ({priority}), {retry_after:.1f}초 후 재시도")
+
+
+def _script(name: str, source: str):
+    if name not in _scripts:
+        _scripts[name] = get_redis().register_script(source)
+    return _scripts[name]
+
+
+def estimate_tokens(contents, output_tokens: int = DEFAULT_OUTPUT_TOKENS) -> int:
+    """
+    요청 토큰 추정 (입력 + 예상 출력)
+
+    한국어는 대략 2글자당 1토큰, 이미지는 장당 고정 토큰
+    """
+    parts = contents if isinstance(contents, (list, tuple)) else [contents]
+    tokens = output_tokens
+    for part in parts:
+        if isinstance(part, str):
+            tokens += len(part) // 2 + 1
+        else:
+            tokens += IMAGE_TOKENS
+    return tokens
+
+
+def retry_after_from_error(api_error: Exception) -> Optional[float]:
+    """429/quota 에러면 Gemini가 알려준 재시도 대기 시간(초), 아니면 None"""
+    error_str = str(api_error)
+    if "429" not in error_str and "quota" not in error_str.lower():
+        return None
+    retry_match = re.search(r'retry in (\d+(?:\.\d+)?)', error_str)
+    return float(retry_match.group(1)) if retry_match else 10.0
+
+
+def _record_levels(rpm: float, tpm: float):
+    metrics.set_gauge("gemini.quota.rpm_utilization", round(1 - rpm / settings.GEMINI_RPM_LIMIT, 3))
+    metrics.set_gauge("gemini.quota.tpm_utilization", round(1 - tpm / settings.GEMINI_TPM_LIMIT, 3))
+
+
+def try_acquire(tokens: int, priority: str = INTERACTIVE) -> float:
+    """
+    용량 1회 확보 시도
+
+    Returns:
+        float: 0이면 확보 성공, 아니면 확보 가능해질 때까지 대기할 시간(초)
+    """
+    if not settings.GEMINI_QUOTA_ENABLED:
+        return 0.0
+    reserve = settings.GEMINI_QUOTA_RESERVE if priority == BACKGROUND else 0.0
+    try:
+        granted, wait, rpm, tpm = _script("acquire", _ACQUIRE_SCRIPT)(
+            keys=[QUOTA_KEY],
+            args=[settings.GEMINI_RPM_LIMIT, settings.GEMINI_TPM_LIMIT, tokens, reserve]
+        )
+    except Exception as e:
+        logger.warning(f"[Quota] 버킷 조회 실패 (제한 없이 통과): {e}")
+        return 0.0
+
+    _record_levels(float(rpm), float(tpm))
+    return 0.0 if int(granted) else max(float(wait), 0.01)
+
+
+def acquire(tokens: int, priority: str = INTERACTIVE, max_wait: Optional[float] = None) -> float:
+    """
+    호출 전 용량 확보 (필요하면 max_wait초까지 대기)
+
+    Args:
+        tokens: estimate_tokens() 결과
+        priority: INTERACTIVE 또는 BACKGROUND
+        max_wait: 최대 대기 시간 (None이면 GEMINI_QUOTA_MAX_WAIT_SECONDS, 0이면 대기 없음)
+
+    Returns:
+        float: 실제 대기한 시간(초)
+
+    Raises:
+        QuotaExceeded: max_wait 안에 확보하지 못한 경우
+    """
+    if max_wait is None:
+        max_wait = settings.GEMINI_QUOTA_MAX_WAIT_SECONDS
+    started = time.monotonic()
+
+    while True:
+        wait = try_acquire(tokens, priority)
+        waited = time.monotonic() - started
+        if wait <= 0:
+            metrics.incr(f"gemini.quota.granted.{priority}")
+            if waited > 0.01:
+                metrics.observe(f"gemini.quota.wait_ms.{priority}", waited * 1000)
+            return waited
+        if waited + wait > max_wait:
+            metrics.incr(f"gemini.quota.throttled.{priority}")
+            raise QuotaExceeded(wait, priority)
+        time.sleep(wait)
+
+
+def penalize(retry_after: float) -> None:
+    """Gemini 429 응답: 모든 호출자가 retry_after초 동안 대기하도록 버킷 차단"""
+    metrics.incr("gemini.quota.rejected")
+    if not settings.GEMINI_QUOTA_ENABLED:
+        return
+    try:
+        _script("penalize", _PENALIZE_SCRIPT)(keys=[QUOTA_KEY], args=[retry_after])
+        logger.warning(f"[Quota] Gemini 429 → 전체 호출 {retry_after:.0f}초 차단")
+    except Exception as e:
+        logger.warning(f"[Quota] 차단 기록 실패 (무시): {e}")
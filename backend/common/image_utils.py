@@ -1,10 +1,12 @@
 """
 이미지 전처리 유틸리티
 - AI 모델(Replicate Flux 등)에 이미지를 전달하기 전 전처리
+- Gemini Vision 입력은 prepare_vision_input으로 픽셀/용량 상한 안에서 축소
 """
+import math
 from io import BytesIO
 from typing import Tuple, Dict, Any  # Python 3.8 호환
-from PIL import Image
+from PIL import Image, ImageOps
 
 
 class ImageProcessingError(Exception):
@@ -103,6 +105,91 @@ def preprocess_image_for_ai(
         raise ImageProcessingError(f"이미지 처리 중 오류 발생: {str(e)}")
 
 
+def prepare_vision_input(
+    image_bytes: bytes,
+    max_pixels: int = 768 * 768,
+    max_bytes: int = 200 * 1024,
+    jpeg_quality: int = 85
+) -> bytes:
+    """
+    Vision 모델(Gemini) 입력용 이미지 축소/재압축
+
+    preprocess_image_for_ai와 같은 RGB 변환 + LANCZOS 리사이즈 + JPEG 압축을 쓰되,
+    사진 전체 내용이 필요하므로 크롭하지 않고 비율을 유지
+
+    처리 단계:
+    1. JPEG Draft 디코딩: 목표 크기 이상인 가장 작은 1/2, 1/4, 1/8 스케일로 디코딩 (48MP 원본도 빠르게)
+    2. EXIF 회전 적용 (휴대폰 세로 사진)
+    3. RGB 변환
+    4. Resize: 가로 x 세로가 max_pixels 이하가 되도록 비율 유지 축소
+    5. Compression: max_bytes를 넘으면 품질을 낮추고, 그래도 넘으면 크기를 줄여 재압축
+
+    Args:
+        image_bytes: 원본 이미지 바이트 데이터
+        max_pixels: 최대 픽셀 수 (기본 768x768, Gemini 이미지 타일 1장 크기)
+        max_bytes: 최대 출력 크기 (기본 200KB)
+        jpeg_quality: 시작 JPEG 품질
+
+    Returns:
+        JPEG 이미지 바이트 데이터
+
+    Raises:
+        ImageProcessingError: 이미지 처리 실패 시
+    """
+    try:
+        image = Image.open(BytesIO(image_bytes))
+    except Exception as e:
+        raise ImageProcessingError(f"이미지를 열 수 없습니다: {str(e)}")
+
+    try:
+        # 1. Draft 디코딩 (JPEG만 지원, 다른 포맷은 무시됨)
+        width, height = image.size
+        scale = min(1.0, math.sqrt(max_pixels / (width * height)))
+        target = (max(1, int(width * scale)), max(1, int(height * scale)))
+        if image.format == "JPEG":
+            image.draft("RGB", target)
+
+        # 2. EXIF 회전
+        image = ImageOps.exif_transpose(image)
+
+        # 3. RGB 변환
+        image = _to_rgb(image)
+
+        # 4. 비율 유지 축소 (draft 이후 크기 기준)
+        width, height = image.size
+        scale = min(1.0, math.sqrt(max_pixels / (width * height)))
+        if scale < 1.0:
+            image = image.resize((max(1, int(width * scale)), max(1, int(height * scale))), Image.LANCZOS)
+
+        # 5. 용량 상한까지 품질 → 크기 순으로 낮춰가며 압축
+        quality = jpeg_quality
+        while True:
+            output_buffer = BytesIO()
+            image.save(output_buffer, format="JPEG", quality=quality, optimize=True)
+            data = output_buffer.getvalue()
+            if len(data) <= max_bytes or min(image.size) <= 64:
+                return data
+            if quality > 60:
+                quality -= 10
+            else:
+                width, height = image.size
+                image = image.resize((max(1, int(width * 0.75)), max(1, int(height * 0.75))), Image.LANCZOS)
+
+    except Exception as e:
+        raise ImageProcessingError(f"이미지 처리 중 오류 발생: {str(e)}")
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """RGBA는 흰색 배경에 합성, 그 외 모드는 RGB로 변환"""
+    if image.mode == "RGB":
+        return image
+    if image.mode == "RGBA":
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[3])
+        return background
+    return image.convert("RGB")
+
+
 def preprocess_image_file(
     input_path: str,
     output_path: str,
@@ -0,0 +1,697 @@
+"""
+LLM 게이트웨이 (Gemini 호출 단일 진입점)
+- 답변/첫 인사/이미지 분석/기억 추출/내레이션 등 모든 Gemini 호출이 이 모듈을 거침
+- 프로세스당 이벤트 루프 스레드 1개 + async 클라이언트 1개 (gRPC 연결 재사용)
+  → Celery 태스크(sync)는 결과만 기다림, 스트리밍은 청크를 호출 스레드로 넘겨줌
+- 호출마다: 서킷 브레이커 확인 → 공유 쿼터 확보(common.gemini_quota) → 타임아웃 → 헤지 요청
+- 헤지: 응답이 최근 p95보다 늦으면 같은 요청을 한 번 더 보내 먼저 도착한 응답 사용 (음성 턴만)
+- 구조화 응답: response_schema로 JSON 출력을 강제 (정규식 추출 불필요)
+- 모델 티어: 호출마다 lite/full 선택 (common.model_routing), 서킷 브레이커는 티어별,
+  lite 호출이 실패하면 같은 요청을 full로 1회 재시도 (LLM_LITE_FALLBACK)
+- 정적 접두부: system=이름으로 등록된 지시문(common.prompt_cache)을 모델 쪽 캐시로 참조, contents는 동적 부분만
+- 메트릭: llm.<name>.latency_ms / calls / errors / timeouts / prompt_tokens / cached_tokens / output_tokens,
+  llm.<name>.<tier>.latency_ms (헤지 기준), llm.tier.<tier>.latency_ms / calls / errors, llm.tier.lite.fallback,
+  llm.hedge.fired / llm.hedge.won, llm.breaker.open
+"""
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from . import gemini_quota, metrics, prompt_cache
+from .config import settings
+from .gemini_quota import INTERACTIVE, QuotaExceeded
+from .model_routing import FULL, LITE, tier_for
+
+logger = logging.getLogger(__name__)
+
+HEDGE_MIN_SAMPLES = 20  # 이보다 적게 관측된 호출은 기본 헤지 지연 사용
+HEDGE_DEFAULT_MS = 3000
+HEDGE_CACHE_SECONDS = 30
+TRANSIENT_MARKERS = ("500", "503", "504", "unavailable", "deadline", "internal")
+_TIMEOUT_ERRORS = (asyncio.TimeoutError, concurrent.futures.TimeoutError)
+
+
+class LLMError(Exception):
+    """Gemini 호출 실패 (호출자는 Fallback 응답 사용)"""
+
+
+class LLMTimeout(LLMError):
+    """호출별 타임아웃 초과"""
+
+
+class LLMUnavailable(LLMError):
+    """서킷 브레이커가 열려 호출하지 않음"""
+
+
+# ============================================================
+# 서킷 브레이커
+# ============================================================
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold회를 넘으면 reset_seconds 동안 호출 차단
+
+    차단 시간이 지나면 호출 1개만 통과시켜(half-open) 성공하면 닫고, 실패하면 다시 차단
+    쿼터 부족(429)은 장애가 아니므로 실패로 세지 않음
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return "closed" if self._opened_at is None else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                # half-open: 이 호출만 통과, 나머지는 결과가 나올 때까지 계속 차단
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures < self.failure_threshold:
+                return
+            if self._opened_at is None:
+                logger.error(f"[LLM] 연속 실패 {self._failures}회 → {self.reset_seconds:.0f}초 동안 호출 차단")
+                metrics.incr("llm.breaker.open")
+            self._opened_at = time.monotonic()
+
+
+# ============================================================
+# 응답 처리
+# ============================================================
+def response_text(response) -> str:
+    """응답/청크 텍스트 (안전 필터 등으로 파트가 없으면 빈 문자열)"""
+    try:
+        return response.text or ""
+    except (ValueError, AttributeError):
+        return ""
+
+
+def parse_json(text: str) -> Any:
+    """
+    JSON 응답 파싱
+
+    response_schema로 JSON만 출력되므로 대부분 바로 파싱되고,
+    코드블록 등으로 감싸진 예외적인 응답만 본문을 추출해 재시도
+
+    Raises:
+        ValueError: JSON을 찾을 수 없는 경우
+    """
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    block = re.search(r'```(?:json)?\s*(.*?)\s*```', text, re.DOTALL)
+    if block:
+        text = block.group(1)
+    match = re.search(r'(\{.*\}|\[.*\])', text, re.DOTALL)
+    if not match:
+        raise ValueError(f"JSON 없음: {text[:100]}")
+    return json.loads(match.group(1))
+
+
+def _is_transient(error: Exception) -> bool:
+    error_str = str(error).lower()
+    return any(marker in error_str for marker in TRANSIENT_MARKERS)
+
+
+# ============================================================
+# 게이트웨이
+# ============================================================
+class LLMGateway:
+    """
+    Gemini 호출 게이트웨이 (프로세스당 1개, get_gateway())
+
+    사용 예:
+        gateway = get_gateway()
+        text = gateway.generate_text(prompt, name="narration", priority=BACKGROUND)
+        data = gateway.generate_json(prompt, REPLY_SCHEMA, name="reply", tier=tier_for("reply", user_text))
+        for chunk in gateway.stream_text(prompt, name="reply_stream", json_output=True):
+            ...
+    """
+
+    def __init__(self, model_name: str, lite_model_name: Optional[str] = None):
+        self.model_name = model_name
+        self.model_names = {FULL: model_name, LITE: lite_model_name or model_name}
+        self.breakers = {
+            tier: CircuitBreaker(settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_RESET_SECONDS)
+            for tier in (FULL, LITE)
+        }
+        self._models = {}
+        self._prefix_models = {}  # (티어, 접두부, 모드, 캐시 이름) → GenerativeModel
+        self._loop = None
+        self._pid = None
+        self._hedge_cache = {}
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------
+    # 초기화 (fork 이후 프로세스마다 루프/클라이언트 새로 생성)
+    # --------------------------------------------------------
+    def start(self) -> "LLMGateway":
+        """API 키 설정 + 이벤트 루프 스레드 시작 (워커 워밍업 시 호출)"""
+        self._ensure_loop()
+        self._ensure_model()
+        return self
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True).start()
+                self._loop, self._pid, self._models, self._prefix_models = loop, os.getpid(), {}, {}
+            return self._loop
+
+    def _ensure_model(self, tier: str = FULL):
+        self._ensure_loop()
+        with self._lock:
+            if tier not in self._models:
+                import google.generativeai as genai
+
+                if not self._models:
+                    api_key = settings.GEMINI_API_KEY or os.getenv("GEMINI_API_KEY")
+                    if not api_key:
+                        raise ValueError("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
+                    genai.configure(api_key=api_key)
+                self._models[tier] = genai.GenerativeModel(self.model_names[tier])
+            return self._models[tier]
+
+    @property
+    def model(self):
+        """full 티어 GenerativeModel (준비 여부 확인용)"""
+        return self._ensure_model(FULL)
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """full 티어 서킷 브레이커"""
+        return self.breakers[FULL]
+
+    # --------------------------------------------------------
+    # 공개 API
+    # --------------------------------------------------------
+    def generate_text(
+        self,
+        contents,
+        *,
+        name: str,
+        priority: str = INTERACTIVE,
+        max_wait: Optional[float] = None,
+        timeout: Optional[float] = None,
+        hedge: bool = True,
+        max_output_tokens: Optional[int] = None,
+        tier: Optional[str] = None,
+        system: Optional[str] = None
+    ) -> str:
+        """
+        텍스트 응답 생성
+
+        Args:
+            contents: 프롬프트 또는 [프롬프트, 이미지]
+            name: 메트릭/로그용 호출 이름 (예: "reply", "narration")
+            priority: INTERACTIVE / BACKGROUND (common.gemini_quota)
+            max_wait: 쿼터 최대 대기 (초, 0이면 대기 없이 QuotaExceeded)
+            timeout: 호출 타임아웃 (초, None이면 LLM_TIMEOUT_SECONDS)
+            hedge: 음성 턴 꼬리 지연 대비 헤지 요청 허용
+            tier: LITE / FULL (None이면 호출 이름으로 common.model_routing이 결정)
+            system: common.prompt_cache에 등록한 정적 접두부 이름 (contents에는 동적 부분만)
+
+        Raises:
+            QuotaExceeded: 쿼터 확보 실패
+            LLMError: 타임아웃/서킷 차단/빈 응답 등 (호출자는 Fallback)
+        """
+        return self._with_fallback(name, tier, lambda t: self._generate(
+            contents, None, name=name, tier=t, priority=priority, max_wait=max_wait,
+            timeout=timeout, hedge=hedge, max_output_tokens=max_output_tokens, system=system
+        ))
+
+    def generate_json(
+        self,
+        contents,
+        schema: dict,
+        *,
+        name: str,
+        priority: str = INTERACTIVE,
+        max_wait: Optional[float] = None,
+        timeout: Optional[float] = None,
+        hedge: bool = True,
+        max_output_tokens: Optional[int] = None,
+        tier: Optional[str] = None,
+        system: Optional[str] = None
+    ) -> Any:
+        """
+        스키마로 출력 형식을 강제한 JSON 응답 (dict 또는 list)
+
+        Args:
+            schema: Gemini response_schema (OpenAPI 부분집합, 예: {"type": "OBJECT", "properties": {...}})
+        """
+        def call(t: str) -> Any:
+            text = self._generate(
+                contents, schema, name=name, tier=t, priority=priority, max_wait=max_wait,
+                timeout=timeout, hedge=hedge, max_output_tokens=max_output_tokens, system=system
+            )
+            try:
+                return parse_json(text)
+            except ValueError as e:
+                metrics.incr(f"llm.{name}.invalid_json")
+                raise LLMError(f"{name}: JSON 파싱 실패 ({e})") from e
+
+        return self._with_fallback(name, tier, call)
+
+    def stream_text(
+        self,
+        contents,
+        *,
+        name: str,
+        priority: str = INTERACTIVE,
+        max_wait: Optional[float] = None,
+        timeout: Optional[float] = None,
+        json_output: bool = False,
+        max_retries: int = 3,
+        tier: Optional[str] = None,
+        system: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        스트리밍 응답 청크 (호출 스레드에서 순서대로 yield)
+
+        - 첫 청크를 받기 전의 429/일시 오류만 재시도 (이미 전달한 내용이 중복되지 않도록)
+        - timeout은 청크 사이의 최대 간격
+        - json_output: JSON 모드만 켜고 스키마는 쓰지 않음
+          (스키마를 쓰면 속성이 이름순으로 출력되어 "text"가 마지막에 나옴 → 첫 문장이 늦어짐)
+        - lite 티어가 첫 청크 전에 실패하면 full로 다시 스트리밍
+        """
+        tier = tier or tier_for(name)
+        yielded = False
+        try:
+            for chunk in self._stream(
+                contents, name, tier, priority, max_wait, timeout, json_output, max_retries, system
+            ):
+                yielded = True
+                yield chunk
+        except QuotaExceeded:
+            raise
+        except LLMError as e:
+            if yielded or not self._can_fall_back(tier):
+                raise
+            self._note_fallback(name, e)
+            yield from self._stream(
+                contents, name, FULL, priority, max_wait, timeout, json_output, max_retries, system
+            )
+
+    # --------------------------------------------------------
+    # 내부: 호출 / 재시도
+    # --------------------------------------------------------
+    def _can_fall_back(self, tier: str) -> bool:
+        return (
+            tier == LITE
+            and settings.LLM_LITE_FALLBACK
+            and self.model_names[LITE] != self.model_names[FULL]
+        )
+
+    @staticmethod
+    def _note_fallback(name: str, error: Exception):
+        metrics.incr("llm.tier.lite.fallback")
+        metrics.incr(f"llm.{name}.lite_fallback")
+        logger.warning(f"⚠️ [LLM] {name} lite 실패 → full 재시도: {error}")
+
+    def _with_fallback(self, name: str, tier: Optional[str], call: Callable[[str], Any]) -> Any:
+        """티어 결정 후 호출, lite 실패(쿼터 부족 제외)는 full로 1회 재시도"""
+        tier = tier or tier_for(name)
+        try:
+            return call(tier)
+        except QuotaExceeded:
+            raise
+        except LLMError as e:
+            if not self._can_fall_back(tier):
+                raise
+            self._note_fallback(name, e)
+            return call(FULL)
+
+    def _stream(
+        self,
+        contents,
+        name: str,
+        tier: str,
+        priority: str,
+        max_wait: Optional[float],
+        timeout: Optional[float],
+        json_output: bool,
+        max_retries: int,
+        system: Optional[str] = None
+    ) -> Iterator[str]:
+        self._check_breaker(name, tier)
+        timeout = timeout or settings.LLM_TIMEOUT_SECONDS
+        model, request, prefix = self._prepare(tier, system, contents)
+        loop = self._ensure_loop()
+        config = self._generation_config(None, None, json_output)
+        tokens = gemini_quota.estimate_tokens(request) + self._prefix_tokens(prefix)
+
+        for attempt in range(1, max_retries + 1):
+            gemini_quota.acquire(tokens, priority, max_wait)
+            started = time.perf_counter()
+            chunks = queue.Queue()
+            future = asyncio.run_coroutine_threadsafe(
+                self._pump(model, request, config, timeout, chunks), loop
+            )
+            yielded, usage = False, None
+            try:
+                while True:
+                    try:
+                        kind, value = chunks.get(timeout=timeout)
+                    except queue.Empty:
+                        raise LLMTimeout(f"{name}: {timeout:.0f}초 동안 응답 없음")
+                    if kind == "end":
+                        break
+                    if kind == "error":
+                        raise value
+                    usage = getattr(value, "usage_metadata", None) or usage
+                    text = response_text(value)
+                    if text:
+                        if not yielded:
+                            metrics.observe(f"llm.{name}.first_chunk_ms", (time.perf_counter() - started) * 1000)
+                        yielded = True
+                        yield text
+            except LLMTimeout:
+                self._record_failure(name, tier, timeout=True)
+                raise
+            except Exception as e:
+                if yielded:
+                    self._record_failure(name, tier)
+                elif self._cache_missing(tier, prefix, e):
+                    model, request, prefix = self._prepare(tier, system, contents)
+                    continue
+                elif self._should_retry(name, tier, e, attempt, max_retries, priority):
+                    continue
+                raise LLMError(f"{name}: {e}") from e
+            finally:
+                future.cancel()
+
+            self.breakers[tier].record_success()
+            self._record(name, tier, started, usage)
+            return
+
+    def _prepare(self, tier: str, system: Optional[str], contents):
+        """
+        정적 접두부 적용 (common.prompt_cache)
+
+        Returns:
+            tuple: (model, 요청 contents, Prefix 또는 None)
+            - cached/local/system: 접두부를 담은 모델 + 동적 contents 그대로
+            - inline(캐시 꺼짐): 기본 모델 + 접두부를 앞에 붙인 contents
+        """
+        model = self._ensure_model(tier)
+        if system is None:
+            return model, contents, None
+
+        prefix = prompt_cache.resolve(system, self.model_names[tier])
+        if prefix.mode == prompt_cache.INLINE:
+            if isinstance(contents, str):
+                return model, f"{prefix.text}\n\n{contents}", prefix
+            return model, [prefix.text, *contents], prefix
+
+        key = (tier, prefix.name, prefix.mode, prefix.cache_name)
+        with self._lock:
+            prefix_model = self._prefix_models.get(key)
+        if prefix_model is None:
+            # from_cached_content는 네트워크 조회 → 잠금 밖에서 (동시에 만들어지면 먼저 저장된 쪽 사용)
+            built = prompt_cache.build_model(prefix, self.model_names[tier])
+            with self._lock:
+                prefix_model = self._prefix_models.setdefault(key, built)
+        return prefix_model, contents, prefix
+
+    @staticmethod
+    def _prefix_tokens(prefix) -> int:
+        """쿼터 추정에 더할 접두부 토큰 (contents에 이미 포함된 inline과 캐시된 cached는 제외)"""
+        if prefix is None or prefix.mode in (prompt_cache.CACHED, prompt_cache.INLINE):
+            return 0
+        return prefix.tokens
+
+    def _cache_missing(self, tier: str, prefix, error: Exception) -> bool:
+        """제공자 쪽 캐시가 먼저 사라졌으면 이름을 지우고 True (호출자는 새 캐시로 재시도)"""
+        if prefix is None or prefix.mode != prompt_cache.CACHED:
+            return False
+        message = str(error).lower()
+        if "cache" not in message or not ("not found" in message or "404" in message or "expired" in message):
+            return False
+        logger.warning(f"⚠️ [LLM] 접두부 캐시 만료 ({prefix.name}), 새로 생성: {error}")
+        prompt_cache.invalidate(prefix.name, self.model_names[tier])
+        with self._lock:
+            self._prefix_models.pop((tier, prefix.name, prefix.mode, prefix.cache_name), None)
+        return True
+
+    def _check_breaker(self, name: str, tier: str):
+        if not self.breakers[tier].allow():
+            metrics.incr(f"llm.{name}.rejected")
+            raise LLMUnavailable(f"{name}: Gemini({tier}) 연속 실패로 잠시 호출을 멈췄습니다")
+
+    @staticmethod
+    def _generation_config(
+        schema: Optional[dict],
+        max_output_tokens: Optional[int],
+        json_output: bool = False
+    ) -> Optional[dict]:
+        config = {}
+        if schema is not None or json_output:
+            config["response_mime_type"] = "application/json"
+        if schema is not None:
+            config["response_schema"] = schema
+        if max_output_tokens:
+            config["max_output_tokens"] = max_output_tokens
+        return config or None
+
+    def _generate(
+        self,
+        contents,
+        schema: Optional[dict],
+        *,
+        name: str,
+        tier: str,
+        priority: str,
+        max_wait: Optional[float],
+        timeout: Optional[float],
+        hedge: bool,
+        max_output_tokens: Optional[int],
+        max_retries: int = 3,
+        system: Optional[str] = None
+    ) -> str:
+        self._check_breaker(name, tier)
+        timeout = timeout or settings.LLM_TIMEOUT_SECONDS
+        model, request, prefix = self._prepare(tier, system, contents)
+        loop = self._ensure_loop()
+        config = self._generation_config(schema, max_output_tokens)
+        tokens = gemini_quota.estimate_tokens(request, max_output_tokens or gemini_quota.DEFAULT_OUTPUT_TOKENS)
+        tokens += self._prefix_tokens(prefix)
+        hedge_after = self._hedge_after(name, tier) if hedge and priority == INTERACTIVE else None
+
+        for attempt in range(1, max_retries + 1):
+            gemini_quota.acquire(tokens, priority, max_wait)
+            started = time.perf_counter()
+            future = asyncio.run_coroutine_threadsafe(
+                self._hedged(model, request, config, timeout, hedge_after, tokens), loop
+            )
+            try:
+                response, hedged = future.result(timeout + 1)
+            except _TIMEOUT_ERRORS:
+                future.cancel()
+                self._record_failure(name, tier, timeout=True)
+                raise LLMTimeout(f"{name}: {timeout:.0f}초 초과")
+            except Exception as e:
+                if self._cache_missing(tier, prefix, e):
+                    model, request, prefix = self._prepare(tier, system, contents)
+                    continue
+                if self._should_retry(name, tier, e, attempt, max_retries, priority):
+                    continue
+                raise LLMError(f"{name}: {e}") from e
+
+            self.breakers[tier].record_success()
+            self._record(name, tier, started, getattr(response, "usage_metadata", None), hedged)
+            text = response_text(response).strip()
+            if not text:
+                metrics.incr(f"llm.{name}.empty")
+                raise LLMError(f"{name}: 빈 응답")
+            return text
+
+    def _should_retry(
+        self,
+        name: str,
+        tier: str,
+        error: Exception,
+        attempt: int,
+        max_retries: int,
+        priority: str
+    ) -> bool:
+        """
+        재시도 여부 (True면 다시 시도, 아니면 호출자가 LLMError로 감싸 raise)
+
+        - 429: 공유 버킷 차단 후 재시도 (다음 acquire가 대기), 마지막 시도면 QuotaExceeded
+        - 일시 오류(5xx): 실패로 기록 후 재시도
+        """
+        retry_after = gemini_quota.retry_after_from_error(error)
+        if retry_after is not None:
+            gemini_quota.penalize(retry_after)
+            logger.warning(f"⚠️ [LLM] {name} Quota 초과 ({attempt}/{max_retries}), {retry_after:.0f}초 차단")
+            if attempt == max_retries:
+                raise QuotaExceeded(retry_after, priority)
+            return True
+
+        self._record_failure(name, tier)
+        if _is_transient(error) and attempt < max_retries and self.breakers[tier].state == "closed":
+            logger.warning(f"⚠️ [LLM] {name} 일시 오류, 재시도 ({attempt}/{max_retries}): {error}")
+            return True
+        logger.error(f"❌ [LLM] {name} 호출 실패: {error}")
+        return False
+
+    async def _send(self, model, contents, config, timeout):
+        return await model.generate_content_async(
+            contents,
+            generation_config=config,
+            request_options={"timeout": timeout}
+        )
+
+    async def _hedged(self, model, contents, config, timeout, hedge_after, tokens):
+        """
+        요청 1개, hedge_after초 안에 응답이 없으면 같은 요청을 1개 더 보내 먼저 성공한 응답 사용
+
+        Returns:
+            tuple: (response, hedge) - hedge는 None(헤지 안 함) / "won" / "lost"
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        primary = asyncio.ensure_future(self._send(model, contents, config, timeout))
+        if hedge_after is None or hedge_after >= timeout:
+            return await asyncio.wait_for(primary, timeout), None
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result(), None
+
+        # 헤지 요청도 쿼터를 쓰므로 대기 없이 확보될 때만 전송
+        wait = await loop.run_in_executor(None, gemini_quota.try_acquire, tokens, INTERACTIVE)
+        if wait > 0:
+            return await asyncio.wait_for(primary, max(deadline - loop.time(), 0.01)), None
+
+        backup = asyncio.ensure_future(self._send(model, contents, config, timeout))
+        pending, error = {primary, backup}, None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(deadline - loop.time(), 0.01),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise asyncio.TimeoutError()
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), "won" if task is backup else "lost"
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (primary, backup):
+                if not task.done():
+                    task.cancel()
+
+    @staticmethod
+    async def _pump(model, contents, config, timeout, chunks: queue.Queue):
+        """스트리밍 청크를 호출 스레드의 큐로 전달 (이벤트 루프 스레드)"""
+        try:
+            response = await model.generate_content_async(
+                contents,
+                generation_config=config,
+                stream=True,
+                request_options={"timeout": timeout}
+            )
+            async for chunk in response:
+                chunks.put(("chunk", chunk))
+            chunks.put(("end", None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            chunks.put(("error", e))
+
+    # --------------------------------------------------------
+    # 내부: 헤지 지연 / 메트릭
+    # --------------------------------------------------------
+    def _hedge_after(self, name: str, tier: str) -> Optional[float]:
+        """
+        헤지 요청까지 기다릴 시간 (초, 설정값 또는 관측 p95)
+
+        티어별 지연 분포가 달라 (이 호출, 티어) 표본을 우선 사용, 부족하면 티어 전체 표본
+        """
+        if not settings.LLM_HEDGE_ENABLED:
+            return None
+        if settings.LLM_HEDGE_AFTER_MS > 0:
+            return settings.LLM_HEDGE_AFTER_MS / 1000
+
+        now = time.monotonic()
+        cached = self._hedge_cache.get((name, tier))
+        if cached and now - cached[0] < HEDGE_CACHE_SECONDS:
+            return cached[1]
+
+        after_ms = HEDGE_DEFAULT_MS
+        for key in (f"llm.{name}.{tier}.latency_ms", f"llm.tier.{tier}.latency_ms"):
+            summary = metrics.get_timer_summary(key)
+            if summary.get("count", 0) >= HEDGE_MIN_SAMPLES:
+                after_ms = summary["p95"]
+                break
+        self._hedge_cache[(name, tier)] = (now, after_ms / 1000)
+        return after_ms / 1000
+
+    def _record_failure(self, name: str, tier: str, timeout: bool = False):
+        self.breakers[tier].record_failure()
+        metrics.incr(f"llm.{name}.timeouts" if timeout else f"llm.{name}.errors")
+        metrics.incr(f"llm.tier.{tier}.errors")
+
+    @staticmethod
+    def _record(name: str, tier: str, started: float, usage=None, hedge: Optional[str] = None):
+        latency_ms = (time.perf_counter() - started) * 1000
+        metrics.observe(f"llm.{name}.latency_ms", latency_ms)
+        metrics.observe(f"llm.{name}.{tier}.latency_ms", latency_ms)
+        metrics.observe(f"llm.tier.{tier}.latency_ms", latency_ms)
+        metrics.incr(f"llm.{name}.calls")
+        metrics.incr(f"llm.tier.{tier}.calls")
+        if hedge:
+            metrics.incr("llm.hedge.fired")
+            if hedge == "won":
+                metrics.incr("llm.hedge.won")
+        if usage is not None:
+            metrics.incr(f"llm.{name}.prompt_tokens", int(getattr(usage, "prompt_token_count", 0) or 0))
+            metrics.incr(f"llm.{name}.cached_tokens", int(getattr(usage, "cached_content_token_count", 0) or 0))
+            metrics.incr(f"llm.{name}.output_tokens", int(getattr(usage, "candidates_token_count", 0) or 0))
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """프로세스 전역 게이트웨이 (설정 기반, Lazy 초기화)"""
+    global _gateway
+
+    with _gateway_lock:
+        if _gateway is None:
+            lite_model = settings.GEMINI_LITE_MODEL if settings.LLM_ROUTING_ENABLED else None
+            _gateway = LLMGateway(settings.GEMINI_MODEL, lite_model)
+    return _gateway
@@ -0,0 +1,112 @@
+"""
+기억 인사이트 중복 판별 (MinHash 스케치)
+- 사실(fact) 문장을 정규화(공백/기호 제거)한 뒤 글자 n-gram(MEMORY_SHINGLE_SIZE) 집합으로 만들고
+  MinHash 서명(NUM_PERM개의 32비트 최솟값)으로 요약 → 서명 일치 비율 ≈ Jaccard 유사도
+- 서명은 MemoryInsight.fact_sketch에 저장 (base64, 약 690자) → 후보를 고를 때 문장을 다시 쪼개지 않음
+- 같은 카테고리에서 서명 유사도로 후보를 고른 뒤, 두 문장의 실제 Jaccard가 MEMORY_DEDUP_THRESHOLD 이상일 때만
+  같은 기억으로 판단 (새 행 대신 기존 행 갱신 → 새 문장은 저장되지 않으므로 거의 같은 문장만 합침)
+  합침: "젊었을 때 부산 자갈치 시장에서 생선 장사를 하셨다" ≈ "… 하셨음" (3-gram 0.90), 띄어쓰기/기호만 다른 문장
+  별개: "딸과 함께 부산 바다에 갔다" / "아들과 …" (0.73), "김치찌개를 좋아한다" / "된장찌개를 …" (0.56)
+"""
+import base64
+import hashlib
+import random
+import re
+import struct
+from typing import List, Optional
+
+from .config import settings
+
+NUM_PERM = 128
+SKETCH_SLACK = 0.1  # 서명 추정 오차 여유 (128개 기준 표준편차 약 0.03) → 실제 Jaccard로 다시 확인
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(20240601)  # 고정 시드: 저장된 서명과 새 서명이 같은 해시 함수를 써야 함
+_PERMS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+_STRIP = re.compile(r"[^0-9A-Za-z가-힣]+")
+_PACK = struct.Struct(f">{NUM_PERM}I")
+_MASK = 0xFFFFFFFF
+
+
+def normalize(fact: str) -> str:
+    """비교용 정규화 (소문자, 공백/기호 제거)"""
+    return _STRIP.sub("", (fact or "").lower())
+
+
+def shingles(fact: str) -> set:
+    """글자 n-gram 집합 (n보다 짧은 문장은 문장 전체 1개)"""
+    text = normalize(fact)
+    n = settings.MEMORY_SHINGLE_SIZE
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def signature(fact: str) -> List[int]:
+    """MinHash 서명 (빈 문장은 빈 리스트)"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") % _MERSENNE
+        for s in shingles(fact)
+    ]
+    if not hashes:
+        return []
+    return [min(((a * h + b) % _MERSENNE) & _MASK for h in hashes) for a, b in _PERMS]
+
+
+def dumps(sig: List[int]) -> Optional[str]:
+    """fact_sketch 컬럼 저장 형식 ("<n-gram 크기>:<base64>")"""
+    if not sig:
+        return None
+    return f"{settings.MEMORY_SHINGLE_SIZE}:" + base64.b64encode(_PACK.pack(*sig)).decode("ascii")
+
+
+def loads(sketch: Optional[str]) -> List[int]:
+    """
+    저장된 서명 복원
+
+    Returns:
+        list: 서명 (없거나 n-gram 크기/형식이 다르면 빈 리스트 → 호출자가 fact로 다시 계산)
+    """
+    size, _, encoded = (sketch or "").partition(":")
+    if size != str(settings.MEMORY_SHINGLE_SIZE) or not encoded:
+        return []
+    try:
+        return list(_PACK.unpack(base64.b64decode(encoded)))
+    except (ValueError, struct.error):
+        return []
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """서명 일치 비율 (Jaccard 유사도 추정, 0~1)"""
+    if not a or not b:
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def jaccard(a: str, b: str) -> float:
+    """두 문장의 실제 n-gram Jaccard 유사도 (0~1)"""
+    sa, sb = shingles(a), shingles(b)
+    if not sa or not sb:
+        return 0.0
+    return len(sa & sb) / len(sa | sb)
+
+
+def find_match(fact: str, sig: List[int], candidates: list) -> Optional[int]:
+    """
+    같은 기억으로 볼 후보의 인덱스 (없으면 None)
+
+    서명 유사도가 임계값 - SKETCH_SLACK 이상인 후보만 두 문장의 실제 Jaccard로 확인
+
+    Args:
+        fact: 새 기억 문장
+        sig: 새 기억의 서명
+        candidates: 비교 대상 [(서명, 문장)]
+    """
+    threshold = settings.MEMORY_DEDUP_THRESHOLD
+    best, best_score = None, threshold
+    for index, (other_sig, other_fact) in enumerate(candidates):
+        if similarity(sig, other_sig) < threshold - SKETCH_SLACK:
+            continue
+        score = jaccard(fact, other_fact)
+        if score >= best_score:
+            best, best_score = index, score
+    return best
@@ -0,0 +1,139 @@
+"""
+경량 메트릭 수집 (Redis 기반)
+- 카운터: 누적 횟수 (예: STT 캐시 히트 수)
+- 게이지: 최신 값 (예: 큐 길이, 쿼터 사용률)
+- 타이머: 최근 N개 샘플 보관 → avg/p50/p95/max 계산
+- 여러 워커/API 프로세스의 값이 같은 Redis 키에 모이므로
+  /api/debug/metrics 한 곳에서 전체 상태를 확인할 수 있음
+- 메트릭 기록 실패가 태스크를 중단시키지 않도록 모든 예외를 삼킴
+"""
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Any
+
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+METRICS_PREFIX = "metrics"
+COUNTERS_KEY = f"{METRICS_PREFIX}:counters"
+GAUGES_KEY = f"{METRICS_PREFIX}:gauges"
+TIMERS_SET_KEY = f"{METRICS_PREFIX}:timers"
+MAX_SAMPLES = 500  # 타이머별 보관 샘플 수
+
+
+def _timer_key(name: str) -> str:
+    return f"{METRICS_PREFIX}:timer:{name}"
+
+
+def incr(name: str, amount: int = 1) -> None:
+    """카운터 증가"""
+    try:
+        get_redis().hincrby(COUNTERS_KEY, name, amount)
+    except Exception as e:
+        logger.debug(f"[Metrics] 카운터 기록 실패 ({name}): {e}")
+
+
+def set_gauge(name: str, value: float) -> None:
+    """게이지 값 갱신"""
+    try:
+        get_redis().hset(GAUGES_KEY, name, value)
+    except Exception as e:
+        logger.debug(f"[Metrics] 게이지 기록 실패 ({name}): {e}")
+
+
+def observe(name: str, value: float) -> None:
+    """
+    타이머/분포 샘플 기록
+
+    Args:
+        name: 메트릭 이름 (단위를 접미사로 표기, 예: "stt.compute_ms")
+        value: 샘플 값
+    """
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.sadd(TIMERS_SET_KEY, name)
+        pipe.lpush(_timer_key(name), round(float(value), 3))
+        pipe.ltrim(_timer_key(name), 0, MAX_SAMPLES - 1)
+        pipe.execute()
+    except Exception as e:
+        logger.debug(f"[Metrics] 샘플 기록 실패 ({name}): {e}")
+
+
+@contextmanager
+def timer(name: str):
+    """
+    블록 실행 시간을 ms 단위로 기록
+
+    Example:
+        >>> with timer("gemini.reply_ms"):
+        ...     response = model.generate_content(prompt)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, (time.perf_counter() - started) * 1000)
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples: list) -> Dict[str, float]:
+    """샘플 목록을 count/avg/p50/p95/max로 요약"""
+    values = sorted(float(v) for v in samples)
+    if not values:
+        return {"count": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "avg": round(sum(values) / len(values), 3),
+        "p50": _percentile(values, 50),
+        "p95": _percentile(values, 95),
+        "max": values[-1],
+    }
+
+
+def get_timer_summary(name: str) -> Dict[str, float]:
+    """단일 타이머 요약 (정책 엔진 등에서 사용)"""
+    try:
+        return summarize(get_redis().lrange(_timer_key(name), 0, -1))
+    except Exception as e:
+        logger.debug(f"[Metrics] 타이머 조회 실패 ({name}): {e}")
+        return summarize([])
+
+
+def snapshot() -> Dict[str, Any]:
+    """
+    전체 메트릭 스냅샷
+
+    Returns:
+        {
+            "counters": {"stt.cache.hit": 12, ...},
+            "gauges": {"gemini.quota.rpm_utilization": 0.42, ...},
+            "timers": {"stt.compute_ms": {"count": 120, "avg": ..., "p95": ...}, ...}
+        }
+    """
+    rd = get_redis()
+
+    counters = {
+        k.decode(): int(v) for k, v in rd.hgetall(COUNTERS_KEY).items()
+    }
+    gauges = {
+        k.decode(): float(v) for k, v in rd.hgetall(GAUGES_KEY).items()
+    }
+
+    timer_names = sorted(n.decode() for n in rd.smembers(TIMERS_SET_KEY))
+    pipe = rd.pipeline(transaction=False)
+    for name in timer_names:
+        pipe.lrange(_timer_key(name), 0, -1)
+    timers = {
+        name: summarize(samples)
+        for name, samples in zip(timer_names, pipe.execute())
+    }
+
+    return {"counters": counters, "gauges": gauges, "timers": timers}
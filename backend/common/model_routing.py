@@ -0,0 +1,62 @@
+"""
+Gemini 모델 티어 라우팅 (lite / full)
+- lite(GEMINI_LITE_MODEL): 짧은 발화에 대한 답변, 첫 인사처럼 가볍고 지연에 민감한 호출
+- full(GEMINI_MODEL): 요약 병합, 기억 추출, 내레이션, 사진 분석처럼 품질이 중요한 호출
+- 규칙 (설정값, 위에서부터 우선):
+    1. LLM_ROUTING_ENABLED=false 또는 GEMINI_LITE_MODEL 미설정 → 항상 full
+    2. LLM_FULL_CALLS에 있는 호출 이름 → full
+    3. LLM_LITE_CALLS에 있는 호출 이름 → lite
+    4. 답변 호출(reply, reply_stream)은 사용자 발화가 LLM_LITE_REPLY_MAX_CHARS자 이하면 lite
+    5. 나머지 → full
+- 결정은 llm.route.<호출>.<티어> 카운터로 기록, 티어별 지연/실패/Fallback은 LLM 게이트웨이가 기록
+"""
+import logging
+from typing import Optional
+
+from . import metrics
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+FULL = "full"
+LITE = "lite"
+REPLY_CALLS = {"reply", "reply_stream"}
+
+
+def _names(value: str) -> set:
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def lite_available() -> bool:
+    return settings.LLM_ROUTING_ENABLED and bool(settings.GEMINI_LITE_MODEL)
+
+
+def tier_for(name: str, user_text: Optional[str] = None) -> str:
+    """
+    호출 이름(과 답변 호출이면 사용자 발화)으로 티어 결정
+
+    Args:
+        name: 게이트웨이 호출 이름 (예: "reply", "summary")
+        user_text: 답변 호출의 사용자 발화 (복잡도 판단용)
+
+    Returns:
+        str: LITE 또는 FULL
+    """
+    if not lite_available():
+        tier, reason = FULL, "라우팅 꺼짐"
+    elif name in _names(settings.LLM_FULL_CALLS):
+        tier, reason = FULL, "full 지정 호출"
+    elif name in _names(settings.LLM_LITE_CALLS):
+        tier, reason = LITE, "lite 지정 호출"
+    elif name in REPLY_CALLS and user_text is not None:
+        length = len(user_text.strip())
+        if length <= settings.LLM_LITE_REPLY_MAX_CHARS:
+            tier, reason = LITE, f"짧은 발화 {length}자"
+        else:
+            tier, reason = FULL, f"긴 발화 {length}자"
+    else:
+        tier, reason = FULL, "기본"
+
+    metrics.incr(f"llm.route.{name}.{tier}")
+    logger.info(f"[Route] {name} → {tier} ({reason})")
+    return tier
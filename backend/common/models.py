@@ -4,7 +4,7 @@ DB 스키마 기반 정의
 """
 from sqlalchemy import (
     Column, String, Integer, Float, Boolean, Text,
-    DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint
+    DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -128,8 +128,9 @@ class ChatSession(Base):
     # 메인 사진
     main_photo_id = Column(UUID(as_uuid=True), ForeignKey("user_photos.id"), nullable=True)
     
-    # 대화 요약 (영상 생성용)
+    # 대화 요약 (영상 생성용, worker.tasks.summarize_session이 점진적으로 갱신)
     summary = Column(Text, nullable=True)
+    summary_last_log_id = Column(Integer, nullable=True)  # 요약에 반영된 마지막 ChatLog ID
     
     # 세션 상태
     is_completed = Column(Boolean, default=False)
@@ -246,6 +247,14 @@ class MemoryInsight(Base):
     importance = Column(Integer, default=1)  # 중요도 (1-5)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # 중복 판별용 MinHash 서명 (common.memory_dedup, 비슷한 기억은 새 행 대신 이 행을 갱신)
+    fact_sketch = Column(Text, nullable=True)
+    
     # 관계
     user = relationship("User", back_populates="memory_insights")
     source_log = relationship("ChatLog")
+    
+    # /memories 조회 (사용자별 중요도순 → 최신순)
+    __table_args__ = (
+        Index('ix_memory_insights_user_importance', 'user_id', 'importance', 'updated_at'),
+    )
@@ -0,0 +1,238 @@
+"""
+사진 분석 캐시 (UserPhoto.ai_analysis)
+- Gemini Vision 분석은 사진당 한 번만 수행해 ai_analysis 컬럼에 JSON으로 저장 (Worker)
+- 저장 형식:
+    {"prompt_version": "v1", "model": "gemini-2.0-flash", "source": "<s3_url>",
+     "analyzed_at": "2025-01-01T00:00:00", "analysis": {"summary": ..., "keywords": [...], ...}}
+- 사진(source)이나 프롬프트 버전이 바뀐 경우에만 다시 분석 (모델만 바뀐 경우는 재사용)
+- 재사용처: 첫 인사(이미지 없이 텍스트 호출 1회), 연관 사진 추천 순위(API), 영상 내레이션
+- 사전 분석(preanalyze_user_photos)은 맞춤 첫 인사도 미리 만들어 "greeting"에 저장
+  → 세션 시작 시 take_greeting()으로 1회 사용 (LLM 호출 없이 즉시 응답)
+- 사전 분석 호출 수는 Redis 일일 카운터로 제한 (PHOTO_ANALYSIS_DAILY_BUDGET)
+- 사용자별 사전 분석 체인은 1개만 (Redis SET NX 잠금, 동기화/업로드가 반복돼도 체인이 늘지 않음)
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from .config import settings
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+PROMPT_VERSION = "v1"  # 아래 프롬프트/스키마를 바꾸면 올릴 것 → 기존 분석 자동 무효화
+
+ANALYSIS_PROMPT = """이 사진을 어르신과의 회상 대화에 쓸 수 있도록 분석해주세요.
+- summary: 사진 속 장소, 인물, 상황을 50자 이내 한 문장으로
+- place: 장소 (모르면 빈 문자열)
+- people: 등장 인물 (예: "할머니와 손주 두 명", 없으면 빈 문자열)
+- activity: 무엇을 하고 있는지
+- season: 계절이나 시기 (모르면 빈 문자열)
+- mood: 사진의 분위기
+- keywords: 사진을 대표하는 명사 3-8개 (예: 바다, 가족, 생일, 시장)
+"""
+
+ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "summary": {"type": "STRING"},
+        "place": {"type": "STRING"},
+        "people": {"type": "STRING"},
+        "activity": {"type": "STRING"},
+        "season": {"type": "STRING"},
+        "mood": {"type": "STRING"},
+        "keywords": {"type": "ARRAY", "items": {"type": "STRING"}},
+    },
+    "required": ["summary", "keywords"],
+}
+
+BUDGET_KEY_PREFIX = "photo_analysis:budget"
+CHAIN_KEY_PREFIX = "photo_analysis:chain"
+CHAIN_LOCK_SECONDS = 600  # 체인 예약 후 첫 실행까지 여유 (재예약 시 countdown만큼 연장)
+
+_DESCRIBE_FIELDS = [("place", "장소"), ("people", "인물"), ("activity", "상황"), ("season", "시기"), ("mood", "분위기")]
+
+
+def dumps(analysis: dict, model: str, source: Optional[str], greeting: Optional[dict] = None) -> str:
+    """ai_analysis 컬럼에 저장할 JSON 문자열 (greeting: {"pet_name": ..., "text": ...})"""
+    entry = {
+        "prompt_version": PROMPT_VERSION,
+        "model": model,
+        "source": source,
+        "analyzed_at": datetime.utcnow().isoformat(),
+        "analysis": analysis,
+    }
+    if greeting:
+        entry["greeting"] = greeting
+    return json.dumps(entry, ensure_ascii=False)
+
+
+def _load_entry(photo) -> Optional[dict]:
+    raw = getattr(photo, "ai_analysis", None)
+    if not raw:
+        return None
+    try:
+        entry = json.loads(raw)
+    except (TypeError, ValueError):
+        return None  # 이전 형식(일반 텍스트)은 재분석
+    if not isinstance(entry, dict) or entry.get("prompt_version") != PROMPT_VERSION:
+        return None
+    if entry.get("source") != getattr(photo, "s3_url", None):
+        return None
+    if not isinstance(entry.get("analysis"), dict):
+        return None
+    return entry
+
+
+def load(photo) -> Optional[dict]:
+    """
+    유효한 캐시 분석 조회
+
+    Args:
+        photo: UserPhoto (ai_analysis, s3_url 사용)
+
+    Returns:
+        dict: 분석 결과 (없거나 사진/프롬프트 버전이 바뀌었으면 None)
+    """
+    entry = _load_entry(photo)
+    return entry["analysis"] if entry else None
+
+
+def has_greeting(photo, pet_name: str) -> bool:
+    """미리 만든 인사가 있는지 (반려견 이름이 바뀌었으면 없는 것으로 판단)"""
+    entry = _load_entry(photo)
+    greeting = entry.get("greeting") if entry else None
+    return bool(greeting and greeting.get("pet_name") == pet_name and greeting.get("text"))
+
+
+def store_greeting(photo, pet_name: str, text: str) -> None:
+    """유효한 분석에 미리 만든 인사 추가 (커밋은 호출자가)"""
+    entry = _load_entry(photo)
+    if entry is None:
+        return
+    entry["greeting"] = {"pet_name": pet_name, "text": text}
+    photo.ai_analysis = json.dumps(entry, ensure_ascii=False)
+
+
+def take_greeting(photo, pet_name: str) -> Optional[str]:
+    """
+    미리 만든 인사를 꺼내고 삭제 (같은 인사가 반복되지 않도록 1회만 사용, 커밋은 호출자가)
+
+    Returns:
+        str: 인사 문구 (없으면 None)
+    """
+    if not has_greeting(photo, pet_name):
+        return None
+    entry = _load_entry(photo)
+    text = entry.pop("greeting")["text"]
+    photo.ai_analysis = json.dumps(entry, ensure_ascii=False)
+    return text
+
+
+def describe(analysis: Optional[dict]) -> str:
+    """프롬프트용 한국어 설명 (예: "바닷가 가족 사진 (장소: 해운대, 인물: 할머니와 손주)")"""
+    if not analysis:
+        return ""
+    details = [f"{label}: {analysis[key]}" for key, label in _DESCRIBE_FIELDS if analysis.get(key)]
+    summary = analysis.get("summary", "")
+    return f"{summary} ({', '.join(details)})" if details else summary
+
+
+def keywords(analysis: Optional[dict]) -> set:
+    """순위 계산용 키워드 집합 (장소 포함)"""
+    if not analysis:
+        return set()
+    words = {str(k).strip() for k in analysis.get("keywords") or [] if str(k).strip()}
+    if analysis.get("place"):
+        words.add(analysis["place"].strip())
+    return words
+
+
+def similarity(a: Optional[dict], b: Optional[dict]) -> float:
+    """두 사진 분석의 키워드 유사도 (Jaccard, 0~1)"""
+    ka, kb = keywords(a), keywords(b)
+    if not ka or not kb:
+        return 0.0
+    return len(ka & kb) / len(ka | kb)
+
+
+# ============================================================
+# 사전 분석 일일 예산 (Redis 카운터, UTC 자정 초기화)
+# ============================================================
+def _budget_key() -> str:
+    return f"{BUDGET_KEY_PREFIX}:{datetime.utcnow():%Y%m%d}"
+
+
+def reserve_budget(calls: int = 1) -> bool:
+    """
+    오늘 예산에서 Gemini 호출 calls회 확보
+
+    Returns:
+        bool: 확보 성공 여부 (Redis 장애 시에도 False → 사전 분석은 건너뜀)
+    """
+    key = _budget_key()
+    try:
+        client = get_redis()
+        used = client.incrby(key, calls)
+        if used == calls:
+            client.expire(key, 2 * 24 * 3600)
+        if used > settings.PHOTO_ANALYSIS_DAILY_BUDGET:
+            client.decrby(key, calls)
+            return False
+        return True
+    except Exception as e:
+        logger.warning(f"[PhotoAnalysis] 예산 확인 실패 (사전 분석 건너뜀): {e}")
+        return False
+
+
+def release_budget(calls: int = 1) -> None:
+    """확보했지만 쓰지 못한 예산 반환"""
+    try:
+        get_redis().decrby(_budget_key(), calls)
+    except Exception as e:
+        logger.warning(f"[PhotoAnalysis] 예산 반환 실패 (무시): {e}")
+
+
+def seconds_until_budget_reset() -> int:
+    """다음 예산 초기화(UTC 자정)까지 남은 초"""
+    now = datetime.utcnow()
+    tomorrow = datetime(now.year, now.month, now.day) + timedelta(days=1)
+    return int((tomorrow - now).total_seconds()) + 1
+
+
+# ============================================================
+# 사용자별 사전 분석 체인 잠금 (Redis SET NX)
+# ============================================================
+def _chain_key(user_id) -> str:
+    return f"{CHAIN_KEY_PREFIX}:{user_id}"
+
+
+def claim_chain(user_id) -> bool:
+    """
+    사전 분석 체인 시작 권한 확보 (이미 진행/예약 중인 체인이 있으면 False)
+
+    Returns:
+        bool: 확보 성공 여부 (Redis 장애 시 False → 사전 분석은 건너뜀)
+    """
+    try:
+        return bool(get_redis().set(_chain_key(user_id), "1", nx=True, ex=CHAIN_LOCK_SECONDS))
+    except Exception as e:
+        logger.warning(f"[PhotoAnalysis] 사전 분석 잠금 실패 (건너뜀): {e}")
+        return False
+
+
+def extend_chain(user_id, countdown: float) -> None:
+    """체인을 다시 예약할 때 잠금을 다음 실행 이후까지 연장"""
+    try:
+        get_redis().set(_chain_key(user_id), "1", ex=int(countdown) + CHAIN_LOCK_SECONDS)
+    except Exception as e:
+        logger.warning(f"[PhotoAnalysis] 사전 분석 잠금 연장 실패 (무시): {e}")
+
+
+def release_chain(user_id) -> None:
+    """체인 종료 (다음 동기화/업로드가 새 체인을 시작할 수 있게)"""
+    try:
+        get_redis().delete(_chain_key(user_id))
+    except Exception as e:
+        logger.warning(f"[PhotoAnalysis] 사전 분석 잠금 해제 실패 (무시): {e}")
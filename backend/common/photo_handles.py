@@ -0,0 +1,168 @@
+"""
+사진 핸들 레지스트리 (업로드 1회 → 이후 호출은 핸들만 전달)
+- 축소된 사진(prepare_vision_input 결과)을 모델 제공자의 파일 API에 한 번만 올리고
+  핸들(URI)과 만료 시각을 Redis에 저장 → 같은 사진의 재분석/재시도/헤지 요청은 바이트 재전송 없음
+- 백엔드 (PHOTO_HANDLE_BACKEND):
+    gemini: Gemini File API (genai.upload_file, 48시간 후 자동 삭제)
+    local:  Redis에 바이트를 보관하고 인라인으로 전달 (테스트/개발용 대체 구현, 외부 업로드 없음)
+    off:    레지스트리 미사용 (매번 인라인 전송)
+- 만료 PHOTO_HANDLE_EXPIRY_MARGIN_SECONDS 전부터는 새로 업로드
+- 업로드 실패 시에는 인라인 바이트로 그대로 호출 (가용성 우선)
+"""
+import io
+import json
+import logging
+import time
+from typing import Callable, Optional
+
+from . import metrics
+from .config import settings
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+HANDLE_PREFIX = "photo:handle"
+LOCAL_DATA_PREFIX = "photo:handle:data"
+GEMINI_FILE_TTL_SECONDS = 48 * 3600  # Gemini File API 보관 기간
+
+
+def _inline(data: bytes, mime_type: str) -> dict:
+    return {"mime_type": mime_type, "data": data}
+
+
+# ============================================================
+# 백엔드
+# ============================================================
+class GeminiFileBackend:
+    """Gemini File API 업로드 (genai.configure는 LLM 게이트웨이가 수행)"""
+
+    name = "gemini"
+
+    def upload(self, key: str, data: bytes, mime_type: str) -> dict:
+        import google.generativeai as genai
+
+        uploaded = genai.upload_file(io.BytesIO(data), mime_type=mime_type, display_name=key)
+        expires_at = time.time() + GEMINI_FILE_TTL_SECONDS
+        if getattr(uploaded, "expiration_time", None) is not None:
+            expires_at = uploaded.expiration_time.timestamp()
+        return {"uri": uploaded.uri, "name": uploaded.name, "mime_type": mime_type, "expires_at": expires_at}
+
+    def part(self, handle: dict) -> Optional[dict]:
+        return {"file_data": {"mime_type": handle["mime_type"], "file_uri": handle["uri"]}}
+
+
+class LocalBackend:
+    """Redis에 바이트 보관 (파일 API 대체 구현, 호출 시 인라인 전달)"""
+
+    name = "local"
+
+    def upload(self, key: str, data: bytes, mime_type: str) -> dict:
+        uri = f"{LOCAL_DATA_PREFIX}:{key}"
+        get_redis().set(uri, data, ex=GEMINI_FILE_TTL_SECONDS)
+        return {"uri": uri, "name": key, "mime_type": mime_type, "expires_at": time.time() + GEMINI_FILE_TTL_SECONDS}
+
+    def part(self, handle: dict) -> Optional[dict]:
+        data = get_redis().get(handle["uri"])
+        return _inline(data, handle["mime_type"]) if data else None
+
+
+_BACKENDS = {"gemini": GeminiFileBackend, "local": LocalBackend}
+_backend = None
+
+
+def get_backend():
+    """설정된 백엔드 (off 또는 알 수 없는 값이면 None)"""
+    global _backend
+    backend_cls = _BACKENDS.get(settings.PHOTO_HANDLE_BACKEND)
+    if backend_cls is None:
+        return None
+    if not isinstance(_backend, backend_cls):
+        _backend = backend_cls()
+    return _backend
+
+
+# ============================================================
+# 레지스트리
+# ============================================================
+def _handle_key(key: str) -> str:
+    return f"{HANDLE_PREFIX}:{key}"
+
+
+def _load_handle(backend, key: str) -> Optional[dict]:
+    try:
+        raw = get_redis().get(_handle_key(key))
+    except Exception as e:
+        logger.warning(f"[PhotoHandle] 조회 실패 (무시): {e}")
+        return None
+    if not raw:
+        return None
+    handle = json.loads(raw)
+    if handle.get("backend") != backend.name:
+        return None
+    if handle["expires_at"] - settings.PHOTO_HANDLE_EXPIRY_MARGIN_SECONDS <= time.time():
+        return None
+    return handle
+
+
+def get_part(key: str, load: Callable[[], bytes], mime_type: str = "image/jpeg") -> dict:
+    """
+    사진 content part 조회 (핸들이 없거나 만료 임박이면 1회 업로드 후 저장)
+
+    Args:
+        key: 사진 식별자 (사진 ID + 원본/축소 설정 해시, 바뀌면 새 핸들)
+        load: 업로드할 바이트를 만드는 함수 (캐시 미스일 때만 호출)
+        mime_type: 이미지 MIME 타입
+
+    Returns:
+        dict: Gemini content part (file_data 또는 인라인 바이트)
+    """
+    backend = get_backend()
+    if backend is None:
+        return _inline(load(), mime_type)
+
+    handle = _load_handle(backend, key)
+    if handle is not None:
+        part = backend.part(handle)
+        if part is not None:
+            metrics.incr("photo_handle.hit")
+            return part
+
+    data = load()
+    started = time.perf_counter()
+    try:
+        handle = backend.upload(key, data, mime_type)
+    except Exception as e:
+        metrics.incr("photo_handle.upload_failed")
+        logger.warning(f"[PhotoHandle] 업로드 실패, 인라인 전송: {e}")
+        return _inline(data, mime_type)
+    metrics.observe("photo_handle.upload_ms", (time.perf_counter() - started) * 1000)
+    metrics.incr("photo_handle.upload")
+
+    handle["backend"] = backend.name
+    ttl = int(handle["expires_at"] - time.time() - settings.PHOTO_HANDLE_EXPIRY_MARGIN_SECONDS)
+    if ttl > 0:
+        try:
+            get_redis().set(_handle_key(key), json.dumps(handle), ex=ttl)
+        except Exception as e:
+            logger.warning(f"[PhotoHandle] 저장 실패 (무시): {e}")
+    return backend.part(handle) or _inline(data, mime_type)
+
+
+def invalidate(key: str) -> None:
+    """핸들 삭제 (제공자 쪽에서 파일이 먼저 사라진 경우)"""
+    try:
+        get_redis().delete(_handle_key(key))
+    except Exception as e:
+        logger.warning(f"[PhotoHandle] 삭제 실패 (무시): {e}")
+
+
+def file_missing(error: Exception) -> bool:
+    """
+    제공자가 핸들 파일이 없거나 만료됐다고 응답했는지 (404 / 권한 없음)
+
+    그 외 실패(타임아웃, 차단기, 응답 형식 오류 등)는 핸들과 무관 → 무효화/재업로드하지 않음
+    """
+    message = str(error).lower()
+    if "file" not in message:
+        return False
+    return any(marker in message for marker in ("not found", "404", "not exist", "expired", "permission", "403"))
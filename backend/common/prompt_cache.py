@@ -0,0 +1,248 @@
+"""
+정적 프롬프트 접두부 캐시 (페르소나/출력 형식 지시문은 한 번 등록 → 호출마다 동적 부분만 전송)
+- register(name, text): 모듈 로드 시 정적 지시문 등록 (예: worker.tasks의 복실이 답변 지시문)
+- 게이트웨이 호출에 system=name을 주면 contents에는 동적 꼬리(요약, 최근 대화, 사용자 말)만 넣음
+- 백엔드 (PROMPT_CACHE_BACKEND):
+    gemini: Gemini context caching (genai.caching.CachedContent, TTL PROMPT_CACHE_TTL_SECONDS)
+            PROMPT_CACHE_MIN_TOKENS 미만 접두부는 제공자 최소 크기 미달 → 캐시 없이 system_instruction으로 전달
+            캐시 생성은 워밍업(warm)과 백그라운드 스레드에서만 → 요청 경로는 Redis 조회만 (네트워크 호출 없음)
+            모델별 캐시 이름을 Redis에 저장해 워커 프로세스들이 공유 (생성은 Redis NX 잠금으로 1곳에서만)
+            만료 PROMPT_CACHE_REFRESH_MARGIN_SECONDS 전부터 백그라운드 갱신, 캐시가 없는 동안은 system_instruction
+            생성 실패 시 PROMPT_CACHE_RETRY_SECONDS 동안 재시도하지 않음
+    local:  캐시 생성 없이 system_instruction으로 전달 (외부 호출 없는 테스트/개발용 대체 구현)
+    off:    접두부를 contents 앞에 붙여 매번 전송 (기존 방식)
+- 메트릭: llm.prefix_cache.<mode> (cached / local / system / inline), llm.prefix_cache.create / create_failed,
+  llm.prefix_cache.saved_tokens (캐시로 요청에서 빠진 접두부 추정 토큰, cached만),
+  llm.<name>.cached_tokens (제공자가 보고한 캐시 토큰, common.llm_gateway)
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import NamedTuple, Optional
+
+from . import metrics
+from .config import settings
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "prompt_cache"
+
+CACHED = "cached"
+LOCAL = "local"
+SYSTEM = "system"
+INLINE = "inline"
+
+
+class Prefix(NamedTuple):
+    """호출 하나에 적용할 정적 접두부"""
+    name: str
+    mode: str  # CACHED / LOCAL / SYSTEM / INLINE
+    text: str
+    cache_name: Optional[str] = None  # CACHED일 때 Gemini CachedContent 이름
+
+    @property
+    def tokens(self) -> int:
+        """접두부 추정 토큰 (한국어 2글자당 1토큰, common.gemini_quota와 같은 기준)"""
+        return len(self.text) // 2 + 1
+
+
+USE_GRACE_SECONDS = 60  # 만료까지 이보다 적게 남은 캐시는 호출에 쓰지 않음 (호출 중 만료 방지)
+CREATE_LOCK_SECONDS = 60  # 프로세스 간 생성 잠금 (생성 호출 최대 시간)
+
+_prefixes = {}
+_failed_until = {}  # (name, model) → 캐시 생성 재시도 시각 (프로세스 로컬)
+_refreshing = set()  # (name, model) → 이 프로세스에서 생성 중
+_lock = threading.Lock()  # _failed_until / _refreshing 보호 (네트워크 호출은 잠금 밖에서)
+
+
+def register(name: str, text: str) -> None:
+    """정적 접두부 등록 (같은 이름을 다시 등록하면 교체 → 내용 해시가 바뀌어 새 캐시 생성)"""
+    _prefixes[name] = text.strip()
+
+
+def _cache_key(name: str, model_name: str, text: str) -> str:
+    digest = hashlib.sha1(f"{model_name}\n{text}".encode("utf-8")).hexdigest()[:16]
+    return f"{CACHE_PREFIX}:{name}:{digest}"
+
+
+# ============================================================
+# Gemini context caching
+# ============================================================
+def _cacheable(text: str) -> bool:
+    """제공자 최소 캐시 크기 이상인지 (미만이면 생성 시도 자체를 하지 않음)"""
+    return Prefix("", CACHED, text).tokens >= settings.PROMPT_CACHE_MIN_TOKENS
+
+
+def _load_cache_name(key: str):
+    """
+    Redis에 저장된 캐시 조회
+
+    Returns:
+        tuple: (쓸 수 있는 캐시 이름 또는 None, 갱신 필요 여부)
+    """
+    try:
+        raw = get_redis().get(key)
+    except Exception as e:
+        logger.warning(f"[PromptCache] 조회 실패 (무시): {e}")
+        return None, False
+    if not raw:
+        return None, True
+    entry = json.loads(raw)
+    remaining = entry["expires_at"] - time.time()
+    cache_name = entry["cache_name"] if remaining > USE_GRACE_SECONDS else None
+    return cache_name, remaining <= settings.PROMPT_CACHE_REFRESH_MARGIN_SECONDS
+
+
+def _create_cache(key: str, name: str, model_name: str, text: str) -> str:
+    import google.generativeai as genai
+
+    ttl = settings.PROMPT_CACHE_TTL_SECONDS
+    cached = genai.caching.CachedContent.create(
+        model=model_name if model_name.startswith("models/") else f"models/{model_name}",
+        display_name=name,
+        system_instruction=text,
+        ttl=timedelta(seconds=ttl),
+    )
+    entry = {"cache_name": cached.name, "expires_at": time.time() + ttl}
+    try:
+        get_redis().set(key, json.dumps(entry), ex=ttl)
+    except Exception as e:
+        logger.warning(f"[PromptCache] 저장 실패 (무시): {e}")
+    return cached.name
+
+
+def _refresh(name: str, model_name: str, text: str) -> Optional[str]:
+    """
+    캐시 생성 (워밍업/백그라운드 스레드 전용, 요청 경로에서 직접 호출하지 않음)
+
+    - 이 프로세스에서 이미 생성 중이거나 실패 후 재시도 대기 중이면 건너뜀
+    - 다른 프로세스가 생성 중이면(Redis NX 잠금) 건너뜀 → 그쪽 결과를 Redis에서 읽음
+    """
+    job = (name, model_name)
+    with _lock:
+        if job in _refreshing or _failed_until.get(job, 0) > time.time():
+            return None
+        _refreshing.add(job)
+
+    key = _cache_key(name, model_name, text)
+    cache_name = None
+    try:
+        try:
+            if not get_redis().set(f"{key}:creating", "1", nx=True, ex=CREATE_LOCK_SECONDS):
+                return None
+        except Exception as e:
+            logger.warning(f"[PromptCache] 생성 잠금 실패 (이 프로세스에서 생성): {e}")
+        cache_name = _create_cache(key, name, model_name, text)
+    except Exception as e:
+        metrics.incr("llm.prefix_cache.create_failed")
+        with _lock:
+            _failed_until[job] = time.time() + settings.PROMPT_CACHE_RETRY_SECONDS
+        logger.warning(f"[PromptCache] {name} 캐시 생성 실패, system_instruction으로 전달: {e}")
+        return None
+    finally:
+        with _lock:
+            _refreshing.discard(job)
+
+    metrics.incr("llm.prefix_cache.create")
+    logger.info(f"[PromptCache] {name} 캐시 생성 ({model_name}, {cache_name})")
+    return cache_name
+
+
+def _gemini_cache_name(name: str, model_name: str, text: str) -> Optional[str]:
+    """
+    유효한 캐시 이름 (Redis 조회만, 없거나 만료가 가까우면 백그라운드 갱신 예약)
+
+    Returns:
+        str: 캐시 이름 (없으면 None → 이번 호출은 system_instruction)
+    """
+    cache_name, stale = _load_cache_name(_cache_key(name, model_name, text))
+    if stale:
+        with _lock:
+            busy = (name, model_name) in _refreshing or _failed_until.get((name, model_name), 0) > time.time()
+        if not busy:
+            threading.Thread(
+                target=_refresh, args=(name, model_name, text), name=f"prompt-cache-{name}", daemon=True
+            ).start()
+    return cache_name
+
+
+# ============================================================
+# 게이트웨이용 API
+# ============================================================
+def resolve(name: str, model_name: str) -> Prefix:
+    """
+    호출에 적용할 접두부 결정 (호출마다 1회, 모드별 카운터 기록)
+
+    Args:
+        name: register()로 등록한 접두부 이름
+        model_name: 호출할 Gemini 모델 (캐시는 모델별)
+
+    Raises:
+        KeyError: 등록되지 않은 이름
+    """
+    text = _prefixes[name]
+    backend = settings.PROMPT_CACHE_BACKEND
+    if backend == "gemini":
+        cache_name = _gemini_cache_name(name, model_name, text) if _cacheable(text) else None
+        prefix = Prefix(name, CACHED, text, cache_name) if cache_name else Prefix(name, SYSTEM, text)
+    elif backend == "local":
+        prefix = Prefix(name, LOCAL, text)
+    else:
+        prefix = Prefix(name, INLINE, text)
+
+    metrics.incr(f"llm.prefix_cache.{prefix.mode}")
+    if prefix.mode == CACHED:
+        metrics.incr("llm.prefix_cache.saved_tokens", prefix.tokens)
+    return prefix
+
+
+def warm(model_names) -> None:
+    """
+    등록된 접두부의 모델별 캐시를 미리 생성 (워커 워밍업에서 1회, gemini 백엔드만)
+
+    Args:
+        model_names: 캐시를 만들 Gemini 모델 이름들 (티어별)
+    """
+    if settings.PROMPT_CACHE_BACKEND != "gemini":
+        return
+    for name, text in list(_prefixes.items()):
+        if not _cacheable(text):
+            logger.info(
+                f"[PromptCache] {name} 접두부 {Prefix(name, SYSTEM, text).tokens}토큰 "
+                f"< 최소 {settings.PROMPT_CACHE_MIN_TOKENS} → system_instruction으로 전달"
+            )
+            continue
+        for model_name in set(model_names):
+            key = _cache_key(name, model_name, text)
+            if not _load_cache_name(key)[1]:
+                continue  # 다른 프로세스가 만든 유효한 캐시
+            _refresh(name, model_name, text)
+
+
+def build_model(prefix: Prefix, model_name: str):
+    """
+    접두부를 담은 GenerativeModel (게이트웨이가 (티어, 접두부, 캐시 이름)별로 재사용)
+
+    CACHED는 제공자에서 캐시 정보를 조회(네트워크)하므로 잠금 밖에서 호출할 것
+    INLINE 모드는 호출자가 contents 앞에 접두부를 붙이므로 사용하지 않음
+    """
+    import google.generativeai as genai
+
+    if prefix.mode == CACHED:
+        return genai.GenerativeModel.from_cached_content(prefix.cache_name)
+    return genai.GenerativeModel(model_name, system_instruction=prefix.text)
+
+
+def invalidate(name: str, model_name: str) -> None:
+    """캐시 이름 삭제 (제공자 쪽에서 캐시가 먼저 사라진 경우 → 다음 호출에서 새로 생성)"""
+    text = _prefixes.get(name)
+    if text is None:
+        return
+    try:
+        get_redis().delete(_cache_key(name, model_name, text))
+    except Exception as e:
+        logger.warning(f"[PromptCache] 삭제 실패 (무시): {e}")
@@ -0,0 +1,40 @@
+"""
+공용 Redis 클라이언트
+- API(EC2)와 Worker(RunPod)가 Celery 브로커와 같은 Redis(settings.redis_url)를 공유
+- 프로세스당 커넥션 풀 1개를 재사용 (fork 이후에는 redis-py가 자동으로 재연결)
+"""
+import redis
+import redis.asyncio
+
+from .config import settings
+
+_client = None
+_async_client = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    공용 Redis 클라이언트 반환 (Lazy 초기화)
+
+    Returns:
+        redis.Redis: settings.redis_url에 연결된 클라이언트
+    """
+    global _client
+
+    if _client is None:
+        _client = redis.from_url(settings.redis_url)
+    return _client
+
+
+def get_async_redis() -> "redis.asyncio.Redis":
+    """
+    FastAPI(async) 엔드포인트용 Redis 클라이언트 (이벤트 루프 블로킹 방지)
+
+    Returns:
+        redis.asyncio.Redis: settings.redis_url에 연결된 async 클라이언트
+    """
+    global _async_client
+
+    if _async_client is None:
+        _async_client = redis.asyncio.from_url(settings.redis_url)
+    return _async_client
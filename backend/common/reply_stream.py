@@ -0,0 +1,77 @@
+"""
+AI 답변 스트리밍 이벤트 (Redis Stream)
+- Worker: Gemini 스트리밍 응답에서 문장이 완성될 때마다 이벤트 추가
+- API: SSE(/api/task/{task_id}/stream)로 앱에 전달 → expo-speech가 첫 문장부터 재생
+- 키: reply:stream:<task_id> (Task.replace로 음성 턴 전체가 같은 task_id를 사용)
+- 추가와 동시에 tasks:events 채널로도 발행 (common.task_events, API는 구독으로 즉시 전달)
+  → Stream은 늦게 연결한 클라이언트의 재생용
+
+이벤트 타입:
+    transcript: {"user_text": "..."}                 STT 결과
+    sentence:   {"index": 0, "text": "..."}          답변 문장 (완성되는 순서대로)
+    meta:       {"sentiment": "..."}
+
+완료(done)/실패(error)는 Worker 시그널이 task_events로만 발행 (태스크 결과 자체가 기록)
+"""
+import json
+from typing import List, Optional, Tuple
+
+import redis
+
+from .redis_client import get_redis
+from .task_events import CHANNEL, encode
+
+STREAM_PREFIX = "reply:stream"
+STREAM_TTL_SECONDS = 600
+TERMINAL_EVENTS = {"done", "error"}
+
+
+def stream_key(task_id: str) -> str:
+    """답변 스트림 키"""
+    return f"{STREAM_PREFIX}:{task_id}"
+
+
+def publish(task_id: str, event: str, payload: dict) -> None:
+    """이벤트 추가 + Pub/Sub 발행 (Worker, sync)"""
+    key = stream_key(task_id)
+    rd = get_redis()
+    entry_id = rd.xadd(key, {"event": event, "data": json.dumps(payload, ensure_ascii=False)}).decode()
+
+    pipe = rd.pipeline(transaction=False)
+    pipe.expire(key, STREAM_TTL_SECONDS)
+    pipe.publish(CHANNEL, encode(task_id, event, payload, entry_id))
+    pipe.execute()
+
+
+async def read_events(
+    rd: "redis.asyncio.Redis",
+    task_id: str,
+    last_id: str = "0",
+    block_ms: Optional[int] = 1000
+) -> List[Tuple[str, str, dict]]:
+    """
+    last_id 이후 이벤트 조회 (API, async, 최대 block_ms 대기, None이면 대기 없음)
+
+    Returns:
+        List[(entry_id, event, payload)] - 새 이벤트가 없으면 빈 리스트
+    """
+    response = await rd.xread({stream_key(task_id): last_id}, block=block_ms)
+    events = []
+    for _, entries in response or []:
+        for entry_id, fields in entries:
+            events.append((
+                entry_id.decode(),
+                fields[b"event"].decode(),
+                json.loads(fields[b"data"])
+            ))
+    return events
+
+
+def format_sse(event: str, payload: dict, event_id: Optional[str] = None) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(payload, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
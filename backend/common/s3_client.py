@@ -81,6 +81,58 @@ class S3Client:
             logger.error(f"S3 업로드 실패: {e}")
             raise S3Error(f"업로드 실패: {str(e)}")
 
+    def upload_bytes(
+        self,
+        data: bytes,
+        s3_key: str,
+        content_type: Optional[str] = None
+    ) -> str:
+        """
+        메모리 데이터를 S3에 업로드 (로컬 임시 파일 없음)
+
+        Args:
+            data: 업로드할 바이트
+            s3_key: S3 객체 키
+            content_type: MIME 타입
+
+        Returns:
+            S3 URL
+        """
+        try:
+            extra_args = {'ContentType': content_type} if content_type else {}
+            self.client.put_object(Bucket=self.bucket, Key=s3_key, Body=data, **extra_args)
+
+            url = f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{s3_key}"
+            logger.info(f"S3 업로드 완료 ({len(data)} bytes): {url}")
+            return url
+
+        except self.ClientError as e:
+            logger.error(f"S3 업로드 실패: {e}")
+            raise S3Error(f"업로드 실패: {str(e)}")
+
+    def download_bytes(self, s3_url_or_key: str) -> bytes:
+        """
+        S3 객체를 메모리로 다운로드 (로컬 임시 파일 없음)
+
+        Args:
+            s3_url_or_key: S3 URL 또는 키
+
+        Returns:
+            객체 바이트
+        """
+        try:
+            if s3_url_or_key.startswith("https://"):
+                s3_key = s3_url_or_key.split('.amazonaws.com/')[-1]
+            else:
+                s3_key = s3_url_or_key
+
+            response = self.client.get_object(Bucket=self.bucket, Key=s3_key)
+            return response['Body'].read()
+
+        except self.ClientError as e:
+            logger.error(f"S3 다운로드 실패: {e}")
+            raise S3Error(f"다운로드 실패: {str(e)}")
+
     def download_file(self, s3_url_or_key: str, local_path: str) -> str:
         """
         S3에서 파일 다운로드
@@ -195,6 +247,29 @@ class LocalStorageClient:
         logger.info(f"로컬 스토리지 다운로드: {src} -> {local_path}")
         return local_path
 
+    def upload_bytes(
+        self,
+        data: bytes,
+        s3_key: str,
+        content_type: Optional[str] = None
+    ) -> str:
+        """메모리 데이터를 로컬 디렉토리에 저장"""
+        dest_path = os.path.join(self.base_path, s3_key)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with open(dest_path, "wb") as f:
+            f.write(data)
+        logger.info(f"로컬 저장 ({len(data)} bytes): {dest_path}")
+        return f"file://{dest_path}"
+
+    def download_bytes(self, s3_url_or_key: str) -> bytes:
+        """로컬 파일을 메모리로 읽기"""
+        if s3_url_or_key.startswith("file://"):
+            src_path = s3_url_or_key[7:]
+        else:
+            src_path = os.path.join(self.base_path, s3_url_or_key)
+        with open(src_path, "rb") as f:
+            return f.read()
+
     def generate_presigned_url(
         self,
         s3_key: str,
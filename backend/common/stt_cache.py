@@ -0,0 +1,188 @@
+"""
+STT 결과 캐시 (Redis, 내용 해시 기반)
+- 같은 음성(재전송, 중복 탭, 재업로드)을 다시 인식하지 않도록 결과를 저장
+- 키: 디코딩된 PCM(16kHz float32)의 sha256 → 티어("medium-b5" 등)별 인식 결과 (HASH)
+- 업로드 원본 바이트의 sha256 → PCM 해시 별칭
+  → API가 업로드 시점에 원본 해시만으로 조회해 STT 태스크 없이 바로 답변 단계로 연결
+- 항목에는 티어 선택 입력(클립 길이, 빔 상한)도 함께 저장 → 업로드 적중 시에도 같은 티어 정책 적용
+- TTL + 전체 항목 수 상한 (접근 시각 ZSET으로 오래된 항목부터 제거, 항목을 가리키는 별칭도 함께 제거)
+"""
+import hashlib
+import logging
+import time
+from typing import List, Optional
+
+import redis.asyncio
+
+from .config import settings
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+ENTRY_PREFIX = "stt:cache"
+ALIAS_PREFIX = "stt:cache:upload"
+ALIAS_SET_PREFIX = "stt:cache:aliases"  # SET: PCM 해시 → 이 항목을 가리키는 업로드 해시들
+INDEX_KEY = "stt:cache:index"  # ZSET: PCM 해시 → 마지막 접근 시각
+
+# 항목 HASH의 메타 필드 (티어 이름과 겹치지 않도록 "_" 접두사)
+FIELD_CLIP_SECONDS = "_clip_seconds"
+FIELD_MAX_BEAM = "_max_beam"
+
+
+def digest(data: bytes) -> str:
+    """바이트 sha256 (업로드 원본 또는 PCM)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _entry_key(pcm_digest: str) -> str:
+    return f"{ENTRY_PREFIX}:{pcm_digest}"
+
+
+def _alias_key(upload_digest: str) -> str:
+    return f"{ALIAS_PREFIX}:{upload_digest}"
+
+
+def _alias_set_key(pcm_digest: str) -> str:
+    return f"{ALIAS_SET_PREFIX}:{pcm_digest}"
+
+
+def get(pcm_digest: str, tiers: List[str]) -> Optional[tuple]:
+    """
+    캐시 조회 (Worker)
+
+    Args:
+        pcm_digest: 디코딩된 PCM 해시
+        tiers: 허용 티어 (선호 순서, 선택된 티어와 그보다 품질 높은 티어)
+
+    Returns:
+        tuple: (tier, 인식 결과) (없으면 None)
+    """
+    if not settings.STT_CACHE_ENABLED:
+        return None
+    try:
+        rd = get_redis()
+        for tier, text in zip(tiers, rd.hmget(_entry_key(pcm_digest), tiers)):
+            if text is not None:
+                rd.zadd(INDEX_KEY, {pcm_digest: time.time()})
+                return tier, text.decode()
+        return None
+    except Exception as e:
+        logger.warning(f"[STT Cache] 조회 실패 (무시): {e}")
+        return None
+
+
+def put(
+    pcm_digest: str,
+    tier: str,
+    text: str,
+    upload_digest: Optional[str] = None,
+    clip_seconds: Optional[float] = None,
+    max_beam: Optional[int] = None
+) -> None:
+    """
+    인식 결과 저장 + 상한 초과분 제거 (Worker)
+
+    빈 결과(무음)는 저장하지 않음
+
+    Args:
+        clip_seconds: 티어 선택에 쓴 음성 길이 (업로드 적중 시 같은 정책으로 티어 판정)
+        max_beam: 티어 선택에 쓴 빔 상한 (짧은 발화)
+    """
+    if not settings.STT_CACHE_ENABLED or not text:
+        return
+    ttl = settings.STT_CACHE_TTL_SECONDS
+    try:
+        rd = get_redis()
+        fields = {tier: text}
+        if clip_seconds is not None:
+            fields[FIELD_CLIP_SECONDS] = clip_seconds
+            fields[FIELD_MAX_BEAM] = "" if max_beam is None else max_beam
+        pipe = rd.pipeline(transaction=False)
+        pipe.hset(_entry_key(pcm_digest), mapping=fields)
+        pipe.expire(_entry_key(pcm_digest), ttl)
+        if upload_digest:
+            pipe.set(_alias_key(upload_digest), pcm_digest, ex=ttl)
+            pipe.sadd(_alias_set_key(pcm_digest), upload_digest)
+            pipe.expire(_alias_set_key(pcm_digest), ttl)
+        pipe.zadd(INDEX_KEY, {pcm_digest: time.time()})
+        # TTL로 이미 만료된 항목은 인덱스에서도 정리
+        pipe.zremrangebyscore(INDEX_KEY, "-inf", time.time() - ttl)
+        pipe.zcard(INDEX_KEY)
+        size = pipe.execute()[-1]
+
+        overflow = size - settings.STT_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            _evict(rd, [member.decode() for member, _ in rd.zpopmin(INDEX_KEY, overflow)])
+    except Exception as e:
+        logger.warning(f"[STT Cache] 저장 실패 (무시): {e}")
+
+
+def _evict(rd, pcm_digests: List[str]) -> None:
+    """항목 + 항목을 가리키는 업로드 별칭을 한 파이프라인으로 제거 (고아 별칭 방지)"""
+    if not pcm_digests:
+        return
+    pipe = rd.pipeline(transaction=False)
+    for pcm_digest in pcm_digests:
+        pipe.smembers(_alias_set_key(pcm_digest))
+    alias_sets = pipe.execute()
+
+    keys = []
+    for pcm_digest, uploads in zip(pcm_digests, alias_sets):
+        keys += [_entry_key(pcm_digest), _alias_set_key(pcm_digest)]
+        keys += [_alias_key(u.decode()) for u in uploads]
+    rd.delete(*keys)
+
+
+def _pick_best(entry: dict) -> Optional[tuple]:
+    """티어별 결과 중 빔이 가장 큰 결과 선택 → (tier, text)"""
+    if not entry:
+        return None
+
+    def beam(tier: str) -> int:
+        try:
+            return int(tier.rsplit("-b", 1)[-1])
+        except ValueError:
+            return 0
+
+    tiers = [t.decode() for t in entry.keys() if not t.startswith(b"_")]
+    if not tiers:
+        return None
+    tier = max(tiers, key=beam)
+    return tier, entry[tier.encode()].decode()
+
+
+async def find_upload(rd: "redis.asyncio.Redis", upload_digest: str) -> Optional[dict]:
+    """
+    업로드 원본 해시로 캐시 조회 (API, async)
+
+    Returns:
+        dict: {"text": 인식 결과, "tier": 티어, "pcm_digest": PCM 해시,
+               "clip_seconds": 음성 길이, "max_beam": 빔 상한} (없으면 None)
+              clip_seconds가 None이면 티어 판정 없이 모든 티어 허용 (긴 발화 청크 인식 결과)
+    """
+    if not settings.STT_CACHE_ENABLED:
+        return None
+    try:
+        pcm_digest = await rd.get(_alias_key(upload_digest))
+        if pcm_digest is None:
+            return None
+        pcm_digest = pcm_digest.decode()
+
+        entry = await rd.hgetall(_entry_key(pcm_digest))
+        best = _pick_best(entry)
+        if best is None:
+            return None
+        await rd.zadd(INDEX_KEY, {pcm_digest: time.time()})
+
+        clip_seconds = entry.get(FIELD_CLIP_SECONDS.encode())
+        max_beam = entry.get(FIELD_MAX_BEAM.encode())
+        return {
+            "text": best[1],
+            "tier": best[0],
+            "pcm_digest": pcm_digest,
+            "clip_seconds": float(clip_seconds) if clip_seconds else None,
+            "max_beam": int(max_beam) if max_beam else None,
+        }
+    except Exception as e:
+        logger.warning(f"[STT Cache] 업로드 조회 실패 (무시): {e}")
+        return None
@@ -0,0 +1,125 @@
+"""
+태스크 이벤트 푸시 (Redis Pub/Sub)
+- Worker: 태스크 시작/완료/실패와 답변 스트림 이벤트를 채널 하나(tasks:events)에 발행
+- API: 프로세스당 구독 1개(TaskEventHub)를 lifespan에서 유지하고
+  task_id별 대기열로 나눠 SSE 연결에 전달 → 1초 간격 폴링 없이 완료 즉시 응답
+- Pub/Sub은 구독 전에 발행된 메시지를 보관하지 않으므로
+  늦게 연결한 클라이언트는 reply_stream 재생 + AsyncResult 1회 조회로 보완
+- 폴링(/api/task/{task_id})은 그대로 유지 (Pub/Sub 장애 시 대체 경로)
+
+메시지 형식 (JSON):
+    {"task_id": "...", "event": "progress|transcript|sentence|meta|done|error",
+     "data": {...}, "id": reply_stream 엔트리 ID (없으면 null)}
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+from .redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "tasks:events"
+RECONNECT_DELAY_SECONDS = 1
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+def encode(task_id: str, event: str, payload: dict, entry_id: Optional[str] = None) -> str:
+    """Pub/Sub 메시지 직렬화"""
+    return json.dumps(
+        {"task_id": task_id, "event": event, "data": payload, "id": entry_id},
+        ensure_ascii=False,
+        default=str
+    )
+
+
+def publish(task_id: str, event: str, payload: dict, entry_id: Optional[str] = None) -> None:
+    """이벤트 발행 (Worker, sync, 구독자가 없으면 버려짐)"""
+    get_redis().publish(CHANNEL, encode(task_id, event, payload, entry_id))
+
+
+class TaskEventHub:
+    """
+    API 프로세스의 단일 Pub/Sub 구독 → task_id별 asyncio.Queue로 분배
+
+    사용 예:
+        queue = hub.subscribe(task_id)
+        try:
+            message = await queue.get()
+        finally:
+            hub.unsubscribe(task_id, queue)
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._runner: Optional[asyncio.Task] = None
+        self.connected = False
+
+    async def start(self):
+        """구독 루프 시작 (lifespan 시작 시 1회)"""
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """구독 루프 종료 (lifespan 종료 시)"""
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+
+    def subscribe(self, task_id: str) -> asyncio.Queue:
+        """task_id 이벤트 대기열 등록"""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[task_id].add(queue)
+        return queue
+
+    def unsubscribe(self, task_id: str, queue: asyncio.Queue):
+        """대기열 해제 (SSE 연결 종료 시 반드시 호출)"""
+        queues = self._subscribers.get(task_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[task_id]
+
+    def _dispatch(self, raw: bytes):
+        message = json.loads(raw)
+        for queue in list(self._subscribers.get(message.get("task_id"), ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning(f"[TaskEvents] 대기열 가득 참, 이벤트 버림: {message.get('task_id')}")
+
+    async def _run(self):
+        """구독 유지 (연결이 끊기면 재구독)"""
+        while True:
+            pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHANNEL)
+                self.connected = True
+                logger.info(f"📡 태스크 이벤트 구독 시작: {CHANNEL}")
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        try:
+                            self._dispatch(message["data"])
+                        except ValueError as e:
+                            logger.warning(f"[TaskEvents] 잘못된 메시지 (무시): {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[TaskEvents] 구독 끊김, 재연결: {e}")
+            finally:
+                self.connected = False
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+
+hub = TaskEventHub()
@@ -0,0 +1,94 @@
+"""
+워커 준비 상태 레지스트리 (Redis)
+- 워커 프로세스가 모델 워밍업을 마치면 자신의 상태(역할, 디바이스, 로딩 시간)를 등록
+- 하트비트로 TTL을 갱신하므로 죽은 워커는 자동으로 목록에서 사라짐
+- API는 음성 턴 전송 전에 준비된 STT 워커가 있는지 확인
+"""
+import os
+import json
+import socket
+import logging
+import threading
+from typing import List, Optional
+
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_PREFIX = "workers:ready"
+HEARTBEAT_TTL_SECONDS = 60
+HEARTBEAT_INTERVAL_SECONDS = 20
+
+_heartbeat_stop = threading.Event()
+
+
+def worker_key(worker_id: Optional[str] = None) -> str:
+    """워커 프로세스별 레지스트리 키 (기본: hostname:pid)"""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    return f"{REGISTRY_PREFIX}:{worker_id}"
+
+
+def publish_ready(info: dict, worker_id: Optional[str] = None) -> str:
+    """
+    워커 준비 상태 등록 + 하트비트 시작
+
+    Args:
+        info: {"roles": ["stt", "llm"], "device": "cuda", "compute_type": "float16",
+               "load_seconds": {"whisper": 12.3, "gemini": 0.4}, ...}
+
+    Returns:
+        str: 레지스트리 키
+    """
+    key = worker_key(worker_id)
+    payload = json.dumps(info, ensure_ascii=False)
+    get_redis().set(key, payload, ex=HEARTBEAT_TTL_SECONDS)
+
+    def heartbeat():
+        while not _heartbeat_stop.wait(HEARTBEAT_INTERVAL_SECONDS):
+            try:
+                # 키가 사라졌으면(Redis 재시작 등) 다시 등록
+                if not get_redis().expire(key, HEARTBEAT_TTL_SECONDS):
+                    get_redis().set(key, payload, ex=HEARTBEAT_TTL_SECONDS)
+            except Exception as e:
+                logger.warning(f"[Registry] 하트비트 실패 (무시): {e}")
+
+    threading.Thread(target=heartbeat, name="worker-heartbeat", daemon=True).start()
+    logger.info(f"[Registry] 준비 완료 등록: {key} {payload}")
+    return key
+
+
+def withdraw(worker_id: Optional[str] = None) -> None:
+    """워커 종료 시 레지스트리에서 제거"""
+    _heartbeat_stop.set()
+    try:
+        get_redis().delete(worker_key(worker_id))
+    except Exception as e:
+        logger.warning(f"[Registry] 등록 해제 실패 (무시): {e}")
+
+
+def list_ready_workers(role: Optional[str] = None) -> List[dict]:
+    """
+    준비된 워커 목록
+
+    Args:
+        role: "stt" 또는 "llm" (None이면 전체)
+    """
+    rd = get_redis()
+    keys = list(rd.scan_iter(match=f"{REGISTRY_PREFIX}:*", count=100))
+    if not keys:
+        return []
+
+    workers = []
+    for key, raw in zip(keys, rd.mget(keys)):
+        if raw is None:
+            continue
+        info = json.loads(raw)
+        info["worker_id"] = key.decode().split(f"{REGISTRY_PREFIX}:", 1)[-1]
+        if role is None or role in info.get("roles", []):
+            workers.append(info)
+    return workers
+
+
+def has_ready_worker(role: str) -> bool:
+    """해당 역할을 처리할 준비된 워커가 하나라도 있는지 확인"""
+    return len(list_ready_workers(role)) > 0
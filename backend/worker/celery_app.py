@@ -26,17 +26,42 @@ celery_app.conf.update(
     task_acks_late=True,  # 태스크 완료 후 ACK
     worker_prefetch_multiplier=1,  # AI 작업은 한 번에 하나씩
     
+    # 음성 대화 파이프라인 라우팅
+    # - stt: GPU 바운드 (Faster-Whisper), 낮은 동시성
+    # - llm: I/O 바운드 (Gemini API 대기), 높은 동시성 (threads/gevent 풀 권장)
+    # - llm_local: Gemini 장애 시 로컬 CPU 모델 답변 (worker.local_llm, 전용 prefork 풀)
+    # - background: 갤러리 사전 분석, 대화 요약 (낮은 동시성, 음성 턴 쿼터를 남겨두고 실행)
+    task_routes={
+        "worker.tasks.process_audio_and_reply": {"queue": "stt"},
+        "worker.tasks.transcribe_stream_partial": {"queue": "stt"},
+        "worker.tasks.process_stream_and_reply": {"queue": "stt"},
+        "worker.tasks.transcribe_chunk": {"queue": "stt"},
+        "worker.tasks.stitch_chunks_and_reply": {"queue": "llm"},
+        "worker.tasks.reply_cached_turn": {"queue": "llm"},
+        "worker.tasks.generate_voice_reply": {"queue": "llm"},
+        "worker.tasks.generate_reply_from_text": {"queue": "llm"},
+        "worker.tasks.generate_local_reply": {"queue": "llm_local"},
+        "worker.tasks.preanalyze_user_photos": {"queue": "background"},
+        "worker.tasks.summarize_session": {"queue": "background"},
+    },
+    
     # 결과 저장 설정
     result_expires=3600,  # 1시간 후 결과 삭제
     
     # 타임아웃 설정 (AI 모델 로딩 시간 고려)
     task_time_limit=600,  # 10분
     task_soft_time_limit=540,  # 9분
+    # prefork 자식은 worker_process_init에서 모델을 로딩하므로 기본 4초로는 로딩 중에 종료/재생성됨
+    worker_proc_alive_timeout=settings.WORKER_PROC_ALIVE_TIMEOUT,
     
     # Queue 설정 (EC2 Producer와 RunPod Worker 간 일치 필요)
     task_queues=(
         Queue('celery', Exchange('celery'), routing_key='celery'),
         Queue('ai_tasks', Exchange('ai_tasks', type='direct'), routing_key='ai_tasks'),
+        Queue('stt', Exchange('stt', type='direct'), routing_key='stt'),
+        Queue('llm', Exchange('llm', type='direct'), routing_key='llm'),
+        Queue('llm_local', Exchange('llm_local', type='direct'), routing_key='llm_local'),
+        Queue('background', Exchange('background', type='direct'), routing_key='background'),
     ),
     task_default_queue='celery',
     task_default_exchange='celery',
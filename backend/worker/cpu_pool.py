@@ -0,0 +1,113 @@
+"""
+CPU 전용 STT 풀 (GPU 없는 오버플로우 노드)
+- 코어 수로 prefork 프로세스 수와 프로세스당 CTranslate2 스레드(cpu_threads)를 결정
+- 각 자식 프로세스를 자신만의 코어 묶음에 고정 (os.sched_setaffinity)
+  → 프로세스끼리 코어를 빼앗지 않아 처리량이 코어 수에 비례해 예측 가능
+- 워커 실행 예:
+  celery -A worker.celery_app worker -Q stt --pool=prefork \\
+      --concurrency=$(python -m worker.cpu_pool --concurrency)
+- 실측 실시간 배율(RTF)은 stt.<device>.rtf 타이머와 태스크 결과의 stt.rtf로 확인
+"""
+import os
+import sys
+import json
+import logging
+from typing import List, Optional
+
+from common.config import settings
+
+logger = logging.getLogger(__name__)
+
+MIN_THREADS_PER_PROCESS = 2
+MAX_THREADS_PER_PROCESS = 4  # int8 Whisper는 4스레드 이상에서 효율이 크게 떨어짐
+
+
+def available_cores() -> List[int]:
+    """이 프로세스가 사용할 수 있는 코어 목록 (컨테이너 cpuset 반영)"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_cpu_pool(cores: Optional[List[int]] = None) -> dict:
+    """
+    CPU STT 풀 구성 계산
+
+    - STT_CPU_THREADS / STT_CPU_PROCESSES가 0이면 코어 수로 자동 결정
+    - 프로세스 i는 cores[i*threads : (i+1)*threads]에 고정
+
+    Returns:
+        dict: {"cores": 전체 코어 수, "processes": N, "cpu_threads": T,
+               "num_workers": 1, "core_sets": [[0, 1, 2, 3], [4, 5, 6, 7], ...]}
+    """
+    cores = cores or available_cores()
+    n = len(cores)
+
+    threads = settings.STT_CPU_THREADS
+    processes = settings.STT_CPU_PROCESSES
+    if not threads:
+        if processes:
+            threads = max(1, n // processes)
+        else:
+            threads = max(MIN_THREADS_PER_PROCESS, min(MAX_THREADS_PER_PROCESS, n // 4))
+    threads = min(threads, n)
+    if not processes:
+        processes = max(1, n // threads)
+
+    core_sets = [
+        [cores[(i * threads + j) % n] for j in range(threads)]
+        for i in range(processes)
+    ]
+    return {
+        "cores": n,
+        "processes": processes,
+        "cpu_threads": threads,
+        "num_workers": 1,  # prefork 프로세스당 태스크 1개
+        "core_sets": core_sets,
+    }
+
+
+def pool_index() -> Optional[int]:
+    """prefork 자식 프로세스 번호 (메인 프로세스/threads 풀이면 None)"""
+    try:
+        from billiard.process import current_process
+        return current_process().index
+    except Exception:
+        return None
+
+
+def pin_current_process(plan: dict) -> Optional[dict]:
+    """
+    현재 prefork 자식 프로세스를 할당된 코어 묶음에 고정
+
+    Returns:
+        dict: {"index": i, "cores": [...], "cpu_threads": T} (고정하지 않았으면 None)
+    """
+    index = pool_index()
+    if index is None or not hasattr(os, "sched_setaffinity"):
+        return None
+
+    core_set = plan["core_sets"][index % plan["processes"]]
+    try:
+        os.sched_setaffinity(0, core_set)
+    except OSError as e:
+        logger.warning(f"[CPU Pool] 코어 고정 실패 (무시): {e}")
+        return None
+
+    logger.info(f"[CPU Pool] 프로세스 #{index} → 코어 {core_set}")
+    return {"index": index, "cores": core_set, "cpu_threads": plan["cpu_threads"]}
+
+
+def whisper_cpu_options(plan: dict) -> dict:
+    """CPU WhisperModel 생성 인자 (프로세스당 스레드 수 고정으로 과다 구독 방지)"""
+    return {"cpu_threads": plan["cpu_threads"], "num_workers": plan["num_workers"]}
+
+
+if __name__ == "__main__":
+    # python -m worker.cpu_pool               → 구성 전체 출력
+    # python -m worker.cpu_pool --concurrency → celery --concurrency 값만 출력
+    plan = plan_cpu_pool()
+    if "--concurrency" in sys.argv[1:]:
+        print(plan["processes"])
+    else:
+        print(json.dumps(plan, indent=2))
@@ -0,0 +1,120 @@
+"""
+음성 턴 Fast Path (Whisper/Gemini 생략)
+- 무음/거의 빈 음성: 에너지 + VAD 사전 검사로 Whisper 없이 바로 되묻기 답변
+- "네", "응" 같은 한 단어 맞장구: 로컬 템플릿으로 Gemini 호출 없이 즉시 답변
+- 적중률은 metrics 카운터로 기록 (fastpath.silence / fastpath.ack / fastpath.miss)
+  → /api/debug/metrics에서 GPU/LLM 절감량 확인
+"""
+import re
+import random
+import logging
+from typing import Optional
+
+import numpy as np
+
+from common import metrics
+from common.config import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+SHORT_UTTERANCE_MS = 1200  # 이보다 짧은 발화는 beam_size=1로 인식 (한 단어 수준)
+
+# 무음일 때 되묻기 (마이크만 누르고 말씀이 없으셨던 경우)
+SILENCE_REPLIES = [
+    {"text": "할머니, 제가 잘 못 들었어요. 다시 말씀해 주시겠어요? 멍!", "sentiment": "curious"},
+    {"text": "복실이가 귀를 쫑긋 세우고 있어요! 천천히 다시 말씀해 주세요. 멍!", "sentiment": "curious"},
+    {"text": "목소리가 잘 안 들렸어요. 마이크 버튼을 누르고 말씀해 주시겠어요? 왈왈!", "sentiment": "comforting"},
+]
+
+# 한 단어 맞장구 → 대화를 이어가는 답변
+ACK_REPLIES = {
+    "yes": [
+        {"text": "그러셨군요! 그때 이야기를 조금 더 들려주시겠어요? 멍!", "sentiment": "curious"},
+        {"text": "네네, 복실이가 잘 듣고 있어요. 그 다음엔 어떻게 되었어요? 왈왈!", "sentiment": "excited"},
+        {"text": "우와, 정말요? 그때 누구랑 함께 계셨는지 궁금해요. 멍!", "sentiment": "curious"},
+    ],
+    "no": [
+        {"text": "아, 그렇군요. 그럼 그때 기억나는 다른 이야기가 있으세요? 멍!", "sentiment": "comforting"},
+        {"text": "괜찮아요! 생각나시는 것부터 편하게 말씀해 주세요. 왈왈!", "sentiment": "comforting"},
+    ],
+    "unsure": [
+        {"text": "오래된 일이라 헷갈리실 수 있어요. 사진을 보면서 천천히 떠올려 봐요. 멍!", "sentiment": "comforting"},
+        {"text": "괜찮아요, 생각나는 것만 말씀해 주셔도 좋아요. 멍!", "sentiment": "comforting"},
+    ],
+}
+
+# 정규화된 인식 결과 → ACK_REPLIES 키
+ACK_WORDS = {
+    "네": "yes", "예": "yes", "응": "yes", "어": "yes", "그래": "yes", "그럼": "yes",
+    "맞아": "yes", "맞아요": "yes", "그렇지": "yes", "그랬지": "yes", "그래요": "yes",
+    "아니": "no", "아니요": "no", "아뇨": "no", "아니야": "no",
+    "글쎄": "unsure", "글쎄요": "unsure", "몰라": "unsure", "몰라요": "unsure", "모르겠어": "unsure",
+}
+
+_PUNCTUATION = re.compile(r"[\s\.\,\!\?~…]+")
+
+
+def _normalize(text: str) -> str:
+    """공백/문장부호 제거 + 반복 맞장구 축약 ("네 네 네" → "네")"""
+    tokens = [t for t in _PUNCTUATION.split(text) if t]
+    if tokens and all(t == tokens[0] for t in tokens):
+        return tokens[0]
+    return "".join(tokens)
+
+
+def measure_speech(audio: np.ndarray) -> dict:
+    """
+    무음 판정용 사전 검사 (Whisper 호출 전, CPU 수 ms)
+
+    1. RMS 에너지가 임계값 미만이면 VAD 없이 무음 처리
+    2. 그 외에는 Silero VAD로 실제 발화 길이 측정
+
+    Returns:
+        dict: {"rms_dbfs": float, "speech_ms": int}
+    """
+    if audio.size == 0:
+        return {"rms_dbfs": float("-inf"), "speech_ms": 0}
+
+    rms = float(np.sqrt(np.mean(np.square(audio, dtype=np.float64))))
+    rms_dbfs = 20 * np.log10(rms) if rms > 0 else float("-inf")
+    if rms_dbfs < settings.FASTPATH_SILENCE_DBFS:
+        return {"rms_dbfs": rms_dbfs, "speech_ms": 0}
+
+    from faster_whisper.vad import get_speech_timestamps
+
+    speech_samples = sum(c["end"] - c["start"] for c in get_speech_timestamps(audio))
+    return {"rms_dbfs": rms_dbfs, "speech_ms": int(speech_samples * 1000 / SAMPLE_RATE)}
+
+
+def is_silence(speech: dict) -> bool:
+    """발화 길이가 최소 기준 미만이면 무음"""
+    return speech["speech_ms"] < settings.FASTPATH_MIN_SPEECH_MS
+
+
+def is_short_utterance(speech: dict) -> bool:
+    """한 단어 수준의 짧은 발화인지 (빠른 greedy 인식 대상)"""
+    return speech["speech_ms"] < SHORT_UTTERANCE_MS
+
+
+def silence_reply() -> dict:
+    """무음 되묻기 답변 (카운터 기록 포함)"""
+    metrics.incr("fastpath.silence")
+    return dict(random.choice(SILENCE_REPLIES))
+
+
+def match_acknowledgement(user_text: str, turn_count: int = 0) -> Optional[dict]:
+    """
+    한 단어 맞장구면 템플릿 답변 반환, 아니면 None (Gemini 경로)
+
+    요약은 summarize_session 태스크가 따로 갱신하므로 턴 수와 관계없이 판단
+    """
+    category = ACK_WORDS.get(_normalize(user_text))
+
+    if category is None:
+        metrics.incr("fastpath.miss")
+        return None
+
+    metrics.incr("fastpath.ack")
+    logger.info(f"[FastPath] 맞장구 템플릿 답변: '{user_text}' ({category})")
+    return dict(random.choice(ACK_REPLIES[category]))
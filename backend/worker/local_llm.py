@@ -0,0 +1,186 @@
+"""
+로컬 CPU LLM (Gemini 장애/쿼터 초과 시 답변 Fallback)
+- llama-cpp-python(선택 의존성, pip install llama-cpp-python)으로 양자화된 GGUF 모델을 CPU에서 실행
+  기본 모델: Qwen2.5 1.5B Instruct Q4_K_M (한국어 가능, 약 1GB)
+  경로: LOCAL_LLM_MODEL_PATH 또는 {MODELS_ROOT}/llm/{LOCAL_LLM_MODEL_FILE}
+- llm_local 큐 전용 워커 풀에서만 로딩 (prefork, 프로세스당 모델 1개)
+  예: celery -A worker.celery_app worker -Q llm_local --pool=prefork --concurrency=2
+- 답변 경로(generate_reply_with_memory)는 Gemini 호출이 실패하면(서킷 열림, 쿼터 초과, 타임아웃)
+  generate_local_reply 태스크를 보내고 LOCAL_LLM_TIMEOUT_SECONDS까지만 기다림
+  → 준비된 llm_local 워커가 없으면(common.worker_registry) 요청 없이 바로 기존 고정 답변
+  → 시간 초과/실패면 기존 고정 답변
+- 배포: Dockerfile.worker를 INSTALL_LOCAL_LLM=true로 빌드 (llama-cpp-python + 기본 GGUF 포함)
+- LOCAL_LLM_FORCE=true: Gemini를 건너뛰고 항상 로컬 모델 사용 (네트워크 없는 부하 테스트)
+- 메트릭: llm.local.requests / ok / timeout / failed / unavailable / wait_ms (답변 경로), llm.local.generate_ms (로컬 워커)
+"""
+import os
+import time
+import logging
+import threading
+from typing import Optional
+
+from common import metrics
+from common.config import settings
+
+logger = logging.getLogger(__name__)
+
+LOCAL_QUEUE = "llm_local"
+TASK_NAME = "worker.tasks.generate_local_reply"
+SYSTEM_PROMPT = "당신은 한국어로만 답하는 대화 도우미입니다. 요청한 JSON 형식만 출력하세요."
+
+READY_CHECK_SECONDS = 5  # 준비된 워커 조회 결과 재사용 (장애 중 요청마다 레지스트리 SCAN 방지)
+
+_llm = None
+_lock = threading.Lock()  # llama.cpp 컨텍스트는 스레드 안전하지 않음
+_ready_checked = (0.0, False)  # (조회 시각, 준비된 llm_local 워커 여부)
+
+
+def enabled() -> bool:
+    return settings.LOCAL_LLM_ENABLED
+
+
+def forced() -> bool:
+    """Gemini 없이 항상 로컬 모델로 답변하는지 (부하 테스트용)"""
+    return settings.LOCAL_LLM_ENABLED and settings.LOCAL_LLM_FORCE
+
+
+def model_path() -> str:
+    if settings.LOCAL_LLM_MODEL_PATH:
+        return settings.LOCAL_LLM_MODEL_PATH
+    return os.path.join(settings.models_root, "llm", settings.LOCAL_LLM_MODEL_FILE)
+
+
+def is_loaded() -> bool:
+    return _llm is not None
+
+
+# ============================================================
+# 로컬 워커 (llm_local 큐)
+# ============================================================
+def load() -> Optional[dict]:
+    """
+    GGUF 모델 로딩 (워커 워밍업에서 한 번만 호출)
+
+    Returns:
+        dict: 모델 정보 (MODEL_INFO 등록용), 비활성/미설치/파일 없음이면 None
+    """
+    global _llm
+    if _llm is not None or not enabled():
+        return None
+
+    path = model_path()
+    if not os.path.exists(path):
+        logger.error(f"❌ 로컬 LLM 모델 파일 없음: {path}")
+        return None
+
+    try:
+        from llama_cpp import Llama
+    except ImportError:
+        logger.error("❌ llama-cpp-python 미설치: pip install llama-cpp-python")
+        return None
+
+    threads = settings.LOCAL_LLM_THREADS or os.cpu_count() or 1
+    started = time.perf_counter()
+    _llm = Llama(model_path=path, n_ctx=settings.LOCAL_LLM_CONTEXT, n_threads=threads, verbose=False)
+    return {
+        "model": os.path.basename(path),
+        "device": "cpu",
+        "threads": threads,
+        "load_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def generate(prompt: str, max_tokens: Optional[int] = None) -> str:
+    """
+    로컬 모델로 JSON 답변 생성
+
+    Returns:
+        str: 응답 원문 (JSON 문자열)
+
+    Raises:
+        RuntimeError: 모델이 로딩되지 않은 경우
+    """
+    if _llm is None:
+        raise RuntimeError("로컬 LLM 모델이 준비되지 않았습니다 (워커 워밍업 실패)")
+
+    started = time.perf_counter()
+    with _lock:
+        response = _llm.create_chat_completion(
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=max_tokens or settings.LOCAL_LLM_MAX_TOKENS,
+            temperature=0.7,
+            response_format={"type": "json_object"},
+        )
+    metrics.observe("llm.local.generate_ms", (time.perf_counter() - started) * 1000)
+    return response["choices"][0]["message"]["content"]
+
+
+# ============================================================
+# 답변 경로 (llm 워커에서 호출)
+# ============================================================
+def has_ready_worker() -> bool:
+    """준비된(모델 로딩 완료) llm_local 워커가 있는지 (READY_CHECK_SECONDS 동안 재사용)"""
+    global _ready_checked
+    checked_at, ready = _ready_checked
+    if time.monotonic() - checked_at < READY_CHECK_SECONDS:
+        return ready
+    from common.worker_registry import has_ready_worker as registry_has_ready_worker
+    try:
+        ready = registry_has_ready_worker(LOCAL_QUEUE)
+    except Exception as e:
+        logger.warning(f"[LocalLLM] 워커 레지스트리 조회 실패: {e}")
+        ready = False
+    _ready_checked = (time.monotonic(), ready)
+    return ready
+
+
+def request_reply(prompt: str) -> Optional[str]:
+    """
+    llm_local 큐로 답변 요청 후 LOCAL_LLM_TIMEOUT_SECONDS까지만 대기
+
+    - 대기 시간 안에 워커가 가져가지 않은 요청은 만료 (뒤늦게 처리되지 않음)
+    - 준비된 llm_local 워커가 없으면 요청하지 않음 (Celery 왕복 없이 바로 고정 답변)
+
+    Returns:
+        str: 응답 원문, 비활성/워커 없음/시간 초과/실패 시 None
+    """
+    if not enabled():
+        return None
+    if not has_ready_worker():
+        metrics.incr("llm.local.unavailable")
+        logger.warning("[LocalLLM] 준비된 llm_local 워커 없음 → 고정 답변")
+        return None
+
+    from celery.exceptions import TimeoutError as CeleryTimeoutError
+    from worker.celery_app import celery_app
+
+    timeout = settings.LOCAL_LLM_TIMEOUT_SECONDS
+    metrics.incr("llm.local.requests")
+    started = time.perf_counter()
+    result = None
+    try:
+        result = celery_app.send_task(TASK_NAME, args=[prompt], queue=LOCAL_QUEUE, expires=timeout)
+        # 태스크 안에서의 동기 대기: 다른 큐(llm_local)의 전용 풀이 처리하므로 교착 없음
+        output = result.get(timeout=timeout, propagate=False, disable_sync_subtasks=False)
+    except CeleryTimeoutError:
+        metrics.incr("llm.local.timeout")
+        logger.warning(f"[LocalLLM] {timeout}초 안에 답변 없음")
+        if result is not None:
+            result.revoke()
+        return None
+    except Exception as e:
+        metrics.incr("llm.local.failed")
+        logger.error(f"[LocalLLM] 요청 실패: {e}")
+        return None
+    finally:
+        metrics.observe("llm.local.wait_ms", (time.perf_counter() - started) * 1000)
+
+    if not result.successful() or not isinstance(output, dict) or not output.get("text"):
+        metrics.incr("llm.local.failed")
+        logger.error(f"[LocalLLM] 답변 생성 실패: {output}")
+        return None
+    metrics.incr("llm.local.ok")
+    return output["text"]
@@ -0,0 +1,90 @@
+"""
+Gemini 스트리밍 응답 점진 파서
+- 프롬프트는 {"text": "...", "sentiment": "...", ...} JSON을 요구하므로
+  청크가 올 때마다 "text" 값만 이스케이프를 풀어가며 읽고, 완성된 문장을 바로 반환
+- 전체 JSON(sentiment)은 스트림이 끝난 뒤 기존 파싱 로직으로 처리
+"""
+import re
+from typing import List
+
+_TEXT_KEY = re.compile(r'"text"\s*:\s*"')
+_SENTENCE_END = re.compile(r'[.?!~…]+(?=\s)')
+_ESCAPES = {"n": "\n", "t": " ", "r": "", "b": "", "f": "", '"': '"', "\\": "\\", "/": "/"}
+
+
+class ReplyTextStreamer:
+    """
+    JSON "text" 필드의 문장 단위 점진 추출기
+
+    사용 예:
+        streamer = ReplyTextStreamer()
+        for chunk in response:
+            for sentence in streamer.feed(chunk.text):
+                publish(sentence)
+        rest = streamer.finish()
+    """
+
+    def __init__(self):
+        self.raw = ""  # 지금까지 받은 원본 (최종 JSON 파싱용)
+        self.text = ""  # 디코딩된 "text" 값
+        self._value_pos = None  # raw에서 "text" 값이 시작되는 위치 (다음 읽을 위치)
+        self._closed = False
+        self._emitted = 0
+
+    def feed(self, chunk: str) -> List[str]:
+        """청크 추가 → 새로 완성된 문장 목록"""
+        self.raw += chunk
+        if self._value_pos is None:
+            match = _TEXT_KEY.search(self.raw)
+            if not match:
+                return []
+            self._value_pos = match.end()
+        self._decode()
+        return self._pop_sentences()
+
+    def finish(self) -> List[str]:
+        """스트림 종료: 문장부호 없이 끝난 나머지 문장 반환"""
+        self._closed = True
+        return self._pop_sentences()
+
+    def _decode(self):
+        raw, i = self.raw, self._value_pos
+        while i < len(raw) and not self._closed:
+            char = raw[i]
+            if char == "\\":
+                if i + 1 >= len(raw):
+                    break  # 이스케이프가 청크 경계에서 잘림 → 다음 청크 대기
+                nxt = raw[i + 1]
+                if nxt == "u":
+                    if i + 6 > len(raw):
+                        break
+                    self.text += chr(int(raw[i + 2:i + 6], 16))
+                    i += 6
+                    continue
+                self.text += _ESCAPES.get(nxt, nxt)
+                i += 2
+                continue
+            if char == '"':
+                self._closed = True
+                i += 1
+                break
+            self.text += char
+            i += 1
+        self._value_pos = i
+
+    def _pop_sentences(self) -> List[str]:
+        pending = self.text[self._emitted:]
+        sentences, start = [], 0
+
+        for match in _SENTENCE_END.finditer(pending):
+            sentence = pending[start:match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+
+        if self._closed and pending[start:].strip():
+            sentences.append(pending[start:].strip())
+            start = len(pending)
+
+        self._emitted += start
+        return sentences
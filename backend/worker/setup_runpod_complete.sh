@@ -161,5 +161,8 @@ echo "   1. 환경변수 설정:"
 echo "      export LD_LIBRARY_PATH=/usr/local/cuda/targets/x86_64-linux/lib:\$LD_LIBRARY_PATH"
 echo "      export \$(cat .env | xargs)"
 echo ""
-echo "   2. Worker 시작:"
-echo "      celery -A worker.celery_app worker --loglevel=info -Q ai_tasks --concurrency=1"
+echo "   2. Worker 시작 (GPU: STT + 기타 AI 작업):"
+echo "      celery -A worker.celery_app worker --loglevel=info -Q stt,ai_tasks --concurrency=1 -n gpu@%h"
+echo ""
+echo "   3. LLM Worker 시작 (Gemini 대기용, 높은 동시성):"
+echo "      celery -A worker.celery_app worker --loglevel=info -Q llm --pool=threads --concurrency=16 -n llm@%h"
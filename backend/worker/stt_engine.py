@@ -0,0 +1,318 @@
+"""
+Faster-Whisper 배치 추론 엔진
+- 배치 윈도우(기본 100ms) 동안 들어온 짧은 음성들을 모아 한 번의 GPU 패스로 처리
+- 30초를 넘는 발화는 VAD 무음 경계에서 청크로 나눠 같은 배치로 병렬 처리 후 순서대로 결합
+- 디코딩/VAD/특징 추출(CPU)은 각 태스크 스레드에서, 인코딩/디코딩(GPU)은 배처 스레드에서 수행
+- stt 워커는 threads 풀로 실행해야 태스크들이 하나의 모델과 배처를 공유함
+  예: celery -A worker.celery_app worker -Q stt --pool=threads --concurrency=16
+- 큐 대기 시간과 연산 시간을 분리 기록하여 윈도우 튜닝에 사용
+  (stt.batch.queue_wait_ms / stt.batch.compute_ms / stt.batch.size)
+- 요청별 연산(encode + generate) 시간은 timing 인자로 돌려줌 → 티어 정책 RTF는 대기 제외 연산 시간 기준
+- 배치 결과도 단일 경로와 같은 품질 검사(avg_logprob / no_speech_prob / 압축률) 적용
+  → 무음 판정은 빈 결과, 검사 실패 청크는 온도 fallback이 있는 단일 경로(model.transcribe)로 재인식
+  (stt.batch.no_speech / stt.batch.fallback)
+"""
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import List, Optional, Union
+
+import numpy as np
+
+from common import metrics
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+MAX_DECODE_LENGTH = 448  # Whisper 최대 토큰 길이
+CHUNK_MAX_SECONDS = 28  # 긴 발화 분할 단위 (30초 윈도우 안에 여유 있게)
+
+# 배치 결과 품질 검사 기준 (faster_whisper TranscriptionOptions 기본값과 동일)
+LOG_PROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+COMPRESSION_RATIO_THRESHOLD = 2.4
+
+# 기본 인식 옵션 (모든 STT 경로가 공유)
+TRANSCRIBE_OPTIONS = {
+    "language": "ko",  # 한국어
+    "beam_size": 5,
+    "vad_filter": True,  # Voice Activity Detection
+}
+
+
+class _BatchItem:
+    """배치 대기열 항목"""
+
+    def __init__(self, features: np.ndarray):
+        self.features = features
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+        self.batch_seq = None  # 처리된 배치 번호 (같은 배치의 청크는 연산 시간을 한 번만 합산)
+        self.compute_ms = 0.0  # 처리된 배치의 encode + generate 시간
+
+
+def load_audio(audio: Union[str, np.ndarray]) -> np.ndarray:
+    """파일 경로 또는 float32 배열을 16kHz mono float32 배열로 통일"""
+    if isinstance(audio, np.ndarray):
+        return audio.astype(np.float32, copy=False)
+
+    from faster_whisper.audio import decode_audio
+    return decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+
+def chunk_speech(audio: np.ndarray, max_seconds: float = CHUNK_MAX_SECONDS) -> List[np.ndarray]:
+    """
+    Silero VAD 발화 구간을 무음 경계에서 max_seconds 이하 청크로 묶음 (무음 제거)
+
+    - 발화 구간은 자르지 않고 순서대로 이어 붙이다가 max_seconds를 넘기 전에 새 청크 시작
+    - 한 발화 구간이 max_seconds보다 길면 그 구간만 고정 길이로 분할
+
+    Returns:
+        List[np.ndarray]: 시간 순서의 발화 청크 (발화 없으면 빈 리스트)
+    """
+    from faster_whisper.vad import get_speech_timestamps
+
+    max_samples = int(max_seconds * SAMPLE_RATE)
+    chunks, current, current_len = [], [], 0
+
+    for ts in get_speech_timestamps(audio):
+        segment = audio[ts["start"]:ts["end"]]
+        pieces = [segment[i:i + max_samples] for i in range(0, len(segment), max_samples)]
+        for piece in pieces:
+            if current and current_len + len(piece) > max_samples:
+                chunks.append(np.concatenate(current))
+                current, current_len = [], 0
+            current.append(piece)
+            current_len += len(piece)
+
+    if current:
+        chunks.append(np.concatenate(current))
+    return chunks
+
+
+def join_segments(segments) -> str:
+    """Whisper 세그먼트 결합"""
+    return " ".join([segment.text for segment in segments]).strip()
+
+
+class BatchedTranscriber:
+    """
+    동시 요청을 모아 배치로 추론하는 Whisper 래퍼
+
+    Args:
+        model: faster_whisper.WhisperModel
+        window_ms: 첫 요청 이후 추가 요청을 기다리는 시간
+        max_batch_size: 배치 최대 크기 (도달 시 즉시 실행)
+        beam_size: 빔 크기
+        language: 인식 언어
+    """
+
+    def __init__(
+        self,
+        model,
+        window_ms: int = 100,
+        max_batch_size: int = 8,
+        beam_size: int = TRANSCRIBE_OPTIONS["beam_size"],
+        language: str = TRANSCRIBE_OPTIONS["language"]
+    ):
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.beam_size = beam_size
+        self.language = language
+
+        self._queue: "queue.Queue[_BatchItem]" = queue.Queue()
+        self._batch_seq = 0
+        self._tokenizer = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"stt-batcher-b{beam_size}", daemon=True
+        )
+        self._thread.start()
+
+    # --------------------------------------------------------
+    # 태스크 스레드 측 API
+    # --------------------------------------------------------
+    def transcribe(
+        self,
+        audio: Union[str, np.ndarray],
+        timeout: Optional[float] = None,
+        timing: Optional[dict] = None
+    ) -> str:
+        """
+        음성을 텍스트로 변환 (배치 결과가 나올 때까지 대기)
+
+        Args:
+            audio: 오디오 파일 경로 또는 16kHz float32 배열
+            timeout: 결과 대기 최대 시간 (초)
+            timing: 전달 시 {"decode_ms": 이 요청이 포함된 배치들의 연산 시간 합} 기록
+                    (배치 윈도우/대기열 대기 제외)
+
+        Returns:
+            str: 인식된 텍스트
+        """
+        # 무음 경계에서 30초 이하 청크로 분할 → 모든 청크를 한꺼번에 배치 대기열에 넣어
+        # 긴 발화도 청크 수와 무관하게 한두 번의 GPU 패스로 처리 (짧은 턴을 오래 막지 않음)
+        chunks = chunk_speech(load_audio(audio))
+        if not chunks:
+            return ""
+
+        items = [_BatchItem(self._extract_features(chunk)) for chunk in chunks]
+        for item in items:
+            self._queue.put(item)
+        texts = [item.future.result(timeout=timeout) for item in items]
+
+        # 품질 검사 실패 청크(None)는 온도 fallback이 있는 단일 경로로 재인식 (태스크 스레드에서)
+        started = time.perf_counter()
+        for i, text in enumerate(texts):
+            if text is None:
+                texts[i] = self._transcribe_single(chunks[i])
+        fallback_ms = (time.perf_counter() - started) * 1000
+
+        if timing is not None:
+            batches = {item.batch_seq: item.compute_ms for item in items}
+            timing["decode_ms"] = sum(batches.values()) + fallback_ms
+        return " ".join(t for t in texts if t).strip()
+
+    def _transcribe_single(self, waveform: np.ndarray) -> str:
+        """단일 클립 경로 (temperature fallback + 임계값 검사 포함)"""
+        options = dict(TRANSCRIBE_OPTIONS, beam_size=self.beam_size, language=self.language)
+        segments, _ = self.model.transcribe(waveform, **options)
+        return join_segments(segments)
+
+    def _extract_features(self, waveform: np.ndarray) -> np.ndarray:
+        """log-mel 특징 추출 (30초 윈도우로 패딩/절단)"""
+        extractor = self.model.feature_extractor
+        features = extractor(waveform)
+        return features[:, :extractor.nb_max_frames]
+
+    # --------------------------------------------------------
+    # 배처 스레드
+    # --------------------------------------------------------
+    def _collect_batch(self) -> List[_BatchItem]:
+        """첫 요청 도착 후 window 동안 (또는 max_batch_size까지) 추가 요청 수집"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            self._batch_seq += 1
+            started = time.perf_counter()
+
+            for item in batch:
+                metrics.observe("stt.batch.queue_wait_ms", (started - item.enqueued_at) * 1000)
+
+            try:
+                texts = self._generate(batch)
+                # 결과 전달 전에 연산 시간을 기록해야 태스크 스레드가 timing으로 읽을 수 있음
+                compute_ms = (time.perf_counter() - started) * 1000
+                for item, text in zip(batch, texts):
+                    item.batch_seq, item.compute_ms = self._batch_seq, compute_ms
+                    item.future.set_result(text)
+            except Exception as e:
+                logger.error(f"[STT Batch] 배치 추론 실패 (size={len(batch)}): {e}")
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+            finally:
+                compute_ms = (time.perf_counter() - started) * 1000
+                metrics.observe("stt.batch.compute_ms", compute_ms)
+                metrics.observe("stt.batch.size", len(batch))
+                logger.info(f"[STT Batch] size={len(batch)}, compute={compute_ms:.0f}ms")
+
+    def _get_tokenizer(self):
+        if self._tokenizer is None:
+            from faster_whisper.tokenizer import Tokenizer
+            self._tokenizer = Tokenizer(
+                self.model.hf_tokenizer,
+                self.model.model.is_multilingual,
+                task="transcribe",
+                language=self.language
+            )
+        return self._tokenizer
+
+    def _generate(self, batch: List[_BatchItem]) -> List[Optional[str]]:
+        """
+        CTranslate2 Whisper에 배치 단위로 encode + generate 호출
+
+        Returns:
+            List[Optional[str]]: 시퀀스별 인식 결과 (무음 판정은 "", 품질 검사 실패는 None → 단일 경로 재인식)
+        """
+        from faster_whisper.transcribe import (
+            get_compression_ratio,
+            get_ctranslate2_storage,
+            get_suppressed_tokens,
+        )
+
+        tokenizer = self._get_tokenizer()
+        prompt = self.model.get_prompt(tokenizer, previous_tokens=[], without_timestamps=True)
+
+        features = np.stack([item.features for item in batch])
+        ct2_model = self.model.model
+        to_cpu = ct2_model.device == "cuda" and len(ct2_model.device_index) > 1
+        encoder_output = ct2_model.encode(get_ctranslate2_storage(features), to_cpu=to_cpu)
+
+        results = ct2_model.generate(
+            encoder_output,
+            [prompt] * len(batch),
+            beam_size=self.beam_size,
+            max_length=MAX_DECODE_LENGTH,
+            suppress_blank=True,
+            suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+            return_scores=True,
+            return_no_speech_prob=True,
+        )
+
+        texts = []
+        for result in results:
+            # faster_whisper generate_with_fallback과 같은 계산 (length_penalty=1)
+            seq_len = len(result.sequences_ids[0])
+            avg_logprob = result.scores[0] * seq_len / (seq_len + 1)
+            tokens = [t for t in result.sequences_ids[0] if t < tokenizer.eot]
+            text = tokenizer.decode(tokens).strip()
+
+            if result.no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob < LOG_PROB_THRESHOLD:
+                metrics.incr("stt.batch.no_speech")
+                texts.append("")
+            elif avg_logprob < LOG_PROB_THRESHOLD or get_compression_ratio(text) > COMPRESSION_RATIO_THRESHOLD:
+                metrics.incr("stt.batch.fallback")
+                texts.append(None)
+            else:
+                texts.append(text)
+        return texts
+
+
+# ============================================================
+# 프로세스 전역 배처 (모델당 1개)
+# ============================================================
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(model, window_ms: int, max_batch_size: int, beam_size: int = 5) -> BatchedTranscriber:
+    """모델/빔 크기별 배처 싱글톤 반환"""
+    key = (id(model), beam_size)
+    with _batchers_lock:
+        if key not in _batchers:
+            _batchers[key] = BatchedTranscriber(
+                model,
+                window_ms=window_ms,
+                max_batch_size=max_batch_size,
+                beam_size=beam_size
+            )
+            logger.info(
+                f"[STT Batch] 배처 시작 (window={window_ms}ms, max_batch={max_batch_size}, beam={beam_size})"
+            )
+        return _batchers[key]
@@ -0,0 +1,241 @@
+"""
+STT 모델 티어 선택 정책 (지연 시간 기반)
+- 워커는 여러 Whisper 모델을 상주시킴 (예: STT_MODEL_TIERS="medium,small")
+- 클립마다 큐 길이 + 클립 길이 + 티어별 실시간 배율(RTF)로 예상 지연을 계산해
+  목표 p95(STT_TARGET_P95_MS) 안에 드는 가장 품질 높은 티어를 선택
+- 트래픽 폭주 시 큐 대기가 폭증하는 대신 작은 모델/작은 빔으로 점진적으로 낮춤
+- 티어별 실제 지연/RTF를 metrics에 기록 → 다음 선택의 추정치로 재사용
+  (stt.tier.<tier>.latency_ms / stt.rtf.<tier> / stt.tier.<tier>)
+- RTF는 모델 연산 시간만으로 계산 (배치 윈도우/대기열 대기는 stt.tier.<tier>.wait_ms로 따로 기록)
+"""
+import time
+import logging
+import threading
+from typing import List, NamedTuple, Optional
+
+from common import metrics
+from common.config import settings
+
+logger = logging.getLogger(__name__)
+
+STT_QUEUE = "stt"
+MIN_RTF_SAMPLES = 20  # 이보다 적게 관측된 티어는 사전 추정치 사용
+RTF_CACHE_SECONDS = 10
+QUEUE_DEPTH_CACHE_SECONDS = 1
+
+# beam_size=5 기준 GPU 사전 추정 RTF (처리 시간 / 음성 길이)
+PRIOR_RTF = {
+    "large-v3": 0.25,
+    "medium": 0.15,
+    "small": 0.06,
+    "base": 0.03,
+    "tiny": 0.02,
+}
+CPU_RTF_MULTIPLIER = 8
+
+
+class Tier(NamedTuple):
+    """STT 티어 (모델 + 빔 크기)"""
+    model: str
+    beam_size: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.model}-b{self.beam_size}"
+
+
+def build_ladder(models: List[str], default_beam: int) -> List[Tier]:
+    """
+    품질 높은 순서의 티어 목록
+
+    예: ["medium", "small"], beam 5 → medium-b5, medium-b2, small-b2, small-b1
+    """
+    ladder = []
+    for i, model in enumerate(models):
+        beams = [default_beam, 2] if i == 0 else [2]
+        if i == len(models) - 1:
+            beams.append(1)
+        for beam in beams:
+            tier = Tier(model, beam)
+            if tier not in ladder:
+                ladder.append(tier)
+    return ladder
+
+
+class TierPolicy:
+    """
+    큐 길이/클립 길이/목표 p95로 티어 선택
+
+    Args:
+        models: 상주 모델 이름 (품질 높은 순)
+        default_beam: 최상위 티어 빔 크기
+        target_p95_ms: 목표 STT 지연 (큐 대기 포함)
+        parallelism: 동시에 처리되는 클립 수 (배치 크기)
+        device: "cuda" 또는 "cpu" (사전 추정치 보정)
+    """
+
+    def __init__(
+        self,
+        models: List[str],
+        default_beam: int,
+        target_p95_ms: float,
+        parallelism: int = 1,
+        device: str = "cuda"
+    ):
+        self.ladder = build_ladder(models, default_beam)
+        self.target_p95_ms = target_p95_ms
+        self.parallelism = max(parallelism, 1)
+        self.device = device
+
+        self._rtf_cache = {}
+        self._depth_cache = (0.0, 0)
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------
+    # 추정치
+    # --------------------------------------------------------
+    def _prior_rtf(self, tier: Tier) -> float:
+        rtf = PRIOR_RTF.get(tier.model, PRIOR_RTF["medium"]) * (0.5 + 0.1 * tier.beam_size)
+        return rtf * (CPU_RTF_MULTIPLIER if self.device == "cpu" else 1)
+
+    def rtf(self, tier: Tier) -> float:
+        """관측 RTF(p95) 또는 사전 추정치 (10초 캐시)"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._rtf_cache.get(tier)
+            if cached and now - cached[0] < RTF_CACHE_SECONDS:
+                return cached[1]
+
+        summary = metrics.get_timer_summary(f"stt.rtf.{tier.name}")
+        if summary.get("count", 0) >= MIN_RTF_SAMPLES:
+            value = summary["p95"]
+        else:
+            value = self._prior_rtf(tier)
+
+        with self._lock:
+            self._rtf_cache[tier] = (now, value)
+        return value
+
+    def queue_depth(self) -> int:
+        """stt 큐에 대기 중인 태스크 수 (Redis 브로커 LLEN, 1초 캐시)"""
+        now = time.monotonic()
+        with self._lock:
+            checked_at, depth = self._depth_cache
+            if now - checked_at < QUEUE_DEPTH_CACHE_SECONDS:
+                return depth
+        try:
+            from common.redis_client import get_redis
+            depth = int(get_redis().llen(STT_QUEUE))
+        except Exception as e:
+            logger.warning(f"[STT Policy] 큐 길이 조회 실패 (0으로 간주): {e}")
+            depth = 0
+        with self._lock:
+            self._depth_cache = (now, depth)
+        return depth
+
+    def estimate_ms(self, tier: Tier, clip_seconds: float, queue_depth: int) -> float:
+        """
+        예상 지연 = 내 클립 처리 시간 × (1 + 앞선 대기 클립 수 / 동시 처리 수)
+
+        앞선 클립도 같은 티어로 처리된다고 가정 (폭주 시 티어를 낮추면 대기열도 빨리 빠짐)
+        """
+        service_ms = clip_seconds * self.rtf(tier) * 1000
+        return service_ms * (1 + queue_depth / self.parallelism)
+
+    # --------------------------------------------------------
+    # 선택 / 기록
+    # --------------------------------------------------------
+    def choose(self, clip_seconds: float, max_beam: Optional[int] = None) -> dict:
+        """
+        목표 p95 안에 드는 가장 품질 높은 티어 선택 (없으면 가장 빠른 티어)
+
+        Args:
+            clip_seconds: 음성 길이
+            max_beam: 빔 상한 (짧은 발화 등)
+
+        Returns:
+            dict: {"tier", "model", "beam_size", "clip_seconds", "queue_depth", "estimated_ms"}
+        """
+        depth = self.queue_depth()
+        candidates = self.ladder
+        if max_beam is not None:
+            capped = [Tier(t.model, min(t.beam_size, max_beam)) for t in candidates]
+            candidates = list(dict.fromkeys(capped))
+
+        chosen, estimated = candidates[-1], None
+        for tier in candidates:
+            estimated = self.estimate_ms(tier, clip_seconds, depth)
+            if estimated <= self.target_p95_ms:
+                chosen = tier
+                break
+        else:
+            estimated = self.estimate_ms(chosen, clip_seconds, depth)
+
+        if chosen != candidates[0]:
+            metrics.incr("stt.policy.degraded")
+
+        return {
+            "tier": chosen.name,
+            "model": chosen.model,
+            "beam_size": chosen.beam_size,
+            "clip_seconds": round(clip_seconds, 2),
+            "queue_depth": depth,
+            "estimated_ms": round(estimated, 1),
+        }
+
+    def acceptable_tiers(self, tier_name: str) -> List[str]:
+        """선택된 티어와 그보다 품질 높은 티어 (캐시 재사용 허용 범위, 선호 순)"""
+        names = [t.name for t in self.ladder]
+        if tier_name in names:
+            return [tier_name] + names[:names.index(tier_name)][::-1]
+        return [tier_name] + names[::-1]
+
+    def record(self, decision: dict, latency_ms: float, decode_ms: Optional[float] = None) -> Optional[float]:
+        """
+        선택된 티어의 실제 지연/RTF 기록
+
+        Args:
+            decision: choose() 결과
+            latency_ms: 인식 요청 전체 지연 (배치 윈도우/대기 포함)
+            decode_ms: 모델 연산 시간 (encode + generate, 없으면 전체 지연으로 간주)
+
+        Returns:
+            float: 실측 RTF (연산 시간 / 음성 길이, 음성 길이가 0이면 None)
+        """
+        tier = decision["tier"]
+        if decode_ms is None:
+            decode_ms = latency_ms
+        metrics.incr(f"stt.tier.{tier}")
+        metrics.observe(f"stt.tier.{tier}.latency_ms", latency_ms)
+        metrics.observe(f"stt.tier.{tier}.wait_ms", max(latency_ms - decode_ms, 0.0))
+        if decision["clip_seconds"] <= 0:
+            return None
+
+        rtf = round(decode_ms / 1000 / decision["clip_seconds"], 3)
+        metrics.observe(f"stt.rtf.{tier}", rtf)
+        metrics.observe(f"stt.{self.device}.rtf", rtf)  # 디바이스별 용량 산정 (CPU 노드 증설 기준)
+        return rtf
+
+
+_policy = None
+
+
+def get_policy(device: str = "cuda") -> TierPolicy:
+    """프로세스 전역 정책 (설정 기반, Lazy 초기화)"""
+    global _policy
+
+    if _policy is None:
+        from worker.stt_engine import TRANSCRIBE_OPTIONS
+
+        _policy = TierPolicy(
+            models=settings.stt_model_tiers,
+            default_beam=TRANSCRIBE_OPTIONS["beam_size"],
+            target_p95_ms=settings.STT_TARGET_P95_MS,
+            parallelism=settings.STT_BATCH_MAX_SIZE if settings.STT_BATCH_ENABLED else 1,
+            device=device
+        )
+        logger.info(
+            f"[STT Policy] 티어: {[t.name for t in _policy.ladder]}, "
+            f"target_p95={settings.STT_TARGET_P95_MS}ms"
+        )
+    return _policy
@@ -13,13 +13,23 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import os
+import time
 import logging
 import traceback
+import multiprocessing
 import soundfile as sf
 from celery import Task
+from celery.exceptions import Retry
+from celery.signals import (
+    celeryd_init, worker_init, worker_process_init, worker_process_shutdown, worker_shutdown,
+    worker_ready, task_prerun, task_success, task_failure
+)
 from worker.celery_app import celery_app
 from common.config import settings
-from common.image_utils import preprocess_image_for_ai, preprocess_image_file, ImageProcessingError
+from common.image_utils import preprocess_image_for_ai, preprocess_image_file, prepare_vision_input, ImageProcessingError
+from common.gemini_quota import BACKGROUND, INTERACTIVE, QuotaExceeded
+from common import prompt_cache
+from worker.stt_engine import TRANSCRIBE_OPTIONS, get_batcher, join_segments
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -119,29 +129,75 @@ def detect_device():
 # ============================================================
 # AI 모델 전역 변수 (워커 시작 시 한 번만 로드)
 # ============================================================
-whisper_model = None
+whisper_model = None  # 기본 티어 (STT_MODEL_TIERS 첫 번째)
+whisper_models = {}  # 상주 티어 전체 {"medium": WhisperModel, "small": WhisperModel}
 # tts_model = None  # TTS 제거 (시간 절약)
-gemini_model = None
+gemini_model = None  # 준비 여부 확인용 (호출은 common.llm_gateway를 통해서만)
+
+# 실제 로딩된 모델 정보 (CUDA 체크 실패 시 CPU로 전환된 경우까지 반영)
+# {"whisper": {"model": "medium", "device": "cuda", "compute_type": "float16", "load_seconds": 12.3},
+#  "gemini": {"model": "gemini-2.0-flash", "load_seconds": 0.4}}
+MODEL_INFO = {}
 
 
 # ============================================================
 # 모델 로딩 함수
 # ============================================================
-def load_models():
+def _load_whisper_tiers(model_cls, device: str, compute_type: str, download_root: str):
+    """
+    STT_MODEL_TIERS의 모든 Whisper 모델 로딩 (worker.stt_policy가 클립마다 선택)
+    
+    - 첫 번째 모델(기본): compute_type 그대로
+    - 나머지(저지연 티어): GPU는 int8_float16, CPU는 int8
+    - CPU: 프로세스당 스레드 수 고정 (worker.cpu_pool, prefork 프로세스 간 코어 과다 구독 방지)
     """
-    AI 모델 초기화 (워커 시작 시 한 번만 실행)
+    global whisper_model
+    
+    extra_options = {}
+    if device == "cpu":
+        from worker.cpu_pool import plan_cpu_pool, whisper_cpu_options
+        extra_options = whisper_cpu_options(plan_cpu_pool())
+    
+    for i, name in enumerate(settings.stt_model_tiers):
+        tier_compute_type = compute_type if i == 0 else ("int8_float16" if device == "cuda" else "int8")
+        whisper_models[name] = model_cls(
+            model_size_or_path=name,
+            device=device,
+            compute_type=tier_compute_type,
+            download_root=download_root,
+            **extra_options
+        )
+        logger.info(f"[Whisper] 티어 로딩 완료: {name} ({device}/{tier_compute_type})")
+    
+    whisper_model = whisper_models[settings.stt_model_tiers[0]]
+
+
+def load_models(stt: bool = True, llm: bool = True, local_llm: bool = False):
+    """
+    AI 모델 초기화 (워커 프로세스 시작 훅에서 한 번만 실행)
+    
+    태스크에서는 호출하지 않습니다. (warmup_models / preload_models 전용)
+    
+    Args:
+        stt: Faster-Whisper 로딩 여부 (stt 큐 워커)
+        llm: Gemini 초기화 여부 (llm 큐 워커)
+        local_llm: 로컬 CPU LLM 로딩 여부 (llm_local 큐 워커, worker.local_llm)
     
     에러 처리:
     - 모델 로딩 실패 시에도 워커가 죽지 않도록 try-except 사용
     """
-    global whisper_model, tts_model, gemini_model
-    
-    # 디바이스 감지 (첫 실행)
-    device, compute_type = detect_device()
-    logger.info(f"🔧 디바이스 설정: device={device}, compute_type={compute_type}")
+    global whisper_model, gemini_model
     
     # STT: Faster-Whisper 로딩
-    if whisper_model is None:
+    if stt and whisper_model is None:
+        # 디바이스 감지 (첫 실행)
+        device, compute_type = detect_device()
+        if settings.STT_CPU_MODE:
+            # GPU 없는 오버플로우 노드 (worker.cpu_pool)
+            device, compute_type = "cpu", "int8"
+        logger.info(f"🔧 디바이스 설정: device={device}, compute_type={compute_type}")
+        started = time.perf_counter()
+        
         try:
             from faster_whisper import WhisperModel
             
@@ -151,6 +207,9 @@ def load_models():
             
             logger.info(f"[Whisper] 모델 로딩 시작... (경로: {whisper_root})")
             
+            # CPU 기본값 (CUDA 체크 통과 시 교체)
+            loaded_device, loaded_compute_type = "cpu", "int8"
+            
             # CUDA 시도 (cuDNN + libcublas 라이브러리 사전 체크)
             if device == "cuda":
                 try:
@@ -185,106 +244,388 @@ def load_models():
                         logger.warning("⚠️ CTranslate2가 libcublas.so.12를 요구할 수 있습니다")
                         logger.warning("⚠️ 실패 시 심볼릭 링크 생성: ln -sf libcublas.so.11 libcublas.so.12")
                     
-                    # 라이브러리 체크 통과 → Whisper 모델 로딩
-                    whisper_model = WhisperModel(
-                        model_size_or_path="medium",
-                        device=device,
-                        compute_type=compute_type,
-                        download_root=whisper_root
-                    )
-                    logger.info(f"✅ Whisper 모델 로딩 완료 (model=medium, device={device}, path={whisper_root})")
+                    # 라이브러리 체크 통과 → Whisper 모델 로딩 (모든 티어)
+                    _load_whisper_tiers(WhisperModel, device, compute_type, whisper_root)
+                    loaded_device, loaded_compute_type = device, compute_type
                 
                 except Exception as cuda_error:
                     logger.warning(f"⚠️ CUDA 라이브러리 체크 실패: {cuda_error}")
                     logger.warning("⚠️ CPU 모드로 강제 전환")
-                    whisper_model = WhisperModel(
-                        model_size_or_path="medium",
-                        device="cpu",
-                        compute_type="int8",
-                        download_root=whisper_root
-                    )
-                    logger.info(f"✅ Whisper 모델 로딩 완료 (model=medium, device=cpu, path={whisper_root})")
             
-            else:
-                # CPU 모드 직접 로딩
-                whisper_model = WhisperModel(
-                    model_size_or_path="medium",
-                    device="cpu",
-                    compute_type="int8",
-                    download_root=whisper_root
-                )
-                logger.info(f"✅ Whisper 모델 로딩 완료 (model=medium, device=cpu, path={whisper_root})")
+            if whisper_model is None:
+                # CPU 모드 로딩 (직접 또는 CUDA 실패 후 fallback)
+                _load_whisper_tiers(WhisperModel, "cpu", "int8", whisper_root)
+            
+            MODEL_INFO["whisper"] = {
+                "model": settings.stt_model_tiers[0],
+                "tiers": list(whisper_models.keys()),
+                "device": loaded_device,
+                "compute_type": loaded_compute_type,
+                "load_seconds": round(time.perf_counter() - started, 2)
+            }
+            logger.info(f"✅ Whisper 모델 로딩 완료 ({MODEL_INFO['whisper']}, path={whisper_root})")
         except Exception as e:
             logger.error(f"❌ Whisper 로딩 실패: {str(e)}")
             logger.error(traceback.format_exc())
             whisper_model = None
+            whisper_models.clear()
     
     # TTS: 제거 (시간 절약, API로 대체 예정)
     # logger.info("⚠️ TTS 비활성화 - 텍스트 응답만 제공")
     
-    # LLM: Gemini 1.5 Flash 초기화
-    if gemini_model is None:
+    # LLM: Gemini (common.llm_gateway - 프로세스당 async 클라이언트 1개)
+    if llm and gemini_model is None:
+        started = time.perf_counter()
         try:
-            import google.generativeai as genai
+            from common.llm_gateway import get_gateway
             
-            api_key = os.getenv("GEMINI_API_KEY")
-            if not api_key:
-                raise ValueError("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
-            
-            genai.configure(api_key=api_key)
-            # gemini-2.0-flash (최신 버전, quota 제한 주의)
-            # gemini-2.0-flash-exp (실험 버전, quota 제한 심함)
-            gemini_model = genai.GenerativeModel("gemini-2.0-flash")
-            logger.info("✅ Gemini 2.0 Flash 초기화 완료")
+            gateway = get_gateway().start()
+            gemini_model = gateway.model
+            # 정적 접두부 캐시는 여기서 미리 생성 (요청 경로에서는 생성하지 않음)
+            prompt_cache.warm(gateway.model_names.values())
+            MODEL_INFO["gemini"] = {
+                "model": gateway.model_name,
+                "lite_model": gateway.model_names["lite"],
+                "load_seconds": round(time.perf_counter() - started, 2)
+            }
+            logger.info(f"✅ Gemini 게이트웨이 초기화 완료 (full={gateway.model_name}, lite={gateway.model_names['lite']})")
         except Exception as e:
             logger.error(f"❌ Gemini 초기화 실패: {str(e)}")
             logger.error(traceback.format_exc())
             gemini_model = None
+    
+    # 로컬 LLM: llama.cpp GGUF (Gemini 장애 시 답변 Fallback)
+    if local_llm:
+        try:
+            from worker import local_llm as local_llm_engine
+            
+            info = local_llm_engine.load()
+            if info is not None:
+                MODEL_INFO["local_llm"] = info
+                logger.info(f"✅ 로컬 LLM 로딩 완료 ({info})")
+        except Exception as e:
+            logger.error(f"❌ 로컬 LLM 로딩 실패: {str(e)}")
+            logger.error(traceback.format_exc())
 
 
 # ============================================================
-# S3에서 음성 파일 다운로드
+# 워커 시작 시 모델 워밍업 (Eager Loading)
 # ============================================================
-def download_audio_from_s3(s3_url: str, user_id: str) -> str:
+STT_QUEUES = {"stt"}
+LLM_QUEUES = {"llm", "ai_tasks", "background", "celery"}
+LOCAL_LLM_QUEUES = {"llm_local"}
+
+# CPU STT 모드에서 이 프로세스에 고정된 코어 (worker.cpu_pool)
+CPU_POOL_INFO = None
+
+# Whisper 워밍업 결과 (모든 워밍업 프로세스가 실패했을 때만 이 워커의 stt 큐 소비를 멈춤)
+WORKER_HOSTNAME = None  # celeryd_init에서 설정 (prefork 자식은 fork로 상속)
+WARMUP_PROCESSES = 1  # 워밍업하는 프로세스 수 (prefork는 worker_init에서 concurrency로 설정)
+_stt_warmup = multiprocessing.Array("i", 2)  # [준비 완료, 실패] - prefork 자식 → 메인 프로세스 공유
+
+
+def _consumed_queues() -> set:
+    """이 워커가 구독하는 큐 목록 (-Q 미지정 시 전체)"""
+    queues = celery_app.amqp.queues
+    selected = queues.consume_from if queues.consume_from else queues
+    return set(selected.keys())
+
+
+def warmup_models():
     """
-    S3 URL에서 음성 파일 다운로드
+    구독 큐에 필요한 모델만 로딩하고 준비 상태를 Redis에 등록
     
-    Args:
-        s3_url: S3 URL (https://bucket.s3.region.amazonaws.com/key)
-        user_id: 사용자 ID (임시 파일명용)
+    - stt 큐 구독 → Whisper, llm/ai_tasks 큐 구독 → Gemini, llm_local 큐 구독 → 로컬 CPU LLM
+    - 등록 정보: 역할, 디바이스, compute_type, 모델별 로딩 시간
+    - 로딩에 실패한 역할은 등록하지 않으므로 API가 준비되지 않은 워커로 판단
+    """
+    from datetime import datetime
+    from common import metrics
+    from common.worker_registry import publish_ready
     
-    Returns:
-        str: 로컬 파일 경로
+    queues = _consumed_queues()
+    want_stt = bool(queues & STT_QUEUES)
+    want_llm = bool(queues & LLM_QUEUES)
+    want_local_llm = bool(queues & LOCAL_LLM_QUEUES)
+    logger.info(
+        f"🔥 모델 워밍업 시작 (queues={sorted(queues)}, stt={want_stt}, llm={want_llm}, local_llm={want_local_llm})"
+    )
+    
+    load_models(stt=want_stt, llm=want_llm, local_llm=want_local_llm)
+    
+    roles = []
+    if want_stt and whisper_model is not None:
+        roles.append("stt")
+    if want_llm and gemini_model is not None:
+        roles.append("llm")
+    if want_local_llm and "local_llm" in MODEL_INFO:
+        roles.append("llm_local")
+    
+    for name, info in MODEL_INFO.items():
+        metrics.observe(f"worker.warmup.{name}_load_ms", info["load_seconds"] * 1000)
+    
+    whisper_info = MODEL_INFO.get("whisper", {})
+    try:
+        publish_ready({
+            "roles": roles,
+            "queues": sorted(queues),
+            "pid": os.getpid(),
+            "device": whisper_info.get("device"),
+            "compute_type": whisper_info.get("compute_type"),
+            "models": MODEL_INFO,
+            "cpu_pool": CPU_POOL_INFO,
+            "ready_at": datetime.utcnow().isoformat()
+        })
+    except Exception as e:
+        logger.warning(f"⚠️ 준비 상태 등록 실패 (무시): {e}")
+    
+    if want_stt:
+        _record_stt_warmup("stt" in roles, queues & STT_QUEUES)
+
+
+def _stt_all_failed() -> bool:
+    """준비된 프로세스 없이 워밍업 프로세스가 모두 Whisper 로딩에 실패했는지"""
+    ready, failed = _stt_warmup[:]
+    return ready == 0 and failed >= WARMUP_PROCESSES
+
+
+def _record_stt_warmup(ok: bool, queues: set):
+    """
+    이 프로세스의 STT 워밍업 결과 기록, 모든 프로세스가 실패했으면 stt 큐 구독 취소
+
+    - 일부 자식만 실패: 다른 자식이 계속 stt 큐를 처리 (노드 전체를 내리지 않음)
+    - 컨슈머 시작 전에 모두 실패: worker_ready에서 취소
+    - 컨슈머 시작 후에 모두 실패(로딩이 늦게 실패한 prefork 자식): cancel_consumer로 취소
+    """
+    with _stt_warmup.get_lock():
+        _stt_warmup[0 if ok else 1] += 1
+        all_failed = _stt_all_failed()
+    if ok:
+        return
+    if not all_failed:
+        logger.error("❌ Whisper 워밍업 실패 (이 프로세스만, 다른 프로세스가 stt 큐 계속 처리)")
+        return
+    logger.error("❌ Whisper 워밍업 실패: 모든 프로세스가 실패해 이 워커는 stt 큐 소비를 멈춥니다.")
+    if not WORKER_HOSTNAME:
+        return
+    for queue in queues:
+        try:
+            celery_app.control.cancel_consumer(queue, destination=[WORKER_HOSTNAME])
+        except Exception as e:
+            logger.warning(f"⚠️ {queue} 큐 구독 취소 요청 실패 (worker_ready에서 재확인): {e}")
+
+
+@celeryd_init.connect
+def _remember_hostname(sender=None, **kwargs):
+    """워커 노드 이름 저장 (cancel_consumer 대상)"""
+    global WORKER_HOSTNAME
+    WORKER_HOSTNAME = sender
+
+
+@worker_ready.connect
+def _cancel_unready_stt(sender=None, **kwargs):
+    """컨슈머 시작 시점에 이미 모든 프로세스의 STT 워밍업이 실패했으면 stt 큐 구독 취소 (메인 프로세스)"""
+    if sender is None or not _stt_all_failed():
+        return
+    for queue in STT_QUEUES & _consumed_queues():
+        sender.cancel_task_queue(queue)
+        logger.error(f"❌ STT 워밍업 실패: {queue} 큐 구독 취소 (다른 준비된 워커가 처리)")
+
+
+def require_models(stt: bool = False, llm: bool = False):
     """
-    import tempfile
-    import urllib.request
-    import ssl
+    태스크 실행 전 모델 준비 여부 확인 (로딩은 하지 않음)
     
-    # SSL 컨텍스트 (인증서 검증)
-    ssl_context = ssl.create_default_context()
+    Raises:
+        RuntimeError: 워밍업에 실패했거나 해당 역할의 큐를 구독하지 않는 워커인 경우
+    """
+    if stt and whisper_model is None:
+        raise RuntimeError("Whisper 모델이 준비되지 않았습니다 (워커 워밍업 실패)")
+    if llm and gemini_model is None:
+        raise RuntimeError("Gemini 모델이 준비되지 않았습니다 (워커 워밍업 실패)")
+
+
+@worker_process_init.connect
+def _warmup_pool_process(**kwargs):
+    """prefork 자식 프로세스: fork 이후 로딩 (CUDA 충돌 방지)"""
+    global CPU_POOL_INFO
     
-    # 임시 파일 경로 생성
-    temp_dir = tempfile.gettempdir()
-    local_path = os.path.join(temp_dir, f"audio_{user_id}_{os.getpid()}.m4a")
+    if settings.STT_CPU_MODE:
+        # 모델 로딩(스레드 생성) 전에 코어 고정
+        from worker.cpu_pool import plan_cpu_pool, pin_current_process
+        CPU_POOL_INFO = pin_current_process(plan_cpu_pool())
+    warmup_models()
+
+
+def prefetch_model_files():
+    """
+    prefork 부모: fork 전에 모델 파일만 내려받기 (자식은 디스크에서 로딩만 → 시작 시간 단축)
+
+    모델 객체는 부모에서 만들지 않음 (CUDA 컨텍스트/스레드 풀은 fork 후 자식에서 사용 불가,
+    CPU 모드는 자식별 코어 고정 후 로딩해야 함)
+    """
+    queues = _consumed_queues()
+    if queues & STT_QUEUES:
+        try:
+            from faster_whisper.utils import download_model
+            
+            whisper_root = os.path.join(settings.models_root, "whisper")
+            os.makedirs(whisper_root, exist_ok=True)
+            for name in settings.stt_model_tiers:
+                download_model(name, cache_dir=whisper_root)
+            logger.info(f"✅ Whisper 모델 파일 준비 완료 ({settings.stt_model_tiers})")
+        except Exception as e:
+            logger.warning(f"⚠️ Whisper 모델 파일 사전 다운로드 실패 (자식에서 다시 시도): {e}")
     
+    if queues & LOCAL_LLM_QUEUES and settings.LOCAL_LLM_ENABLED:
+        from worker import local_llm as local_llm_engine
+        if not os.path.exists(local_llm_engine.model_path()):
+            logger.error(f"❌ 로컬 LLM 모델 파일 없음: {local_llm_engine.model_path()}")
+
+
+@worker_init.connect
+def _warmup_worker(sender=None, **kwargs):
+    """
+    threads/solo 풀: 메인 프로세스에서 로딩
+    prefork 풀: 모델 파일만 준비하고 로딩은 자식(worker_process_init)에서
+    
+    worker_init은 컨슈머 시작 전에 호출되므로 워밍업이 끝나기 전에는 큐를 소비하지 않습니다.
+    prefork 자식의 로딩 시간은 worker_proc_alive_timeout(WORKER_PROC_ALIVE_TIMEOUT) 안이어야 합니다.
+    """
+    global WARMUP_PROCESSES
+    
+    pool_cls = getattr(sender, "pool_cls", None)
+    pool_name = pool_cls if isinstance(pool_cls, str) else getattr(pool_cls, "__module__", "")
+    if pool_cls is None:
+        return
+    if "prefork" in str(pool_name):
+        WARMUP_PROCESSES = getattr(sender, "concurrency", None) or 1
+        prefetch_model_files()
+        return
+    warmup_models()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _withdraw_worker(**kwargs):
+    """종료 시 준비 상태 레지스트리에서 제거"""
+    from common.worker_registry import withdraw
+    withdraw()
+
+
+# ============================================================
+# 태스크 이벤트 발행 (Redis Pub/Sub → API SSE)
+# ============================================================
+# Task.replace로 넘겨진 태스크는 Ignore로 끝나 success 시그널이 없으므로
+# 음성 턴 하나에 done은 마지막 단계(generate_voice_reply)에서 한 번만 발행됨
+def _publish_task_event(task_id: str, event: str, payload: dict):
+    """이벤트 발행 (실패해도 태스크 결과에는 영향 없음, 앱은 폴링으로 대체)"""
+    if not task_id:
+        return
     try:
-        logger.info(f"S3 다운로드: {s3_url} -> {local_path}")
-        
-        # URL로 직접 다운로드 (S3 public URL 가정)
-        urllib.request.urlretrieve(s3_url, local_path)
-        
-        # 파일 존재 확인
-        if not os.path.exists(local_path):
-            raise FileNotFoundError(f"다운로드 파일 없음: {local_path}")
-        
-        file_size = os.path.getsize(local_path)
-        logger.info(f"S3 다운로드 완료: {file_size} bytes")
+        from common.task_events import publish
+        publish(task_id, event, payload)
+    except Exception as e:
+        logger.warning(f"[TaskEvents] 발행 실패 (무시): {event} {e}")
+
+
+@task_prerun.connect
+def _publish_task_started(task_id=None, **kwargs):
+    _publish_task_event(task_id, "progress", {"status": "processing"})
+
+
+@task_success.connect
+def _publish_task_done(sender=None, result=None, **kwargs):
+    # 결과 백엔드 저장 이후에 호출되므로 구독자가 폴링으로 재조회해도 같은 결과
+    task_id = getattr(getattr(sender, "request", None), "id", None)
+    _publish_task_event(task_id, "done", result if isinstance(result, dict) else {"result": result})
+
+
+@task_failure.connect
+def _publish_task_failed(task_id=None, exception=None, **kwargs):
+    _publish_task_event(task_id, "error", {"message": str(exception)})
+
+
+# 음성 턴 중간 상태 (AsyncResult.state로 폴링에 노출)
+STATE_TRANSCRIBED = "TRANSCRIBED"  # STT 완료, meta: {"user_text", "session_id"}
+STATE_REPLYING = "REPLYING"  # Gemini 답변 생성 중, meta: {"user_text", "session_id"}
+
+
+def _report_progress(task: Task, state: str, **meta):
+    """
+    중간 상태 기록 (Celery custom state + Pub/Sub progress 이벤트)
+    
+    Task.replace로 이어지는 단계들이 같은 task_id를 쓰므로
+    앱은 최종 답변 전에 인식된 문장을 먼저 표시할 수 있음
+    (TRANSCRIBED는 답변 스트림에도 transcript로 기록 → 늦게 연결한 SSE/WebSocket도 STT 직후 표시)
+    """
+    task_id = task.request.id
+    if not task_id:
+        return
+    try:
+        task.update_state(state=state, meta=meta)
+    except Exception as e:
+        logger.warning(f"[Progress] 상태 기록 실패 (무시): {state} {e}")
+    _publish_task_event(task_id, "progress", dict(meta, status=state.lower()))
+    if state == STATE_TRANSCRIBED:
+        _publish_reply_event(task_id, "transcript", {"user_text": meta.get("user_text", "")})
+
+
+# ============================================================
+# 음성 데이터 조회 (메모리, 임시 파일 없음)
+# ============================================================
+def fetch_audio_bytes(audio_ref: str) -> bytes:
+    """
+    API가 전달한 음성 참조에서 원본 바이트 조회
+    
+    Args:
+        audio_ref: 다음 중 하나
+            - Redis blob 키 (audio:blob:<uuid>, 짧은 음성)
+            - S3 URL (https://bucket.s3.region.amazonaws.com/key)
+            - 로컬 파일 경로 (개발 환경)
+    
+    Returns:
+        bytes: 원본 오디오 (m4a 등)
+    """
+    from common.audio_store import is_blob_ref, get_blob
+    
+    try:
+        if is_blob_ref(audio_ref):
+            data = get_blob(audio_ref)
+            source = "Redis"
+        elif audio_ref.startswith("https://") and ".amazonaws.com/" in audio_ref:
+            # public URL 대신 자격 증명으로 get_object (버킷이 비공개여도 동작)
+            from common.s3_client import get_storage_client
+            data = get_storage_client().download_bytes(audio_ref)
+            source = "S3"
+        elif audio_ref.startswith(("http://", "https://")):
+            import urllib.request
+            with urllib.request.urlopen(audio_ref, timeout=30) as response:
+                data = response.read()
+            source = "URL"
+        else:
+            with open(audio_ref, "rb") as f:
+                data = f.read()
+            source = "local"
         
-        return local_path
+        logger.info(f"[Audio] {source} 조회 완료: {len(data)} bytes")
+        return data
         
     except Exception as e:
-        logger.error(f"S3 다운로드 실패: {str(e)}")
-        raise RuntimeError(f"S3 음성 파일 다운로드 실패: {str(e)}")
+        logger.error(f"음성 데이터 조회 실패: {str(e)}")
+        raise RuntimeError(f"음성 데이터 조회 실패: {str(e)}")
+
+
+def release_audio(audio_ref: str) -> None:
+    """처리 완료된 Redis blob 삭제 (S3 원본은 보관)"""
+    from common.audio_store import is_blob_ref, delete_blob
+    
+    if not is_blob_ref(audio_ref):
+        return
+    try:
+        delete_blob(audio_ref)
+    except Exception as e:
+        logger.warning(f"음성 blob 삭제 실패 (무시): {e}")
 
 
 # ============================================================
@@ -340,7 +681,7 @@ def preload_models(self: Task):
 
 
 # ============================================================
-# Celery 태스크: 음성 대화 처리 (STT + Brain + Summary-Buffer Memory)
+# Celery 태스크: 음성 대화 처리 (STT 단계 → LLM 단계 체인)
 # ============================================================
 @celery_app.task(bind=True, name="worker.tasks.process_audio_and_reply")
 def process_audio_and_reply(
@@ -353,72 +694,567 @@ def process_audio_and_reply(
     turn_count: int = 0
 ):
     """
-    음성 파일을 받아 AI 대화 처리 (Summary-Buffer Memory 적용)
+    음성 대화 1단계: STT (stt 큐, GPU 바운드)
     
     Flow:
-    1. S3에서 음성 파일 다운로드
-    2. STT: Faster-Whisper로 음성 → 텍스트
-    3. Brain: 요약 + 최근 대화 컨텍스트로 Gemini 응답 생성
-    4. 매 3턴마다 대화 요약 업데이트
+    1. Redis/S3에서 음성 조회 후 메모리에서 디코딩 (임시 파일 없음)
+    2. STT: Faster-Whisper로 음성 배열 → 텍스트
+    3. generate_voice_reply 태스크로 자신을 교체 (llm 큐)
+       - Task.replace는 원래 task_id를 그대로 물려주므로
+         클라이언트는 기존처럼 /api/task/{task_id}로 최종 결과를 조회
+       - Gemini 응답(및 429 재시도) 대기 중에도 GPU 워커는 다음 STT를 처리
     
     Args:
-        audio_url: S3 URL (EC2에서 업로드됨)
+        audio_url: 음성 참조 (Redis blob 키 또는 S3 URL, EC2에서 업로드됨)
         user_id: 사용자 ID
         session_id: 대화 세션 ID
         summary: 현재까지의 대화 요약 (Summary-Buffer Memory)
         recent_logs: 최근 대화 로그 [{"role": "user"|"assistant", "content": "..."}]
         turn_count: 현재 대화 턴 수
     
+    Returns:
+        dict: 최종 결과는 generate_voice_reply가 반환 (AudioChatResult)
+              STT 단계 실패 시에만 이 태스크가 에러 응답 반환
+    """
+    if recent_logs is None:
+        recent_logs = []
+    long_clip = None
+    
+    try:
+        # 모델은 워커 시작 시 로딩됨 (태스크에서는 준비 여부만 확인)
+        require_models(stt=True)
+        
+        # 음성 조회 → 16kHz mono float32로 메모리 디코딩 (디스크 I/O 없음)
+        from common.audio_utils import decode_audio_bytes
+        from common.stt_cache import digest
+        audio_bytes = fetch_audio_bytes(audio_url)
+        audio = decode_audio_bytes(audio_bytes)
+        logger.info(f"[Audio] 디코딩 완료: {len(audio) / 16000:.1f}초")
+        
+        # 긴 발화(CPU 워커): 무음 경계 청크를 여러 프로세스에 분산 인식
+        long_clip = _long_clip_signature(
+            audio, session_id, summary, recent_logs, turn_count, upload_digest=digest(audio_bytes)
+        )
+        if long_clip is None:
+            # STT (음성 → 텍스트, 무음/맞장구는 Fast Path, 같은 음성은 캐시)
+            logger.info("[STT] 음성 인식 시작")
+            user_text, fast_reply, stt_info = transcribe_turn(audio, turn_count, upload_digest=digest(audio_bytes))
+            logger.info(f"[STT] 인식 결과: {user_text}")
+        
+        release_audio(audio_url)
+    
+    except Exception as e:
+        logger.error(f"❌ 음성 처리 실패: {str(e)}")
+        logger.error(traceback.format_exc())
+        return format_response(
+            required_keys=["status", "message"],
+            data={
+                "status": "error",
+                "message": str(e)
+            },
+            schema_name="AudioChatResult"
+        )
+    
+    # LLM 단계로 교체 (try 밖에서 호출: replace는 내부적으로 Ignore 예외를 발생시킴)
+    logger.info(f"[Pipeline] STT 완료 → llm 큐로 답변 생성 위임 (task_id={self.request.id})")
+    # 긴 발화: 청크 인식 chord로 교체 (chord 본문이 같은 task_id를 물려받음)
+    if long_clip is not None:
+        return self.replace(long_clip)
+    
+    # 무음/맞장구는 llm 단계 없이 바로 결과 반환
+    if fast_reply:
+        return _fast_reply_result(user_text, fast_reply, session_id, stt_info)
+    
+    _report_progress(self, STATE_TRANSCRIBED, user_text=user_text, session_id=session_id)
+    return self.replace(
+        _reply_signature(user_text, session_id, summary, recent_logs, turn_count, stt_info)
+    )
+
+
+def transcribe_with_policy(audio, max_beam: int = None, upload_digest: str = None):
+    """
+    클립 길이/stt 큐 길이에 맞춰 티어(모델+빔)를 골라 인식 (worker.stt_policy)
+    
+    같은 음성은 STT 캐시(common.stt_cache)에서 GPU 없이 바로 반환
+    
+    Args:
+        audio: 16kHz mono float32 배열
+        max_beam: 빔 상한 (짧은 발화)
+        upload_digest: 업로드 원본 해시 (API가 업로드 시점에 캐시를 조회할 수 있도록 별칭 저장)
+    
+    Returns:
+        tuple: (user_text, stt_info) - stt_info는 선택 티어/예상·실제 지연/캐시 여부 (태스크 결과에 기록)
+    """
+    from common import metrics, stt_cache
+    from worker.stt_policy import get_policy
+    
+    policy = get_policy(MODEL_INFO.get("whisper", {}).get("device", "cuda"))
+    decision = policy.choose(len(audio) / 16000, max_beam=max_beam)
+    started = time.perf_counter()
+    
+    pcm_digest = stt_cache.digest(audio.tobytes())
+    cached = stt_cache.get(pcm_digest, policy.acceptable_tiers(decision["tier"]))
+    if cached:
+        metrics.incr("stt.cache.hit")
+        latency_ms = (time.perf_counter() - started) * 1000
+        stt_info = dict(decision, tier=cached[0], cache="hit", latency_ms=round(latency_ms, 1))
+        logger.info(f"[STT Cache] 적중 → GPU 생략 {stt_info}")
+        return cached[1], stt_info
+    metrics.incr("stt.cache.miss")
+    
+    timing = {}
+    user_text = transcribe_audio(
+        audio, beam_size=decision["beam_size"], model_name=decision["model"], timing=timing
+    )
+    latency_ms = (time.perf_counter() - started) * 1000
+    
+    rtf = policy.record(decision, latency_ms, decode_ms=timing.get("decode_ms"))
+    stt_cache.put(
+        pcm_digest, decision["tier"], user_text,
+        upload_digest=upload_digest, clip_seconds=decision["clip_seconds"], max_beam=max_beam
+    )
+    stt_info = dict(decision, cache="miss", latency_ms=round(latency_ms, 1), rtf=rtf)
+    logger.info(f"[STT Policy] {stt_info}")
+    return user_text, stt_info
+
+
+def transcribe_turn(audio, turn_count: int = 0, upload_digest: str = None):
+    """
+    음성 턴 STT + Fast Path 판정 (worker.fast_path)
+    
+    - 무음/거의 빈 음성: Whisper 생략, 되묻기 템플릿
+    - 짧은 발화: beam_size=1로 인식
+    - 한 단어 맞장구: Gemini 생략, 템플릿 답변
+    
+    Returns:
+        tuple: (user_text, fast_reply, stt_info) - fast_reply가 있으면 llm 단계 생략
+               fast_reply = {"text", "sentiment", "fast_path": "silence"|"ack"}
+    """
+    if not settings.FASTPATH_ENABLED:
+        user_text, stt_info = transcribe_with_policy(audio, upload_digest=upload_digest)
+        return user_text, None, stt_info
+    
+    from worker import fast_path
+    
+    speech = fast_path.measure_speech(audio)
+    if fast_path.is_silence(speech):
+        logger.info(f"[FastPath] 무음 감지 → Whisper 생략 ({speech})")
+        return "", dict(fast_path.silence_reply(), fast_path="silence"), None
+    
+    max_beam = 1 if fast_path.is_short_utterance(speech) else None
+    user_text, stt_info = transcribe_with_policy(audio, max_beam=max_beam, upload_digest=upload_digest)
+    return user_text, text_fast_reply(user_text, turn_count), stt_info
+
+
+def text_fast_reply(user_text: str, turn_count: int = 0):
+    """
+    인식 결과 기반 Fast Path 판정 (STT 이후 단계, 캐시 적중 턴에도 같은 판정 적용)
+    
+    Returns:
+        dict: fast_reply (빈 결과 → 되묻기, 한 단어 맞장구 → 템플릿), 해당 없으면 None
+    """
+    if not settings.FASTPATH_ENABLED:
+        return None
+    
+    from worker import fast_path
+    
+    if not user_text:
+        return dict(fast_path.silence_reply(), fast_path="silence")
+    
+    ack = fast_path.match_acknowledgement(user_text, turn_count)
+    if ack:
+        return dict(ack, fast_path="ack")
+    return None
+
+
+@celery_app.task(bind=True, name="worker.tasks.reply_cached_turn")
+def reply_cached_turn(
+    self: Task,
+    cached: dict,
+    session_id: str = None,
+    summary: str = "",
+    recent_logs: list = None,
+    turn_count: int = 0
+):
+    """
+    업로드 해시 캐시 적중 턴 (llm 큐, STT 태스크/음성 업로드 생략)
+    
+    process_audio_and_reply와 같은 판정을 거쳐 반복 전송된 음성도 같은 결과를 받도록 함
+    - 티어 정책: 저장된 클립 길이/빔 상한으로 티어를 다시 골라 허용 티어 결과만 사용 + 적중 기록
+    - Fast Path: 빈 결과/한 단어 맞장구는 Gemini 없이 템플릿 답변
+      (무음은 캐시에 저장되지 않으므로 반복 전송돼도 STT 단계의 무음 판정을 그대로 거침)
+    
+    Args:
+        cached: stt_cache.find_upload 결과 {"text", "tier", "pcm_digest", "clip_seconds", "max_beam"}
+    """
+    from common import metrics, stt_cache
+    from worker.stt_policy import get_policy
+    
+    policy = get_policy(MODEL_INFO.get("whisper", {}).get("device", "cuda"))
+    user_text, stt_info = cached["text"], {"tier": cached["tier"], "cache": "upload_hit"}
+    if cached.get("clip_seconds") is not None:
+        decision = policy.choose(cached["clip_seconds"], max_beam=cached.get("max_beam"))
+        hit = stt_cache.get(cached["pcm_digest"], policy.acceptable_tiers(decision["tier"]))
+        if hit:
+            stt_info = dict(decision, tier=hit[0], cache="upload_hit", latency_ms=0.0)
+            user_text = hit[1]
+        else:
+            # 저장된 결과가 지금 정책의 티어보다 낮음 → 재인식할 음성이 없으므로 최선 결과 사용
+            metrics.incr("stt.cache.upload_below_tier")
+    metrics.incr("stt.cache.hit")
+    logger.info(f"[STT Cache] 업로드 적중 → STT 생략 {stt_info}")
+    
+    fast_reply = text_fast_reply(user_text, turn_count)
+    if fast_reply:
+        return _fast_reply_result(user_text, fast_reply, session_id, stt_info)
+    
+    _report_progress(self, STATE_TRANSCRIBED, user_text=user_text, session_id=session_id)
+    return self.replace(
+        _reply_signature(user_text, session_id, summary, recent_logs or [], turn_count, stt_info)
+    )
+
+
+def _fast_reply_result(user_text: str, fast_reply: dict, session_id: str, stt_info: dict = None) -> dict:
+    """Fast Path 답변을 generate_voice_reply와 같은 AudioChatResult로 변환"""
+    return format_response(
+        required_keys=["status", "user_text", "ai_reply", "sentiment", "session_id"],
+        data={
+            "status": "success",
+            "user_text": user_text,
+            "ai_reply": fast_reply["text"],
+            "sentiment": fast_reply["sentiment"],
+            "session_id": session_id,
+            "fast_path": fast_reply["fast_path"],
+            "stt": stt_info
+        },
+        schema_name="AudioChatResult"
+    )
+
+
+def _reply_signature(
+    user_text: str,
+    session_id: str,
+    summary: str,
+    recent_logs: list,
+    turn_count: int,
+    stt_info: dict = None
+):
+    """STT 단계 태스크가 교체될 답변 생성 태스크 시그니처 (llm 큐)"""
+    return generate_voice_reply.s(
+        user_text=user_text,
+        session_id=session_id,
+        summary=summary,
+        recent_logs=recent_logs,
+        turn_count=turn_count,
+        stt_info=stt_info
+    ).set(queue="llm")
+
+
+# ============================================================
+# 긴 발화 분산 인식 (CPU 워커)
+# ============================================================
+def _long_clip_signature(
+    audio,
+    session_id: str,
+    summary: str,
+    recent_logs: list,
+    turn_count: int,
+    upload_digest: str = None
+):
+    """
+    긴 발화를 무음 경계 청크로 나눠 stt 큐에 분산하는 chord 시그니처
+    
+    - GPU(배치 모드)는 BatchedTranscriber가 청크를 한 배치로 처리하므로 None
+    - STT_CHUNK_THRESHOLD_SECONDS 이하이거나 캐시 적중이면 None (일반 경로)
+    - 청크별 transcribe_chunk(stt 큐) → stitch_chunks_and_reply(llm 큐)에서 순서대로 결합
+    
+    Returns:
+        celery.chord 또는 None
+    """
+    if settings.STT_BATCH_ENABLED or len(audio) <= settings.STT_CHUNK_THRESHOLD_SECONDS * 16000:
+        return None
+    
+    from celery import chord
+    from common import stt_cache
+    from common.audio_store import store_blob
+    from worker.stt_engine import chunk_speech
+    from worker.stt_policy import get_policy
+    
+    policy = get_policy(MODEL_INFO.get("whisper", {}).get("device", "cuda"))
+    pcm_digest = stt_cache.digest(audio.tobytes())
+    if stt_cache.get(pcm_digest, [t.name for t in policy.ladder]):
+        return None
+    
+    chunks = chunk_speech(audio)
+    if len(chunks) <= 1:
+        return None
+    
+    # 청크들은 동시에 처리되므로 가장 긴 청크 기준으로 티어 선택
+    decision = policy.choose(max(len(c) for c in chunks) / 16000)
+    header = [
+        transcribe_chunk.s(store_blob(chunk.tobytes()), decision["model"], decision["beam_size"]).set(queue="stt")
+        for chunk in chunks
+    ]
+    stt_info = dict(
+        decision,
+        clip_seconds=round(len(audio) / 16000, 2),
+        chunks=len(chunks),
+        cache="miss",
+        started_at=time.time()
+    )
+    body = stitch_chunks_and_reply.s(
+        session_id=session_id,
+        summary=summary,
+        recent_logs=recent_logs,
+        turn_count=turn_count,
+        stt_info=stt_info,
+        pcm_digest=pcm_digest,
+        upload_digest=upload_digest
+    ).set(queue="llm")
+    
+    logger.info(f"[STT Chunk] 긴 발화 분산: {stt_info['clip_seconds']}초 → {len(chunks)}개 청크 ({decision['tier']})")
+    return chord(header, body)
+
+
+@celery_app.task(bind=True, name="worker.tasks.transcribe_chunk")
+def transcribe_chunk(self: Task, chunk_key: str, model_name: str, beam_size: int):
+    """
+    긴 발화의 청크 1개 인식 (stt 큐)
+    
+    Args:
+        chunk_key: 청크 PCM(float32) Redis blob 키
+        model_name: 상주 티어 이름
+        beam_size: 빔 크기
+    
+    Returns:
+        str: 청크 인식 결과
+    """
+    from common.audio_store import get_blob
+    from common.audio_utils import pcm_to_array
+    
+    require_models(stt=True)
+    audio = pcm_to_array(get_blob(chunk_key))
+    text = transcribe_audio(audio, beam_size=beam_size, model_name=model_name)
+    release_audio(chunk_key)
+    return text
+
+
+@celery_app.task(bind=True, name="worker.tasks.stitch_chunks_and_reply")
+def stitch_chunks_and_reply(
+    self: Task,
+    texts: list,
+    session_id: str = None,
+    summary: str = "",
+    recent_logs: list = None,
+    turn_count: int = 0,
+    stt_info: dict = None,
+    pcm_digest: str = None,
+    upload_digest: str = None
+):
+    """
+    청크 인식 결과를 순서대로 결합 후 답변 생성으로 교체 (chord 본문, llm 큐)
+    
+    chord 결과는 헤더 순서를 유지하므로 texts[i]는 i번째 청크의 인식 결과
+    """
+    from common import metrics, stt_cache
+    
+    user_text = " ".join(t for t in texts if t).strip()
+    stt_info = dict(stt_info or {})
+    started_at = stt_info.pop("started_at", None)
+    if started_at:
+        latency_ms = (time.time() - started_at) * 1000
+        stt_info["latency_ms"] = round(latency_ms, 1)
+        metrics.observe("stt.chunked.latency_ms", latency_ms)
+    
+    if pcm_digest:
+        stt_cache.put(pcm_digest, stt_info.get("tier"), user_text, upload_digest=upload_digest)
+    logger.info(f"[STT Chunk] 결합 완료 ({len(texts)}개 청크): {user_text[:50]}...")
+    
+    _report_progress(self, STATE_TRANSCRIBED, user_text=user_text, session_id=session_id)
+    return self.replace(
+        _reply_signature(user_text, session_id, summary, recent_logs or [], turn_count, stt_info)
+    )
+
+
+# ============================================================
+# 스트리밍 음성 (WebSocket) 버퍼 로딩
+# ============================================================
+def load_stream_audio(stream_key: str, audio_format: str = "pcm16"):
+    """
+    Redis에 누적된 스트리밍 음성을 Whisper 입력 배열로 변환
+    
+    Args:
+        stream_key: common.audio_store.stream_key()
+        audio_format: "pcm16" (16kHz mono s16le) 또는 "opus" 등 컨테이너 포맷
+    
+    Returns:
+        np.ndarray: 16kHz mono float32
+    """
+    from common.audio_store import read_stream
+    from common.audio_utils import pcm16_to_array, decode_audio_bytes
+    
+    data = read_stream(stream_key)
+    if audio_format == "pcm16":
+        return pcm16_to_array(data)
+    return decode_audio_bytes(data)
+
+
+# ============================================================
+# Celery 태스크: 스트리밍 음성 중간 인식 (Partial Hypothesis)
+# ============================================================
+@celery_app.task(bind=True, name="worker.tasks.transcribe_stream_partial")
+def transcribe_stream_partial(self: Task, stream_key: str, audio_format: str = "pcm16"):
+    """
+    발화 도중 지금까지 수신된 음성을 인식 (WebSocket partial 전송용)
+    
+    - 기존 VAD 설정 그대로, 속도를 위해 beam_size=1 사용
+    - API가 버퍼 길이에 비례해 요청 간격을 늘리므로 발화 하나의 중간 인식 총량은 발화 길이에 비례
+    - 최종 인식은 process_stream_and_reply에서 beam_size=5로 다시 수행
+    
+    Returns:
+        dict: {"status": "success", "text": "중간 인식 결과"}
+    """
+    try:
+        require_models(stt=True)
+        audio = load_stream_audio(stream_key, audio_format)
+        text = transcribe_audio(audio, beam_size=1)
+        return {"status": "success", "text": text}
+    
+    except Exception as e:
+        logger.error(f"[STT Stream] 중간 인식 실패: {str(e)}")
+        return {"status": "error", "text": "", "message": str(e)}
+
+
+# ============================================================
+# Celery 태스크: 스트리밍 음성 최종 인식 → 답변 생성
+# ============================================================
+@celery_app.task(bind=True, name="worker.tasks.process_stream_and_reply")
+def process_stream_and_reply(
+    self: Task,
+    stream_key: str,
+    audio_format: str,
+    user_id: str,
+    session_id: str = None,
+    summary: str = "",
+    recent_logs: list = None,
+    turn_count: int = 0
+):
+    """
+    WebSocket 스트리밍 발화 종료 시 최종 인식 후 답변 생성으로 바로 연결
+    
+    process_audio_and_reply와 같은 흐름이지만 음성을 S3가 아닌
+    Redis 스트리밍 버퍼에서 읽으므로 업로드/다운로드 지연이 없습니다.
+    
+    Returns:
+        dict: 최종 결과는 generate_voice_reply가 반환 (AudioChatResult)
+    """
+    if recent_logs is None:
+        recent_logs = []
+    
+    long_clip = None
+    
+    try:
+        require_models(stt=True)
+        
+        audio = load_stream_audio(stream_key, audio_format)
+        logger.info(f"[STT Stream] 최종 인식 시작: {len(audio) / 16000:.1f}초 (user={user_id})")
+        long_clip = _long_clip_signature(audio, session_id, summary, recent_logs, turn_count)
+        if long_clip is None:
+            user_text, fast_reply, stt_info = transcribe_turn(audio, turn_count)
+            logger.info(f"[STT Stream] 인식 결과: {user_text}")
+        
+        from common.audio_store import delete_stream
+        delete_stream(stream_key)
+    
+    except Exception as e:
+        logger.error(f"❌ 스트리밍 음성 처리 실패: {str(e)}")
+        logger.error(traceback.format_exc())
+        return format_response(
+            required_keys=["status", "message"],
+            data={
+                "status": "error",
+                "message": str(e)
+            },
+            schema_name="AudioChatResult"
+        )
+    
+    # 긴 발화: 청크 인식 chord로 교체 (chord 본문이 같은 task_id를 물려받음)
+    if long_clip is not None:
+        return self.replace(long_clip)
+    
+    # 무음/맞장구는 llm 단계 없이 바로 결과 반환
+    if fast_reply:
+        return _fast_reply_result(user_text, fast_reply, session_id, stt_info)
+    
+    _report_progress(self, STATE_TRANSCRIBED, user_text=user_text, session_id=session_id)
+    return self.replace(
+        _reply_signature(user_text, session_id, summary, recent_logs, turn_count, stt_info)
+    )
+
+
+# ============================================================
+# Celery 태스크: 음성 대화 2단계 (Brain + Summary-Buffer Memory)
+# ============================================================
+@celery_app.task(bind=True, name="worker.tasks.generate_voice_reply")
+def generate_voice_reply(
+    self: Task,
+    user_text: str,
+    session_id: str = None,
+    summary: str = "",
+    recent_logs: list = None,
+    turn_count: int = 0,
+    stt_info: dict = None
+):
+    """
+    음성 대화 2단계: Gemini 답변 생성 (llm 큐, I/O 바운드)
+    
+    process_audio_and_reply가 Task.replace로 호출하므로
+    원래 음성 태스크와 같은 task_id로 결과가 저장됩니다.
+    
+    Args:
+        user_text: STT 인식 결과
+        session_id: 대화 세션 ID
+        summary: 현재까지의 대화 요약
+        recent_logs: 최근 대화 로그
+        turn_count: 현재 대화 턴 수
+        stt_info: STT 단계에서 선택된 티어와 지연 (worker.stt_policy)
+    
     Returns:
         dict: {
             "status": "success",
             "user_text": 사용자 음성 텍스트,
             "ai_reply": AI 답변 텍스트,
             "sentiment": 감정,
-            "new_summary": 업데이트된 요약 (3턴마다),
             "session_id": 세션 ID
         }
     """
     if recent_logs is None:
         recent_logs = []
     
+    _report_progress(self, STATE_REPLYING, user_text=user_text, session_id=session_id)
+    
+    # 스트리밍 모드: 문장이 완성될 때마다 Redis Stream으로 전달 (API의 SSE가 앱으로 중계)
+    task_id = self.request.id
+    on_sentence = None
+    if settings.REPLY_STREAMING_ENABLED and task_id:
+        on_sentence = lambda index, sentence: _publish_reply_event(
+            task_id, "sentence", {"index": index, "text": sentence}
+        )
+    
     try:
-        # 모델 로딩 (첫 실행 시에만)
-        load_models()
-        
-        # S3에서 음성 파일 다운로드
-        logger.info(f"[S3] 음성 파일 다운로드 시작: {audio_url}")
-        local_audio_path = download_audio_from_s3(audio_url, user_id)
-        logger.info(f"[S3] 다운로드 완료: {local_audio_path}")
-        
-        # Step 1: STT (음성 → 텍스트)
-        logger.info(f"[STT] 음성 인식 시작: {local_audio_path}")
-        user_text = transcribe_audio(local_audio_path)
-        logger.info(f"[STT] 인식 결과: {user_text}")
-        
-        # 다운로드한 임시 파일 삭제
-        try:
-            if os.path.exists(local_audio_path):
-                os.remove(local_audio_path)
-                logger.info(f"[S3] 임시 파일 삭제: {local_audio_path}")
-        except Exception as e:
-            logger.warning(f"임시 파일 삭제 실패 (무시): {e}")
-        
-        # Step 2: Brain (Summary-Buffer Memory 적용한 Gemini 응답 생성)
+        # Brain (Summary-Buffer Memory 적용한 Gemini 응답 생성)
         logger.info(f"[Brain] AI 답변 생성 중... (턴 수: {turn_count})")
         reply_data = generate_reply_with_memory(
             user_text=user_text,
             summary=summary,
             recent_logs=recent_logs,
-            turn_count=turn_count
+            turn_count=turn_count,
+            on_sentence=on_sentence
         )
         ai_reply = reply_data["text"]
         sentiment = reply_data["sentiment"]
-        new_summary = reply_data.get("new_summary")
         
         logger.info(f"[Brain] AI 답변: {ai_reply[:50]}... (sentiment={sentiment})")
-        if new_summary:
-            logger.info(f"[Memory] 요약 업데이트: {new_summary[:50]}...")
         
         # AudioChatResult 스키마에 맞게 반환
         result = {
@@ -426,21 +1262,22 @@ def process_audio_and_reply(
             "user_text": user_text,
             "ai_reply": ai_reply,
             "sentiment": sentiment,
-            "session_id": session_id
+            "session_id": session_id,
+            "stt": stt_info
         }
         
-        # 요약이 업데이트된 경우에만 추가
-        if new_summary:
-            result["new_summary"] = new_summary
-        
-        return format_response(
+        result = format_response(
             required_keys=["status", "user_text", "ai_reply", "sentiment", "session_id"],
             data=result,
             schema_name="AudioChatResult"
         )
+        if on_sentence is not None:
+            # done 이벤트는 task_success 시그널이 발행 (_publish_task_done)
+            _publish_reply_event(task_id, "meta", {"sentiment": sentiment})
+        return result
     
     except Exception as e:
-        logger.error(f"❌ 음성 처리 실패: {str(e)}")
+        logger.error(f"❌ 답변 생성 실패: {str(e)}")
         logger.error(traceback.format_exc())
         return format_response(
             required_keys=["status", "message"],
@@ -456,12 +1293,20 @@ def process_audio_and_reply(
 # ============================================================
 # STT: Faster-Whisper
 # ============================================================
-def transcribe_audio(audio_path: str) -> str:
+def transcribe_audio(
+    audio,
+    beam_size: int = TRANSCRIBE_OPTIONS["beam_size"],
+    model_name: str = None,
+    timing: dict = None
+) -> str:
     """
-    음성 파일을 텍스트로 변환
+    음성을 텍스트로 변환
     
     Args:
-        audio_path: 오디오 파일 경로
+        audio: 오디오 파일 경로 또는 16kHz mono float32 배열
+        beam_size: 빔 크기 (스트리밍 중간 인식은 1)
+        model_name: 상주 티어 이름 (None이면 기본 모델)
+        timing: 전달 시 {"decode_ms": 모델 연산 시간} 기록 (배치 윈도우/대기 제외, RTF 산정용)
     
     Returns:
         str: 인식된 텍스트
@@ -469,30 +1314,167 @@ def transcribe_audio(audio_path: str) -> str:
     if whisper_model is None:
         raise RuntimeError("Whisper 모델이 로딩되지 않았습니다.")
     
+    model = whisper_models.get(model_name, whisper_model)
+    
     try:
-        segments, info = whisper_model.transcribe(
-            audio_path,
-            language="ko",  # 한국어
-            beam_size=5,
-            vad_filter=True  # Voice Activity Detection
-        )
+        # 배치 모드: 동시에 들어온 음성들과 묶어서 한 번의 GPU 패스로 처리
+        # (배처는 모델/빔 크기별로 따로 존재)
+        if settings.STT_BATCH_ENABLED:
+            batcher = get_batcher(
+                model,
+                window_ms=settings.STT_BATCH_WINDOW_MS,
+                max_batch_size=settings.STT_BATCH_MAX_SIZE,
+                beam_size=beam_size
+            )
+            return batcher.transcribe(audio, timing=timing)
+        
+        started = time.perf_counter()
+        options = dict(TRANSCRIBE_OPTIONS, beam_size=beam_size)
+        segments, info = model.transcribe(audio, **options)
         
-        # 세그먼트 결합
-        text = " ".join([segment.text for segment in segments])
-        return text.strip()
+        # 세그먼트 결합 (segments는 지연 생성이므로 결합까지가 연산 시간)
+        text = join_segments(segments)
+        if timing is not None:
+            timing["decode_ms"] = (time.perf_counter() - started) * 1000
+        return text
     
     except Exception as e:
         logger.error(f"STT 실패: {str(e)}")
         return ""
 
+# ============================================================
+# Gemini 스트리밍 호출
+# ============================================================
+def _publish_reply_event(task_id: str, event: str, payload: dict):
+    """답변 스트림 이벤트 전달 (실패해도 답변 생성은 계속, 앱은 폴링 결과로 대체)"""
+    try:
+        from common.reply_stream import publish
+        publish(task_id, event, payload)
+    except Exception as e:
+        logger.warning(f"[Stream] 이벤트 전달 실패 (무시): {event} {e}")
+
+
+def _stream_reply_text(prompt: str, on_sentence, tier: str = None, system: str = None):
+    """
+    Gemini 스트리밍 호출 (common.llm_gateway) → 답변 문장이 완성될 때마다 on_sentence(index, sentence) 호출
+    
+    - 첫 청크 전의 429/일시 오류는 게이트웨이가 재시도
+    - 문장을 이미 보낸 뒤의 실패는 재시도하지 않음 (앱에 같은 문장이 두 번 재생되는 것 방지)
+    
+    Returns:
+        str: 전체 응답 원문 (최종 JSON 파싱용), 호출 실패 시 None
+    """
+    from common import metrics
+    from common.llm_gateway import get_gateway, LLMError
+    from worker.reply_streamer import ReplyTextStreamer
+    
+    streamer = ReplyTextStreamer()
+    sent = 0
+    started = time.perf_counter()
+    try:
+        for chunk in get_gateway().stream_text(
+            prompt, name="reply_stream", json_output=True, tier=tier, system=system
+        ):
+            for sentence in streamer.feed(chunk):
+                if sent == 0:
+                    metrics.observe("llm.first_sentence_ms", (time.perf_counter() - started) * 1000)
+                on_sentence(sent, sentence)
+                sent += 1
+    except (LLMError, QuotaExceeded) as e:
+        logger.error(f"❌ 답변 스트리밍 실패 ({sent}문장 전달 후): {e}")
+        return None
+    
+    for sentence in streamer.finish():
+        on_sentence(sent, sentence)
+        sent += 1
+    return streamer.raw
+
+
+def _local_reply(prompt: str, on_sentence=None):
+    """
+    로컬 CPU 모델 답변 (worker.local_llm, llm_local 큐 왕복을 LOCAL_LLM_TIMEOUT_SECONDS로 제한)
+    
+    Returns:
+        dict: {"text": "답변", "sentiment": "..."}, 비활성/시간 초과/파싱 실패 시 None
+    """
+    from common import metrics
+    from common.llm_gateway import parse_json
+    from worker import local_llm
+    from worker.reply_streamer import ReplyTextStreamer
+    
+    raw_text = local_llm.request_reply(prompt)
+    if raw_text is None:
+        return None
+    try:
+        reply = parse_json(raw_text)
+    except ValueError as e:
+        logger.warning(f"[LocalLLM] JSON 파싱 실패: {e}")
+        return None
+    if not isinstance(reply, dict) or not reply.get("text"):
+        logger.warning("[LocalLLM] 응답에 text 누락")
+        return None
+    
+    if on_sentence is not None:
+        streamer = ReplyTextStreamer()
+        sentences = streamer.feed(raw_text) + streamer.finish()
+        for index, sentence in enumerate(sentences):
+            on_sentence(index, sentence)
+    
+    metrics.incr("reply.local_fallback")
+    logger.info(f"[LocalLLM] 로컬 모델 답변: {reply['text'][:50]}...")
+    sentiment = reply.get("sentiment")
+    return {"text": reply["text"], "sentiment": sentiment if sentiment in SENTIMENTS else "comforting"}
+
+
 # ============================================================
 # Brain: Summary-Buffer Memory 적용 응답 생성
 # ============================================================
+# Gemini 구조화 응답 스키마 (response_schema → JSON 형식 강제, 정규식 추출 불필요)
+SENTIMENTS = ["happy", "sad", "curious", "excited", "nostalgic", "comforting"]
+REPLY_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "text": {"type": "STRING"},
+        "sentiment": {"type": "STRING", "format": "enum", "enum": SENTIMENTS},
+    },
+    "required": ["text", "sentiment"],
+}
+SUMMARY_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {"summary": {"type": "STRING"}},
+    "required": ["summary"],
+}
+
+# 답변 프롬프트의 정적 부분 (페르소나 + 지침 + 출력 형식)
+# common.prompt_cache에 한 번 등록 → 호출마다 요약/최근 대화/사용자 말만 전송
+REPLY_PERSONA = "reply_persona"
+REPLY_PERSONA_PROMPT = """
+당신은 노인 회상 치료를 돕는 친근한 AI 상담사 '복실이'입니다.
+매 요청으로 [이전 대화 요약], [최근 대화 내용], [현재 사용자 말]이 주어집니다.
+
+아래 지침을 반드시 따르세요:
+1. 따뜻하고 공감하는 어조로 대화하세요.
+2. 과거 기억을 떠올릴 수 있는 질문을 포함하세요.
+3. 2-3문장으로 간결하게 답변하세요.
+4. 존댓말을 사용하세요.
+5. 가끔 "멍!" 또는 "왈왈!"을 붙여주세요.
+
+**중요: 반드시 아래의 JSON 형식만 출력하세요. 다른 텍스트 없이 JSON만!**
+
+{
+    "text": "AI 답변 (2-3문장)",
+    "sentiment": "happy|sad|curious|excited|nostalgic|comforting"
+}
+"""
+prompt_cache.register(REPLY_PERSONA, REPLY_PERSONA_PROMPT)
+
+
 def generate_reply_with_memory(
     user_text: str,
     summary: str = "",
     recent_logs: list = None,
-    turn_count: int = 0
+    turn_count: int = 0,
+    on_sentence=None
 ) -> dict:
     """
     Summary-Buffer Memory를 적용한 AI 답변 생성
@@ -502,166 +1484,220 @@ def generate_reply_with_memory(
         summary: 현재까지의 대화 요약
         recent_logs: 최근 대화 로그 [{"role": "...", "content": "..."}]
         turn_count: 현재 대화 턴 수
+        on_sentence: 지정 시 Gemini 스트리밍 모드로 호출하고 답변 문장이 완성될 때마다 호출
+                     (예: SSE 전달용 common.reply_stream.publish)
     
     Returns:
-        dict: {"text": "답변", "sentiment": "...", "new_summary": "..."(옵션)}
+        dict: {"text": "답변", "sentiment": "..."}
     """
     if recent_logs is None:
         recent_logs = []
     
-    # Fallback 응답
+    # Fallback 응답 (로컬 LLM도 실패한 경우)
     FALLBACK_RESPONSE = {
         "text": "할머니, 제가 잘 못 들었어요. 다시 말씀해 주시겠어요? 멍!",
         "sentiment": "curious"
     }
     
-    if gemini_model is None:
-        logger.error("Gemini 모델이 초기화되지 않았습니다.")
-        return FALLBACK_RESPONSE
-    
     try:
-        # 최근 대화 컨텍스트 구성
-        recent_context = ""
-        if recent_logs:
-            recent_context = "\n".join([
-                f"{'사용자' if log['role'] == 'user' else 'AI'}: {log['content']}"
-                for log in recent_logs
-                if log.get('content')
-            ])
+        # 요약/최근 대화/사용자 말을 섹션별 토큰 예산 안으로 (common.context_builder)
+        from common.context_builder import build_reply_context
         
-        # 요약 업데이트 필요 여부 (매 3턴마다)
-        should_update_summary = (turn_count > 0) and (turn_count % 3 == 0)
+        context = build_reply_context(summary, recent_logs, user_text)
+        recent_context = context.recent_context
         
-        # 프롬프트 구성
-        if should_update_summary:
-            # 응답 + 요약 업데이트 동시 요청 (기존 요약 MERGE)
-            prompt = f"""
-당신은 노인 회상 치료를 돕는 친근한 AI 상담사 '복실이'입니다.
-
-[기존 대화 요약]
-{summary if summary else "(첫 대화입니다)"}
+        # 동적 부분만 구성 (페르소나/형식 지시문은 REPLY_PERSONA_PROMPT, common.prompt_cache)
+        # 요약 갱신은 summarize_session 태스크가 답변 전달 후 별도로 수행
+        prompt = f"""
+[이전 대화 요약]
+{context.summary if context.summary else "(첫 대화입니다)"}
 
 [최근 대화 내용]
 {recent_context if recent_context else "(이전 대화 없음)"}
 
 [현재 사용자 말]
-{user_text}
+{context.user_text}
+"""
+        
+        # Gemini API 호출 (common.llm_gateway: 쿼터/타임아웃/헤지/서킷 브레이커)
+        # 짧은 발화는 lite 티어 (common.model_routing)
+        # Gemini 실패(서킷 열림/쿼터 초과/타임아웃) 시 로컬 CPU 모델 (worker.local_llm)
+        from common.llm_gateway import get_gateway, parse_json, LLMError
+        from common.model_routing import tier_for
+        from worker import local_llm
+        
+        if gemini_model is None or local_llm.forced():
+            if gemini_model is None:
+                logger.error("Gemini 모델이 초기화되지 않았습니다.")
+            return _local_reply(REPLY_PERSONA_PROMPT + prompt, on_sentence) or FALLBACK_RESPONSE
+        
+        if on_sentence is not None:
+            delivered = []
+            
+            def deliver(index, sentence):
+                delivered.append(index)
+                on_sentence(index, sentence)
+            
+            raw_text = _stream_reply_text(
+                prompt, deliver, tier=tier_for("reply_stream", user_text), system=REPLY_PERSONA
+            )
+            if raw_text is None:
+                # 이미 보낸 문장 뒤에 다른 답변을 이어 붙이지 않음
+                if delivered:
+                    return FALLBACK_RESPONSE
+                return _local_reply(REPLY_PERSONA_PROMPT + prompt, on_sentence) or FALLBACK_RESPONSE
+            try:
+                ai_reply = parse_json(raw_text)
+            except ValueError as e:
+                logger.warning(f"JSON 파싱 실패: {e}")
+                return {
+                    "text": raw_text.strip()[:200],
+                    "sentiment": "comforting"
+                }
+        else:
+            try:
+                ai_reply = get_gateway().generate_json(
+                    prompt, REPLY_SCHEMA, name="reply", tier=tier_for("reply", user_text),
+                    system=REPLY_PERSONA
+                )
+            except (LLMError, QuotaExceeded) as e:
+                logger.error(f"❌ {e}")
+                return _local_reply(REPLY_PERSONA_PROMPT + prompt) or FALLBACK_RESPONSE
+        
+        if isinstance(ai_reply, dict) and "text" in ai_reply and "sentiment" in ai_reply:
+            logger.info(f"[Memory] 답변 성공: {ai_reply['text'][:50]}...")
+            return ai_reply
+        logger.warning("Gemini 응답에 필수 필드 누락")
+        return FALLBACK_RESPONSE
+    
+    except Exception as e:
+        logger.error(f"Summary-Buffer Memory 답변 생성 실패: {str(e)}")
+        logger.error(traceback.format_exc())
+        return FALLBACK_RESPONSE
 
-**AI 답변 지침:**
-1. 따뜻하고 공감하는 어조로 대화하세요.
-2. 과거 기억을 떠올릴 수 있는 질문을 포함하세요.
-3. 2-3문장으로 간결하게 답변하세요.
-4. 존댓말을 사용하세요.
-5. 가끔 "멍!" 또는 "왈왈!"을 붙여주세요.
 
-**요약 업데이트 지침 (중요!):**
-- [기존 대화 요약]에 있는 핵심 정보(음식, 장소, 사람, 추억 등)를 절대 삭제하지 마세요.
-- [최근 대화 내용]과 [현재 사용자 말]에서 새롭게 알게 된 사실을 기존 요약에 통합하세요.
-- 3인칭 시점으로 서술하세요 (예: "사용자는 ...라고 말했다").
-- 4-5문장으로 누적된 전체 대화 내용을 요약하세요.
+# ============================================================
+# Celery 태스크: 로컬 CPU LLM 답변 (llm_local 큐, worker.local_llm)
+# ============================================================
+@celery_app.task(name="worker.tasks.generate_local_reply")
+def generate_local_reply(prompt: str):
+    """
+    Gemini 대신 로컬 양자화 모델로 답변 원문 생성 (답변 경로의 Fallback, 직접 호출하지 않음)
 
-**중요: 반드시 아래의 JSON 형식만 출력하세요. 다른 텍스트 없이 JSON만!**
+    Returns:
+        {"status": "success", "text": "<JSON 원문>"}
+    """
+    from worker import local_llm
 
-{{
-    "text": "AI 답변 (2-3문장)",
-    "sentiment": "happy|sad|curious|excited|nostalgic|comforting",
-    "new_summary": "[기존 요약]과 [새로운 정보]를 합친 누적 요약 (4-5문장, 정보 누락 금지)"
-}}
-"""
-        else:
-            # 일반 응답만
-            prompt = f"""
-당신은 노인 회상 치료를 돕는 친근한 AI 상담사 '복실이'입니다.
+    return {"status": "success", "text": local_llm.generate(prompt)}
 
-[이전 대화 요약]
-{summary if summary else "(첫 대화입니다)"}
 
-[최근 대화 내용]
-{recent_context if recent_context else "(이전 대화 없음)"}
+# ============================================================
+# Celery 태스크: 대화 요약 갱신 (Summary-Buffer Memory, background 큐)
+# ============================================================
+SUMMARY_MIN_NEW_LOGS = 2  # 새 로그가 이보다 적으면 요약하지 않음
+SUMMARY_QUOTA_RETRIES = 10
+PENDING_VOICE_LOG = "[음성 메시지]"  # STT 결과로 아직 업데이트되지 않은 사용자 로그
 
-[현재 사용자 말]
-{user_text}
 
-아래 지침을 반드시 따르세요:
-1. 따뜻하고 공감하는 어조로 대화하세요.
-2. 과거 기억을 떠올릴 수 있는 질문을 포함하세요.
-3. 2-3문장으로 간결하게 답변하세요.
-4. 존댓말을 사용하세요.
-5. 가끔 "멍!" 또는 "왈왈!"을 붙여주세요.
+@celery_app.task(bind=True, name="worker.tasks.summarize_session")
+def summarize_session(self: Task, session_id: str):
+    """
+    마지막 요약 이후의 ChatLog만 기존 요약에 합쳐 ChatSession.summary에 직접 저장
+
+    - 답변 전달 후 API가 예약 (save-ai-response에서 N턴마다, 대화 종료 시)
+      → 답변 생성 프롬프트는 매 턴 같은 크기 (요약 턴에도 답변 지연 없음)
+    - summary_last_log_id 이후 로그만 읽고, 끝에 남은 STT 전 로그(진행 중인 턴)에서 멈춤
+      (뒤에 다른 로그가 있는 STT 전 로그는 버려진 턴 → 건너뛰고 계속 진행)
+    - 동시에 실행된 다른 요약이 먼저 저장했으면 덮어쓰지 않음 (summary_last_log_id 비교)
+
+    Returns:
+        {"status": "success|skipped|failure", "session_id": "...", "last_log_id": 42}
+    """
+    from common.database import SessionLocal
+    from common.models import ChatSession, ChatLog
+    from common.llm_gateway import get_gateway
+
+    db = SessionLocal()
+    try:
+        session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+        if session is None:
+            return {"status": "failure", "session_id": session_id, "message": "세션을 찾을 수 없습니다."}
+
+        last_log_id = session.summary_last_log_id
+        query = db.query(ChatLog).filter(ChatLog.session_id == session.id)
+        if last_log_id is not None:
+            query = query.filter(ChatLog.id > last_log_id)
+
+        logs = query.order_by(ChatLog.id).all()
+        while logs and logs[-1].content == PENDING_VOICE_LOG:
+            logs.pop()  # 진행 중인 턴 (답변 저장 시 내용이 채워짐)
+        new_logs = [log for log in logs if log.content != PENDING_VOICE_LOG]
+
+        if len(new_logs) < SUMMARY_MIN_NEW_LOGS:
+            return {"status": "skipped", "session_id": session_id, "last_log_id": last_log_id}
+
+        conversation = "\n".join(
+            f"{'사용자' if log.role == 'user' else 'AI'}: {log.content}" for log in new_logs
+        )
+        prompt = f"""
+다음은 노인 회상 치료 대화의 기존 요약과 그 이후 새로 나눈 대화입니다.
+
+[기존 대화 요약]
+{session.summary or "(첫 요약입니다)"}
+
+[새 대화 내용]
+{conversation}
+
+**요약 업데이트 지침 (중요!):**
+- [기존 대화 요약]에 있는 핵심 정보(음식, 장소, 사람, 추억 등)를 절대 삭제하지 마세요.
+- [새 대화 내용]에서 새롭게 알게 된 사실을 기존 요약에 통합하세요.
+- 3인칭 시점으로 서술하세요 (예: "사용자는 ...라고 말했다").
+- 4-5문장으로 누적된 전체 대화 내용을 요약해 summary 필드에 담아주세요.
+"""
+        try:
+            result = get_gateway().generate_json(
+                prompt, SUMMARY_SCHEMA, name="summary",
+                priority=BACKGROUND, max_wait=0, hedge=False
+            )
+        except QuotaExceeded as e:
+            logger.info(f"[Summary] {e} → 태스크 재시도")
+            raise self.retry(countdown=e.retry_after, max_retries=SUMMARY_QUOTA_RETRIES)
+
+        new_summary = str(result.get("summary", "")).strip() if isinstance(result, dict) else ""
+        if not new_summary:
+            return {"status": "failure", "session_id": session_id, "message": "요약 응답이 비어 있습니다."}
+
+        # 낙관적 갱신: 읽은 뒤 다른 요약이 먼저 저장했으면 건너뜀 (다음 예약 때 이어서 합침)
+        unchanged = (
+            ChatSession.summary_last_log_id.is_(None) if last_log_id is None
+            else ChatSession.summary_last_log_id == last_log_id
+        )
+        updated = (
+            db.query(ChatSession)
+            .filter(ChatSession.id == session.id, unchanged)
+            .update(
+                {"summary": new_summary, "summary_last_log_id": new_logs[-1].id},
+                synchronize_session=False
+            )
+        )
+        db.commit()
+
+        if not updated:
+            logger.info(f"[Summary] 다른 요약이 먼저 저장됨, 건너뜀 (session={session_id})")
+            return {"status": "skipped", "session_id": session_id, "last_log_id": last_log_id}
 
-**중요: 반드시 아래의 JSON 형식만 출력하세요. 다른 텍스트 없이 JSON만!**
+        logger.info(f"[Summary] 요약 갱신 ({len(new_logs)}개 로그): {new_summary[:50]}...")
+        return {"status": "success", "session_id": session_id, "last_log_id": new_logs[-1].id}
 
-{{
-    "text": "AI 답변 (2-3문장)",
-    "sentiment": "happy|sad|curious|excited|nostalgic|comforting"
-}}
-"""
-        
-        # Gemini API 호출 (Retry 로직)
-        import time
-        max_retries = 3
-        retry_count = 0
-        
-        while retry_count < max_retries:
-            try:
-                response = gemini_model.generate_content(prompt)
-                break
-            except Exception as api_error:
-                error_str = str(api_error)
-                if "429" in error_str or "quota" in error_str.lower():
-                    retry_count += 1
-                    import re
-                    retry_match = re.search(r'retry in (\d+)', error_str)
-                    retry_delay = int(retry_match.group(1)) if retry_match else 10
-                    
-                    if retry_count < max_retries:
-                        logger.warning(f"⚠️ Gemini Quota 초과, {retry_delay}초 후 재시도 ({retry_count}/{max_retries})")
-                        time.sleep(retry_delay)
-                    else:
-                        logger.error("❌ Gemini Quota 초과, 최대 재시도 횟수 도달")
-                        return FALLBACK_RESPONSE
-                else:
-                    raise api_error
-        
-        # 응답 파싱
-        if response and response.text:
-            import json
-            import re
-            
-            response_text = response.text.strip()
-            
-            # 코드블록 제거
-            json_match = re.search(r'```(?:json)?\s*(.*?)\s*```', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(1)
-            
-            # { ... } 패턴 추출
-            json_match = re.search(r'\{[^{}]*\}', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(0)
-            
-            try:
-                ai_reply = json.loads(response_text)
-                
-                if "text" in ai_reply and "sentiment" in ai_reply:
-                    logger.info(f"[Memory] 답변 성공: {ai_reply['text'][:50]}...")
-                    return ai_reply
-                else:
-                    logger.warning("Gemini 응답에 필수 필드 누락")
-                    return FALLBACK_RESPONSE
-            except json.JSONDecodeError as e:
-                logger.warning(f"JSON 파싱 실패: {e}")
-                return {
-                    "text": response.text.strip()[:200],
-                    "sentiment": "comforting"
-                }
-        else:
-            return FALLBACK_RESPONSE
-    
+    except Retry:
+        raise
     except Exception as e:
-        logger.error(f"Summary-Buffer Memory 답변 생성 실패: {str(e)}")
-        logger.error(traceback.format_exc())
-        return FALLBACK_RESPONSE
+        db.rollback()
+        logger.error(f"[Summary] 요약 갱신 실패 (session={session_id}): {e}")
+        return {"status": "failure", "session_id": session_id, "message": str(e)}
+    finally:
+        db.close()
 
 
 # ============================================================
@@ -713,76 +1749,21 @@ def generate_reply(user_text: str, user_id: str, session_id: str = None) -> dict
 오직 위 JSON만 출력하세요. 다른 텍스트, 마크다운, 설명, 인사, 안내, 코드블록, 공백 등은 절대 포함하지 마세요.
 """
         
-        # Gemini API 호출 (Retry 로직 추가)
-        import time
-        max_retries = 3
-        retry_count = 0
+        # Gemini API 호출 (common.llm_gateway, 스키마로 JSON 강제)
+        from common.llm_gateway import get_gateway, LLMError
         
-        while retry_count < max_retries:
-            try:
-                response = gemini_model.generate_content(prompt)
-                break  # 성공 시 루프 탈출
-            
-            except Exception as api_error:
-                error_str = str(api_error)
-                
-                # Quota 초과 에러 처리
-                if "429" in error_str or "quota" in error_str.lower():
-                    retry_count += 1
-                    
-                    # Retry delay 추출 (에러 메시지에서)
-                    import re
-                    retry_match = re.search(r'retry in (\d+)', error_str)
-                    retry_delay = int(retry_match.group(1)) if retry_match else 10
-                    
-                    if retry_count < max_retries:
-                        logger.warning(f"⚠️ Gemini Quota 초과, {retry_delay}초 후 재시도 ({retry_count}/{max_retries})")
-                        time.sleep(retry_delay)
-                    else:
-                        logger.error(f"❌ Gemini Quota 초과, 최대 재시도 횟수 도달")
-                        return FALLBACK_RESPONSE
-                else:
-                    # 다른 에러는 즉시 Fallback
-                    raise api_error
+        try:
+            ai_reply = get_gateway().generate_json(prompt, REPLY_SCHEMA, name="legacy_reply")
+        except (LLMError, QuotaExceeded) as e:
+            logger.error(f"❌ {e}")
+            return FALLBACK_RESPONSE
         
-        # 응답 파싱
-        if response and response.text:
-            import json
-            import re
-            
-            # JSON 추출 (마크다운 코드블록 처리)
-            response_text = response.text.strip()
-            
-            # ```json ... ``` 또는 ``` ... ``` 패턴 제거
-            json_match = re.search(r'```(?:json)?\s*(.*?)\s*```', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(1)
-            
-            # { ... } 패턴 추출
-            json_match = re.search(r'\{[^{}]*\}', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(0)
-            
-            try:
-                ai_reply = json.loads(response_text)
-                
-                # 필수 필드 확인
-                if "text" in ai_reply and "sentiment" in ai_reply:
-                    logger.info(f"Gemini 답변 성공: {ai_reply['text'][:50]}...")
-                    return ai_reply
-                else:
-                    logger.warning("Gemini 응답에 필수 필드 누락, Fallback 사용")
-                    return FALLBACK_RESPONSE
-            except json.JSONDecodeError as e:
-                logger.warning(f"JSON 파싱 실패: {e}, 원본: {response_text[:100]}")
-                # JSON 파싱 실패 시 텍스트를 직접 사용
-                return {
-                    "text": response.text.strip()[:200],
-                    "sentiment": "comforting"
-                }
-        else:
-                logger.warning("Gemini 응답에 필수 필드 누락, Fallback 사용")
-                return FALLBACK_RESPONSE
+        # 필수 필드 확인
+        if isinstance(ai_reply, dict) and "text" in ai_reply and "sentiment" in ai_reply:
+            logger.info(f"Gemini 답변 성공: {ai_reply['text'][:50]}...")
+            return ai_reply
+        logger.warning("Gemini 응답에 필수 필드 누락, Fallback 사용")
+        return FALLBACK_RESPONSE
     
     except Exception as e:
         logger.error(f"Gemini 답변 생성 실패: {str(e)}")
@@ -828,6 +1809,96 @@ def analyze_sentiment(text: str) -> str:
     return "comforting"  # 기본값: 따뜻한 위로
 
 
+# ============================================================
+# Vision 입력 (축소 + 사진별 캐시)
+# ============================================================
+VISION_CACHE_PREFIX = "vision:input"
+
+
+def _read_image_bytes(image_url: str) -> bytes:
+    """S3 URL 또는 로컬 경로의 원본 이미지 바이트"""
+    if image_url.startswith("http"):
+        import urllib.request
+        logger.info(f"[Vision] 이미지 다운로드: {image_url}")
+        with urllib.request.urlopen(image_url, timeout=30) as response:
+            return response.read()
+    if not os.path.exists(image_url):
+        raise FileNotFoundError(f"이미지 파일 없음: {image_url}")
+    with open(image_url, "rb") as f:
+        return f.read()
+
+
+def _vision_source_id(cache_id: str, image_url: str) -> str:
+    import hashlib
+    # 사진 URL과 축소 설정이 바뀌면 다른 ID → 캐시/핸들 자동 무효화
+    source = f"{image_url}|{settings.VISION_MAX_PIXELS}|{settings.VISION_MAX_BYTES}|{settings.VISION_JPEG_QUALITY}"
+    return f"{cache_id}:{hashlib.sha1(source.encode()).hexdigest()[:12]}"
+
+
+def load_vision_input(image_url: str, cache_id: str = None) -> dict:
+    """
+    Gemini Vision 입력 준비 (원본 다운로드 → prepare_vision_input 축소/재압축)
+
+    - cache_id(사진 ID)가 있으면 축소 결과를 Redis에 캐시 (재분석/재시도 시 다운로드·디코딩 생략)
+    - 원본/전송 용량과 준비 시간은 metrics로 기록
+      (vision.input.original_bytes / vision.input.bytes / vision.input.prepare_ms)
+
+    Returns:
+        dict: {"mime_type": "image/jpeg", "data": bytes} (Gemini content part)
+    """
+    from common import metrics
+    from common.redis_client import get_redis
+
+    cache_key = f"{VISION_CACHE_PREFIX}:{_vision_source_id(cache_id, image_url)}" if cache_id else None
+    if cache_key:
+        try:
+            cached = get_redis().get(cache_key)
+            if cached:
+                metrics.incr("vision.input.cache.hit")
+                return {"mime_type": "image/jpeg", "data": cached}
+        except Exception as e:
+            logger.warning(f"[Vision] 캐시 조회 실패 (무시): {e}")
+        metrics.incr("vision.input.cache.miss")
+
+    original = _read_image_bytes(image_url)
+    started = time.perf_counter()
+    data = prepare_vision_input(
+        original,
+        max_pixels=settings.VISION_MAX_PIXELS,
+        max_bytes=settings.VISION_MAX_BYTES,
+        jpeg_quality=settings.VISION_JPEG_QUALITY
+    )
+    prepare_ms = (time.perf_counter() - started) * 1000
+    metrics.observe("vision.input.original_bytes", len(original))
+    metrics.observe("vision.input.bytes", len(data))
+    metrics.observe("vision.input.prepare_ms", prepare_ms)
+    logger.info(f"[Vision] 입력 축소: {len(original) // 1024}KB → {len(data) // 1024}KB ({prepare_ms:.0f}ms)")
+
+    if cache_key:
+        try:
+            get_redis().set(cache_key, data, ex=settings.VISION_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"[Vision] 캐시 저장 실패 (무시): {e}")
+    return {"mime_type": "image/jpeg", "data": data}
+
+
+def vision_part(image_url: str, photo_id: str = None):
+    """
+    사진 content part (photo_id가 있으면 common.photo_handles로 1회 업로드한 핸들 재사용)
+
+    Returns:
+        (part, handle_key): handle_key는 핸들 레지스트리를 쓴 경우에만 (무효화용)
+    """
+    if not photo_id:
+        return load_vision_input(image_url), None
+
+    from common import photo_handles
+
+    handle_key = _vision_source_id(photo_id, image_url)
+    part = photo_handles.get_part(handle_key, lambda: load_vision_input(image_url, cache_id=photo_id)["data"])
+    return part, handle_key
+
+
 # ============================================================
 # Celery 태스크: 이미지 분석 (Gemini Vision)
 # ============================================================
@@ -844,21 +1915,19 @@ def analyze_image(self: Task, image_path: str, prompt: str):
         dict: 분석 결과
     """
     try:
-        load_models()
-        
         if gemini_model is None:
             raise RuntimeError("Gemini 모델이 초기화되지 않았습니다.")
         
-        # 이미지 로딩
-        from PIL import Image
-        image = Image.open(image_path)
+        # 이미지 로딩 (Vision 입력 크기로 축소)
+        image = load_vision_input(image_path)
         
         # Gemini Vision 분석
-        response = gemini_model.generate_content([prompt, image])
+        from common.llm_gateway import get_gateway
+        analysis = get_gateway().generate_text([prompt, image], name="image_analysis")
         
         return {
             "status": "success",
-            "analysis": response.text.strip()
+            "analysis": analysis
         }
     
     except Exception as e:
@@ -873,15 +1942,162 @@ def analyze_image(self: Task, image_path: str, prompt: str):
 # ============================================================
 # Celery 태스크: 사진 기반 첫 인사 생성 (Gemini Vision)
 # ============================================================
+GREETING_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {"text": {"type": "STRING"}},
+    "required": ["text"],
+}
+
+
+def analyze_photo_image(
+    image_url: str,
+    photo_id: str = None,
+    priority: str = INTERACTIVE,
+    max_wait: float = None
+) -> dict:
+    """
+    Gemini Vision 사진 분석 1회 (common.photo_analysis 프롬프트/스키마)
+
+    Returns:
+        dict: {"summary": ..., "place": ..., "keywords": [...], ...}
+    """
+    from common import photo_analysis
+    from common.llm_gateway import get_gateway
+
+    def analyze(image):
+        return get_gateway().generate_json(
+            [photo_analysis.ANALYSIS_PROMPT, image], photo_analysis.ANALYSIS_SCHEMA, name="photo_analysis",
+            priority=priority, max_wait=max_wait, hedge=priority != BACKGROUND
+        )
+
+    image, handle_key = vision_part(image_url, photo_id)
+    try:
+        analysis = analyze(image)
+    except QuotaExceeded:
+        raise
+    except Exception as e:
+        from common import photo_handles
+        if "file_data" not in image or not photo_handles.file_missing(e):
+            raise
+        # 제공자 쪽 파일이 만료 전에 사라진 경우만 → 핸들 삭제 후 인라인으로 1회 재시도
+        logger.warning(f"[PhotoAnalysis] 사진 핸들 파일 없음, 인라인 재시도: {e}")
+        photo_handles.invalidate(handle_key)
+        analysis = analyze(load_vision_input(image_url, cache_id=photo_id))
+    if not isinstance(analysis, dict) or not analysis.get("summary"):
+        raise ValueError(f"사진 분석 결과 형식 오류: {analysis}")
+    return analysis
+
+
+def ensure_photo_analysis(db, photo, priority: str = INTERACTIVE, max_wait: float = None) -> dict:
+    """
+    사진 분석 조회 (캐시가 없거나 무효일 때만 Vision 호출 후 ai_analysis에 저장)
+
+    Args:
+        db: SQLAlchemy 세션
+        photo: UserPhoto (s3_url 필요)
+        priority, max_wait: Gemini 쿼터 우선순위/대기 (common.gemini_quota)
+
+    Returns:
+        dict: 분석 결과
+    """
+    from common import metrics, photo_analysis
+    from common.llm_gateway import get_gateway
+
+    analysis = photo_analysis.load(photo)
+    if analysis is not None:
+        metrics.incr("photo_analysis.cache.hit")
+        return analysis
+
+    metrics.incr("photo_analysis.cache.miss")
+    if not photo.s3_url:
+        raise ValueError(f"분석할 이미지 URL 없음: {photo.id}")
+
+    analysis = analyze_photo_image(photo.s3_url, photo_id=str(photo.id), priority=priority, max_wait=max_wait)
+    photo.ai_analysis = photo_analysis.dumps(analysis, get_gateway().model_name, photo.s3_url)
+    db.commit()
+    logger.info(f"[PhotoAnalysis] 분석 저장: {photo.id} - {analysis.get('summary')}")
+    return analysis
+
+
+@celery_app.task(bind=True, name="worker.tasks.analyze_photo")
+def analyze_photo(self: Task, photo_id: str):
+    """
+    사진 1장 분석 후 UserPhoto.ai_analysis에 저장 (이미 유효한 분석이 있으면 재사용)
+
+    Returns:
+        {"status": "success", "photo_id": "...", "summary": "..."}
+    """
+    from common.database import SessionLocal
+    from common.models import UserPhoto
+
+    db = SessionLocal()
+    try:
+        photo = db.query(UserPhoto).filter(UserPhoto.id == photo_id).first()
+        if photo is None:
+            return {"status": "failure", "photo_id": photo_id, "message": "사진을 찾을 수 없습니다."}
+        analysis = ensure_photo_analysis(db, photo)
+        return {"status": "success", "photo_id": photo_id, "summary": analysis.get("summary")}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"[PhotoAnalysis] 분석 실패 ({photo_id}): {e}")
+        return {"status": "failure", "photo_id": photo_id, "message": str(e)}
+    finally:
+        db.close()
+
+
+def compose_greeting(analysis: dict, pet_name: str, priority: str = INTERACTIVE, max_wait: float = None) -> str:
+    """
+    사진 분석 결과로 첫 인사 생성 (이미지 없이 텍스트 호출 1회)
+
+    Returns:
+        str: 인사 문구 (200자 이내, 생성 실패 시 빈 문자열)
+    """
+    from common import photo_analysis
+    from common.llm_gateway import get_gateway
+
+    greeting_prompt = f"""
+당신은 노인 회상 치료를 돕는 친근한 AI 반려견 '{pet_name}'입니다.
+사용자가 보여준 사진을 보고, 따뜻하고 친근한 첫 인사를 해주세요.
+
+[사진 내용]
+{photo_analysis.describe(analysis)}
+
+규칙:
+1. 사진에서 보이는 내용(장소, 인물, 상황 등)을 자연스럽게 언급하세요.
+2. 호기심이 가득한 강아지처럼 질문을 포함하세요.
+3. 2-3문장으로 간결하게 말하세요.
+4. 존댓말을 사용하고, 가끔 "멍!" 또는 "왈왈!"을 붙여주세요.
+5. 할머니/할아버지가 듣기 좋은 따뜻한 어조를 사용하세요.
+
+**중요: 인사말만 text 필드에 담아주세요.**
+"""
+    greeting = get_gateway().generate_json(
+        greeting_prompt, GREETING_SCHEMA, name="greeting",
+        priority=priority, max_wait=max_wait, hedge=priority != BACKGROUND
+    )
+    text = str(greeting.get("text", "")).strip() if isinstance(greeting, dict) else ""
+    return text[:200]  # 200자 제한
+
+
 @celery_app.task(bind=True, name="worker.tasks.generate_greeting")
-def generate_greeting(self: Task, image_url: str, pet_name: str = "복실이", session_id: str = None):
+def generate_greeting(
+    self: Task,
+    image_url: str,
+    pet_name: str = "복실이",
+    session_id: str = None,
+    photo_id: str = None
+):
     """
     사진을 분석하여 맞춤형 첫 인사 생성
     
+    - photo_id가 있으면 UserPhoto.ai_analysis 캐시를 사용 (없으면 분석 후 저장)
+    - 인사 생성은 분석 결과만 넣은 텍스트 호출 1회 (이미지는 다시 보내지 않음)
+    
     Args:
         image_url: S3 URL 또는 로컬 이미지 경로
         pet_name: 반려견 이름 (기본: 복실이)
         session_id: 세션 ID
+        photo_id: UserPhoto ID (분석 캐시 조회/저장용)
     
     Returns:
         GreetingTaskResult 스키마:
@@ -909,90 +2125,37 @@ def generate_greeting(self: Task, image_url: str, pet_name: str = "복실이", s
         )
     
     try:
-        load_models()
-        
         if gemini_model is None:
             logger.error("Gemini 모델이 초기화되지 않았습니다.")
             return fallback_response()
         
-        # 이미지 다운로드 (S3 URL인 경우)
-        local_image_path = None
-        image_analysis = None
-        
+        # Step 1: 사진 분석 (캐시 우선)
         try:
-            if image_url.startswith("http"):
-                import tempfile
-                import urllib.request
-                
-                temp_dir = tempfile.gettempdir()
-                local_image_path = os.path.join(temp_dir, f"greeting_{session_id or 'temp'}_{os.getpid()}.jpg")
+            if photo_id:
+                from common.database import SessionLocal
+                from common.models import UserPhoto
                 
-                logger.info(f"[Greeting] 이미지 다운로드: {image_url}")
-                urllib.request.urlretrieve(image_url, local_image_path)
+                db = SessionLocal()
+                try:
+                    photo = db.query(UserPhoto).filter(UserPhoto.id == photo_id).first()
+                    if photo is not None and photo.s3_url:
+                        analysis = ensure_photo_analysis(db, photo)
+                    else:
+                        analysis = analyze_photo_image(image_url, photo_id=photo_id)
+                finally:
+                    db.close()
             else:
-                local_image_path = image_url
-            
-            if not os.path.exists(local_image_path):
-                raise FileNotFoundError(f"이미지 파일 없음: {local_image_path}")
-            
-            # 이미지 로딩
-            from PIL import Image
-            image = Image.open(local_image_path)
-            logger.info(f"[Greeting] 이미지 로딩 완료: {image.size}")
-            
-        except Exception as img_error:
-            logger.warning(f"[Greeting] 이미지 로딩 실패: {img_error}, Fallback 사용")
-            return fallback_response()
-        
-        # Gemini Vision으로 사진 분석 및 인사 생성 (2단계)
-        # Step 1: 이미지 분석
-        analysis_prompt = "이 사진에서 보이는 장소, 인물, 상황을 간단히 설명해주세요. 50자 이내로 답변하세요."
-        try:
-            analysis_response = gemini_model.generate_content([analysis_prompt, image])
-            if analysis_response and analysis_response.text:
-                image_analysis = analysis_response.text.strip()[:100]
-                logger.info(f"[Greeting] 이미지 분석: {image_analysis}")
+                analysis = analyze_photo_image(image_url)
+            logger.info(f"[Greeting] 사진 분석: {analysis.get('summary')}")
         except Exception as e:
-            logger.warning(f"[Greeting] 이미지 분석 실패: {e}")
-            image_analysis = "사진 분석 실패"
-        
-        # Step 2: 인사 생성
-        greeting_prompt = f"""
-당신은 노인 회상 치료를 돕는 친근한 AI 반려견 '{pet_name}'입니다.
-사용자가 보여준 사진을 보고, 따뜻하고 친근한 첫 인사를 해주세요.
-
-규칙:
-1. 사진에서 보이는 내용(장소, 인물, 상황 등)을 자연스럽게 언급하세요.
-2. 호기심이 가득한 강아지처럼 질문을 포함하세요.
-3. 2-3문장으로 간결하게 말하세요.
-4. 존댓말을 사용하고, 가끔 "멍!" 또는 "왈왈!"을 붙여주세요.
-5. 할머니/할아버지가 듣기 좋은 따뜻한 어조를 사용하세요.
-
-**중요: JSON 없이 순수 인사 텍스트만 출력하세요.**
-"""
+            logger.warning(f"[Greeting] 사진 분석 실패: {e}, Fallback 사용")
+            return fallback_response()
         
+        # Step 2: 인사 생성 (텍스트 전용)
         try:
-            response = gemini_model.generate_content([greeting_prompt, image])
+            ai_greeting = compose_greeting(analysis, pet_name)
             
-            if response and response.text:
-                ai_greeting = response.text.strip()
-                
-                # JSON 형식이 포함된 경우 텍스트만 추출
-                import json
-                import re
-                
-                # JSON 패턴 제거 시도
-                json_match = re.search(r'\{[^{}]*"text"\s*:\s*"([^"]+)"', ai_greeting)
-                if json_match:
-                    ai_greeting = json_match.group(1)
-                else:
-                    # 코드블록 제거
-                    ai_greeting = re.sub(r'```.*?```', '', ai_greeting, flags=re.DOTALL)
-                    ai_greeting = ai_greeting.strip()
-                
-                # 200자 제한
-                ai_greeting = ai_greeting[:200]
-                
+            if ai_greeting:
                 logger.info(f"[Greeting] 생성 완료: {ai_greeting[:50]}...")
                 
                 return format_response(
@@ -1000,7 +2163,7 @@ def generate_greeting(self: Task, image_url: str, pet_name: str = "복실이", s
                     data={
                         "status": "success",
                         "ai_greeting": ai_greeting,
-                        "analysis": image_analysis,
+                        "analysis": analysis.get("summary"),
                         "session_id": session_id
                     },
                     schema_name="GreetingTaskResult"
@@ -1011,15 +2174,6 @@ def generate_greeting(self: Task, image_url: str, pet_name: str = "복실이", s
         except Exception as api_error:
             logger.error(f"[Greeting] Gemini API 오류: {api_error}")
             return fallback_response()
-        
-        finally:
-            # 임시 파일 정리
-            if local_image_path and local_image_path != image_url:
-                try:
-                    if os.path.exists(local_image_path):
-                        os.remove(local_image_path)
-                except:
-                    pass
     
     except Exception as e:
         logger.error(f"[Greeting] 첫 인사 생성 실패: {str(e)}")
@@ -1035,6 +2189,117 @@ def generate_greeting(self: Task, image_url: str, pet_name: str = "복실이", s
         )
 
 
+# ============================================================
+# Celery 태스크: 갤러리 사진 사전 분석 (background 큐, 일일 예산)
+# ============================================================
+PREANALYSIS_CALLS_PER_PHOTO = 2  # Vision 분석 1회 + 인사 생성 1회
+
+
+def select_preanalysis_candidates(db, user_id, limit: int) -> list:
+    """
+    대화에 쓰일 가능성이 높은 사진 순으로 사전 분석 대상 선택
+
+    순서: 덜 본 사진 → 장소 정보가 있는 사진 → 오래된 사진
+    (서버가 이미지를 받을 수 있도록 s3_url이 있는 사진만, POST /photos/{id}/image로 업로드된 사진)
+    """
+    from common.models import UserPhoto
+
+    return (
+        db.query(UserPhoto)
+        .filter(UserPhoto.user_id == user_id, UserPhoto.s3_url.isnot(None))
+        .order_by(
+            UserPhoto.view_count.asc(),
+            UserPhoto.location_name.is_(None),
+            UserPhoto.taken_at.asc().nullslast()
+        )
+        .limit(limit)
+        .all()
+    )
+
+
+@celery_app.task(bind=True, name="worker.tasks.preanalyze_user_photos")
+def preanalyze_user_photos(self: Task, user_id: str):
+    """
+    사용자 갤러리 사전 분석 (배치 단위, 남은 사진은 간격을 두고 다시 예약)
+
+    - 사진별로 분석(ai_analysis)과 맞춤 첫 인사를 미리 생성 → 세션 시작 시 즉시 사용
+    - 호출 전에 일일 예산을 확보하고, 부족하면 다음 날로 미룸
+    - Gemini 쿼터는 BACKGROUND 우선순위로 대기 없이 확인 (부족하면 잠시 후 다시 예약)
+    - 사용자별 체인 1개 (photo_analysis.claim_chain으로 예약한 쪽이 잠금 보유, 끝나면 해제)
+
+    Returns:
+        {"status": "success|deferred|skipped|failure", "user_id": "...", "analyzed": 3, "remaining": 12}
+    """
+    from common import metrics, photo_analysis
+    from common.database import SessionLocal
+    from common.models import User
+
+    if not settings.PHOTO_PREANALYSIS_ENABLED:
+        photo_analysis.release_chain(user_id)
+        return {"status": "skipped", "user_id": user_id}
+
+    rescheduled = False
+
+    def reschedule(countdown: float) -> None:
+        nonlocal rescheduled
+        photo_analysis.extend_chain(user_id, countdown)
+        self.apply_async(args=[user_id], countdown=countdown)
+        rescheduled = True
+
+    def defer(countdown: float, reason: str, analyzed: int) -> dict:
+        logger.info(f"[PreAnalysis] {reason} → {countdown:.0f}초 후 재개 (user={user_id})")
+        metrics.incr("photo_analysis.preanalysis.deferred")
+        reschedule(countdown)
+        return {"status": "deferred", "user_id": user_id, "analyzed": analyzed, "retry_in": int(countdown)}
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return {"status": "failure", "user_id": user_id, "message": "사용자를 찾을 수 없습니다."}
+        pet_name = user.pet_name or "복실이"
+
+        candidates = select_preanalysis_candidates(db, user.id, settings.PHOTO_PREANALYSIS_PER_USER)
+        pending = [p for p in candidates if not photo_analysis.has_greeting(p, pet_name)]
+        batch, remaining = pending[:settings.PHOTO_PREANALYSIS_BATCH_SIZE], pending[settings.PHOTO_PREANALYSIS_BATCH_SIZE:]
+
+        analyzed = 0
+        for photo in batch:
+            calls = PREANALYSIS_CALLS_PER_PHOTO if photo_analysis.load(photo) is None else 1
+            if not photo_analysis.reserve_budget(calls):
+                return defer(photo_analysis.seconds_until_budget_reset(), "일일 예산 소진", analyzed)
+            try:
+                analysis = ensure_photo_analysis(db, photo, priority=BACKGROUND, max_wait=0)
+                text = compose_greeting(analysis, pet_name, priority=BACKGROUND, max_wait=0)
+                if text:
+                    photo_analysis.store_greeting(photo, pet_name, text)
+                    db.commit()
+                analyzed += 1
+                metrics.incr("photo_analysis.preanalysis.photos")
+            except QuotaExceeded as e:
+                db.rollback()
+                photo_analysis.release_budget(calls)
+                return defer(e.retry_after, "Gemini 쿼터 부족", analyzed)
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"[PreAnalysis] 사진 분석 실패 ({photo.id}): {e}")
+
+        # 진행이 있었을 때만 다음 배치 예약 (계속 실패하는 사진으로 무한 반복 방지)
+        if remaining and analyzed:
+            reschedule(settings.PHOTO_PREANALYSIS_BATCH_INTERVAL_SECONDS)
+
+        logger.info(f"[PreAnalysis] 완료: user={user_id}, 분석 {analyzed}장, 남음 {len(remaining)}장")
+        return {"status": "success", "user_id": user_id, "analyzed": analyzed, "remaining": len(remaining)}
+
+    except Exception as e:
+        logger.error(f"[PreAnalysis] 사전 분석 실패 (user={user_id}): {e}")
+        return {"status": "failure", "user_id": user_id, "message": str(e)}
+    finally:
+        if not rescheduled:  # 다음 실행이 예약되지 않았으면 체인 종료
+            photo_analysis.release_chain(user_id)
+        db.close()
+
+
 # ============================================================
 # Celery 태스크: 텍스트 전용 대화 (테스트용)
 # ============================================================
@@ -1044,8 +2309,6 @@ def generate_reply_from_text(self: Task, user_text: str, user_id: str, session_i
     텍스트 입력으로 AI 답변 생성 + TTS 음성 합성
     """
     try:
-        load_models()
-        
         # Gemini로 답변 생성 (JSON 반환)
         reply_data = generate_reply(user_text, user_id, session_id)
         ai_reply = reply_data["text"]
@@ -1073,10 +2336,122 @@ def generate_reply_from_text(self: Task, user_text: str, user_id: str, session_i
 # ============================================================
 # Celery 태스크: 기억 인사이트 추출 (Memory Insight Extraction)
 # ============================================================
+INSIGHT_QUOTA_RETRIES = 10  # 쿼터 부족 시 재시도 횟수 (음성 턴이 몰리는 동안 뒤로 미룸)
+INSIGHTS_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "category": {
+                "type": "STRING",
+                "format": "enum",
+                "enum": ["family", "travel", "food", "hobby", "emotion", "other"]
+            },
+            "fact": {"type": "STRING"},
+            "importance": {"type": "INTEGER"},
+        },
+        "required": ["category", "fact", "importance"],
+    },
+}
+
+
+def save_memory_insights(session_id: str, insights: list) -> dict:
+    """
+    추출한 기억을 MemoryInsight에 저장 (세션당 INSERT 1회 + UPDATE 1회, 커밋 1회)
+    
+    - 사용자의 기존 기억과 같은 카테고리에서 거의 같은 문장이면(common.memory_dedup, 서명으로 후보 선택 후
+      실제 Jaccard 확인) 새 행 대신 기존 행의 중요도(둘 중 큰 값)와 updated_at만 갱신
+    - 같은 세션에서 나온 비슷한 기억끼리도 하나로 합침
+    - 태스크가 다시 실행돼도 같은 기억은 갱신으로 처리되어 중복 행이 생기지 않음
+    - 서명이 없는 이전 행은 이번에 계산해 함께 저장 (updated_at은 유지)
+    
+    Returns:
+        {"inserted": 3, "merged": 1}
+    """
+    from datetime import datetime
+    from sqlalchemy import insert, update
+    from common import memory_dedup, metrics
+    from common.database import SessionLocal
+    from common.models import ChatSession, MemoryInsight
+    
+    db = SessionLocal()
+    try:
+        user_id = db.query(ChatSession.user_id).filter(ChatSession.id == session_id).scalar()
+        if user_id is None:
+            raise ValueError(f"세션을 찾을 수 없습니다: {session_id}")
+        
+        existing = db.query(
+            MemoryInsight.id, MemoryInsight.category, MemoryInsight.fact,
+            MemoryInsight.fact_sketch, MemoryInsight.importance, MemoryInsight.updated_at
+        ).filter(MemoryInsight.user_id == user_id).all()
+        
+        # 카테고리별 비교 대상 [(서명, 문장, 기존 행 {"id", "importance"} 또는 새 행 dict)]
+        pool = {}
+        updates = {}  # 기존 행 id → UPDATE 값
+        for row in existing:
+            sig = memory_dedup.loads(row.fact_sketch)
+            if not sig:
+                sig = memory_dedup.signature(row.fact)
+                if sig:
+                    updates[row.id] = {
+                        "id": row.id,
+                        "fact_sketch": memory_dedup.dumps(sig),
+                        "updated_at": row.updated_at
+                    }
+            pool.setdefault(row.category, []).append(
+                (sig, row.fact, {"id": row.id, "importance": row.importance or 1})
+            )
+        
+        now = datetime.utcnow()
+        rows, merged = [], 0
+        for item in insights:
+            sig = memory_dedup.signature(item["fact"])
+            candidates = pool.setdefault(item["category"], [])
+            match = memory_dedup.find_match(item["fact"], sig, [c[:2] for c in candidates]) if sig else None
+            if match is None:
+                row = {
+                    "user_id": user_id,
+                    "category": item["category"],
+                    "fact": item["fact"],
+                    "importance": item["importance"],
+                    "fact_sketch": memory_dedup.dumps(sig),
+                    "updated_at": now
+                }
+                rows.append(row)
+                candidates.append((sig, item["fact"], row))
+                continue
+            
+            target = candidates[match][2]
+            target["importance"] = max(target["importance"], item["importance"])
+            if "id" in target:
+                entry = updates.setdefault(target["id"], {"id": target["id"]})
+                entry.update(importance=target["importance"], updated_at=now)
+            merged += 1
+        
+        if rows:
+            db.execute(insert(MemoryInsight), rows)
+        if updates:
+            db.execute(update(MemoryInsight), list(updates.values()))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    
+    metrics.incr("memory.insights.inserted", len(rows))
+    metrics.incr("memory.insights.merged", merged)
+    logger.info(
+        f"[Insight] 저장 완료 (세션: {session_id}, 새 기억 {len(rows)}개, 기존 기억 갱신 {merged}개, "
+        f"비교 대상 {len(existing)}개)"
+    )
+    return {"inserted": len(rows), "merged": merged}
+
+
 @celery_app.task(bind=True, name="worker.tasks.extract_memory_insights")
 def extract_memory_insights(self: Task, session_id: str, chat_logs: list):
     """
-    대화 내용에서 의미 있는 기억을 추출
+    대화 내용에서 의미 있는 기억을 추출해 MemoryInsight에 저장 (save_memory_insights)
     
     Args:
         session_id: 대화 세션 ID (문자열)
@@ -1090,7 +2465,9 @@ def extract_memory_insights(self: Task, session_id: str, chat_logs: list):
             "insights": [
                 {"category": "family", "fact": "손주와 함께...", "importance": 4},
                 ...
-            ]
+            ],
+            "inserted": 3,  # 새로 저장한 기억 수
+            "merged": 1     # 기존 기억과 비슷해 갱신으로 처리한 수
         }
     """
     # 스키마 필수 필드
@@ -1098,8 +2475,6 @@ def extract_memory_insights(self: Task, session_id: str, chat_logs: list):
     VALID_CATEGORIES = ["family", "travel", "food", "hobby", "emotion", "other"]
     
     try:
-        load_models()
-        
         if gemini_model is None:
             logger.error("[Insight] Gemini 모델이 초기화되지 않았습니다.")
             return format_response(
@@ -1168,84 +2543,65 @@ def extract_memory_insights(self: Task, session_id: str, chat_logs: list):
 """
         
         try:
-            response = gemini_model.generate_content(insight_prompt)
+            # 백그라운드 작업: 쿼터를 기다리며 슬롯을 잡지 않고 태스크 재시도로 양보
+            from common.llm_gateway import get_gateway
+            insights_raw = get_gateway().generate_json(
+                insight_prompt, INSIGHTS_SCHEMA, name="insights", priority=BACKGROUND, max_wait=0, hedge=False
+            )
+            logger.info(f"[Insight] Gemini 응답: {str(insights_raw)[:200]}...")
             
-            if response and response.text:
-                import json
-                import re
-                
-                response_text = response.text.strip()
-                logger.info(f"[Insight] Gemini 응답: {response_text[:200]}...")
-                
-                # JSON 배열 추출
-                # 코드블록 제거
-                json_match = re.search(r'```(?:json)?\s*(.*?)\s*```', response_text, re.DOTALL)
-                if json_match:
-                    response_text = json_match.group(1)
-                
-                # 배열 패턴 매칭
-                array_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-                if array_match:
-                    response_text = array_match.group(0)
-                
-                try:
-                    insights_raw = json.loads(response_text)
-                    
-                    # 유효성 검증 및 정제
-                    insights = []
-                    for item in insights_raw:
-                        if isinstance(item, dict) and "category" in item and "fact" in item:
-                            # 카테고리 검증
-                            category = item["category"].lower()
-                            if category not in VALID_CATEGORIES:
-                                category = "other"
-                            
-                            # 중요도 검증 (1-5 범위)
-                            importance = int(item.get("importance", 3))
-                            importance = max(1, min(5, importance))
-                            
-                            insights.append({
-                                "category": category,
-                                "fact": str(item["fact"]),
-                                "importance": importance
-                            })
+            # 유효성 검증 및 정제
+            insights = []
+            for item in insights_raw if isinstance(insights_raw, list) else []:
+                if isinstance(item, dict) and "category" in item and "fact" in item:
+                    # 카테고리 검증
+                    category = str(item["category"]).lower()
+                    if category not in VALID_CATEGORIES:
+                        category = "other"
                     
-                    logger.info(f"[Insight] 추출 완료: {len(insights)}개 인사이트")
+                    # 중요도 검증 (1-5 범위)
+                    importance = int(item.get("importance", 3))
+                    importance = max(1, min(5, importance))
                     
-                    return format_response(
-                        required_keys=REQUIRED_KEYS,
-                        data={
-                            "status": "success",
-                            "session_id": session_id,
-                            "insights": insights
-                        },
-                        schema_name="InsightTaskResult"
-                    )
-                    
-                except json.JSONDecodeError as e:
-                    logger.warning(f"[Insight] JSON 파싱 실패: {e}")
-                    return format_response(
-                        required_keys=REQUIRED_KEYS,
-                        data={
-                            "status": "failure",
-                            "session_id": session_id,
-                            "insights": [],
-                            "error": f"JSON 파싱 실패: {str(e)}"
-                        },
-                        schema_name="InsightTaskResult"
-                    )
+                    insights.append({
+                        "category": category,
+                        "fact": str(item["fact"]),
+                        "importance": importance
+                    })
+            
+            logger.info(f"[Insight] 추출 완료: {len(insights)}개 인사이트")
+            
+            try:
+                saved = save_memory_insights(session_id, insights) if insights else {"inserted": 0, "merged": 0}
+            except Exception as db_error:
+                logger.error(f"[Insight] 저장 실패: {db_error}")
+                logger.error(traceback.format_exc())
+                return format_response(
+                    required_keys=REQUIRED_KEYS,
+                    data={
+                        "status": "failure",
+                        "session_id": session_id,
+                        "insights": insights,
+                        "error": f"기억 저장 실패: {db_error}"
+                    },
+                    schema_name="InsightTaskResult"
+                )
             
-            # 응답이 없는 경우
             return format_response(
                 required_keys=REQUIRED_KEYS,
                 data={
                     "status": "success",
                     "session_id": session_id,
-                    "insights": []
+                    "insights": insights,
+                    **saved
                 },
                 schema_name="InsightTaskResult"
             )
             
+        except QuotaExceeded as e:
+            logger.info(f"[Insight] {e} → 태스크 재시도")
+            raise self.retry(countdown=e.retry_after, max_retries=INSIGHT_QUOTA_RETRIES)
+        
         except Exception as api_error:
             logger.error(f"[Insight] Gemini API 오류: {api_error}")
             return format_response(
@@ -1259,6 +2615,9 @@ def extract_memory_insights(self: Task, session_id: str, chat_logs: list):
                 schema_name="InsightTaskResult"
             )
     
+    except Retry:
+        raise
+    
     except Exception as e:
         logger.error(f"[Insight] 기억 인사이트 추출 실패: {str(e)}")
         logger.error(traceback.format_exc())
@@ -1277,6 +2636,9 @@ def extract_memory_insights(self: Task, session_id: str, chat_logs: list):
 # ============================================================
 # Celery 태스크: 추억 영상 생성
 # ============================================================
+NARRATION_QUOTA_WAIT_SECONDS = 60
+
+
 @celery_app.task(bind=True, name="worker.tasks.generate_memory_video")
 def generate_memory_video(
     self: Task,
@@ -1401,21 +2763,37 @@ def generate_memory_video(
         ])
 
         if gemini_model is None:
-            load_models()
+            raise RuntimeError("Gemini 모델이 준비되지 않았습니다 (워커 워밍업 실패)")
+
+        # 캐시된 사진 분석이 있으면 사진 내용도 내레이션에 반영 (새 Vision 호출 없음)
+        from common import photo_analysis
+        user_photos = [sp.photo for sp in session_photos] if session_photos else [session.main_photo]
+        photo_descriptions = [
+            photo_analysis.describe(photo_analysis.load(photo))
+            for photo in user_photos if photo is not None
+        ]
+        photo_descriptions = [d for d in photo_descriptions if d]
+        photo_context = ""
+        if photo_descriptions:
+            photo_context = "\n[사진 내용]\n" + "\n".join(f"- {d}" for d in photo_descriptions) + "\n"
 
         photo_count = len(local_photo_paths)
         narration_prompt = f"""다음은 할머니와 반려견 AI의 대화 내용입니다.
 
 {conversation_text}
-
+{photo_context}
 이 대화를 바탕으로 **손주가 할머니에게 들려주는 따뜻한 내레이션**을 작성해주세요.
 {photo_count}장의 사진이 슬라이드쇼로 보여질 예정입니다.
 전체 3-5문장으로 따뜻하고 감동적으로 작성해주세요.
 
 내레이션:"""
 
-        response = gemini_model.generate_content(narration_prompt)
-        narration_text = response.text.strip()
+        # 백그라운드 작업: 음성 턴용 용량을 남겨두고, 렌더링 전이므로 쿼터는 잠시 기다림
+        from common.llm_gateway import get_gateway
+        narration_text = get_gateway().generate_text(
+            narration_prompt, name="narration", priority=BACKGROUND,
+            max_wait=NARRATION_QUOTA_WAIT_SECONDS, hedge=False
+        )
         logger.info(f"[영상 생성] 내레이션: {narration_text[:100]}...")
 
         # ============================================================
@@ -267,6 +267,10 @@ const useChatSession = ({ initialSessionId = null, onError } = {}) => {
           timeout: 60000,
           onProgress: (status) => {
             console.log('Task status:', status.status);
+            // STT 완료(transcribed/replying): 답변 전에 인식된 말씀 먼저 표시
+            if (status.user_text) {
+              updateLastUserMessage(status.user_text);
+            }
           },
         });
 